@@ -1,6 +1,10 @@
 # freecad/OpenSCAD_Ext/__init__.py
 
-import FreeCAD
+try:
+    import FreeCAD
+except ImportError:
+    # plain Python ( unit tests of the numpy modules ), nothing to register
+    FreeCAD = None
 
 # ------------------------
 #  Logging setup
@@ -100,5 +104,6 @@ def setup_exporters():
 # ------------------------
 #  Run registration
 # ------------------------
-setup_importers()
-setup_exporters()
\ No newline at end of file
+if FreeCAD is not None:
+    setup_importers()
+    setup_exporters()
\ No newline at end of file
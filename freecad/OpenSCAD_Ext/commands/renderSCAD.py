@@ -29,6 +29,18 @@ class RenderSCADFileObject_Class:
         #    FreeCAD.Console.PrintErrorMessage("No objects selected\n")
         # return
 
+        # several SCAD objects : render concurrently, apply together
+        batch = [obj for obj in sel \
+            if isinstance(getattr(obj, "Proxy", None), SCADfileBase) \
+            and obj.Document == doc]
+        if len(batch) > 1 and FreeCAD.ParamGet(\
+            "User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
+            GetBool('renderInBackground', True):
+            from freecad.OpenSCAD_Ext.objects.SCADRenderJob import startBatchRender
+            write_log("Render",f"Batch render of {len(batch)} SCAD objects")
+            startBatchRender(batch)
+            sel = [obj for obj in sel if obj not in batch]
+
         for obj in sel:
             write_log("Info",f"obj {obj.Label} TypeId {obj.TypeId}")
             if obj.TypeId != "Part::FeaturePython":
@@ -18,14 +18,15 @@ Design rules
 """
 
 import os
-import subprocess
-import tempfile
 
 import FreeCAD
 import Mesh
 from Part import Shape
 
 from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.openscad_runner import openscad_runner
+from freecad.OpenSCAD_Ext.core.OpenSCADUtils import openscadbackendargs
+from freecad.OpenSCAD_Ext.core.scratch import scratch_path, release
 from freecad.OpenSCAD_Ext.parsers.csg_parser.ast_helpers import (
     ast_to_scad_string,
     class_ast_to_scad_string,
@@ -83,35 +84,30 @@ def fallback_to_OpenSCAD(doc, node, reason="Fallback requested"):
     # --------------------------------------------------
     # Temporary files
     # --------------------------------------------------
-    tmp_scad = tempfile.NamedTemporaryFile(delete=False, suffix=".scad")
-    tmp_stl = tempfile.NamedTemporaryFile(delete=False, suffix=".stl")
+    tmp_scad = scratch_path(".scad")
+    tmp_stl = scratch_path(".stl")
 
-    tmp_scad.write(scad_str.encode("utf-8"))
-    tmp_scad.close()
-    tmp_stl.close()
+    with open(tmp_scad, "w", encoding="utf-8") as f:
+        f.write(scad_str)
 
     # --------------------------------------------------
     # Run OpenSCAD
     # --------------------------------------------------
-    try:
-        subprocess.run(
-            [OPENSCAD_CMD, "-o", tmp_stl.name, tmp_scad.name],
-            check=True,
-            capture_output=True,
-        )
-    except subprocess.CalledProcessError as e:
+    result = openscad_runner().run(
+        [OPENSCAD_CMD, "-o", tmp_stl, *openscadbackendargs(OPENSCAD_CMD), tmp_scad]
+    )
+    if result.returncode != 0:
         FreeCAD.Console.PrintError(
-            f"[AST] OpenSCAD failed:\n{e.stderr.decode()}\n"
+            f"[AST] OpenSCAD failed:\n{result.stderr}\n"
         )
-        os.unlink(tmp_scad.name)
-        os.unlink(tmp_stl.name)
+        release(tmp_scad, tmp_stl)
         return None
 
     # --------------------------------------------------
     # Import STL → Shape
     # --------------------------------------------------
     try:
-        mesh = Mesh.Mesh(tmp_stl.name)
+        mesh = Mesh.Mesh(tmp_stl)
         shape = Shape()
         shape.makeShapeFromMesh(mesh.Topology, 0.05)
         shape = shape.removeSplitter()
@@ -128,7 +124,6 @@ def fallback_to_OpenSCAD(doc, node, reason="Fallback requested"):
     # --------------------------------------------------
     # Cleanup
     # --------------------------------------------------
-    os.unlink(tmp_scad.name)
-    os.unlink(tmp_stl.name)
+    release(tmp_scad, tmp_stl)
 
     return shape
@@ -31,6 +31,7 @@ __url__ = ["https://www.freecadweb.org"]
 import os
 import tempfile
 from freecad.OpenSCAD_Ext.core.checkObjectShapes import *
+from freecad.OpenSCAD_Ext.core.scratch import scratch_dir, scratch_path
 
 try:
     from PySide import QtGui
@@ -141,6 +142,90 @@ def getopenscadversion(osfilename=None):
         stderr=p.stderr.read().strip()
         return (stdout or stderr)
 
+_versioncache = {}
+
+def getopenscadversioncached(osfilename=None):
+    '''getopenscadversion, only spawns OpenSCAD again if the
+    executable path or its modification time changed'''
+    import os
+    if not osfilename:
+        import FreeCAD
+        osfilename = FreeCAD.ParamGet(\
+            "User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
+            GetString('openscadexecutable')
+    try:
+        key = (osfilename, os.path.getmtime(osfilename))
+    except (OSError, TypeError):
+        return None
+    if key not in _versioncache:
+        _versioncache[key] = getopenscadversion(osfilename)
+    return _versioncache[key]
+
+def openscadversiondate(version=None):
+    '''(year, month) of an OpenSCAD version string,
+    (0, 0) if it can not be determined'''
+    if version is None:
+        version = getopenscadversioncached()
+    try:
+        vdate = version.split('-')[0].split(' ')[2].split('.')
+        if len(vdate) == 1: # YYYYMMDD git version
+            return int(vdate[0][0:4]), int(vdate[0][4:6])
+        return int(vdate[0]), int(vdate[1])
+    except (AttributeError, IndexError, ValueError):
+        return (0, 0)
+
+def binarystlsupported(version=None):
+    '''--export-format binstl is available from OpenSCAD 2019.05'''
+    return openscadversiondate(version) >= (2019, 5)
+
+_helpcache = {}
+
+def getopenscadhelpcached(osfilename=None):
+    '''output of openscad --help, cached like getopenscadversioncached'''
+    import os,subprocess
+    if not osfilename:
+        import FreeCAD
+        osfilename = FreeCAD.ParamGet(\
+            "User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
+            GetString('openscadexecutable')
+    try:
+        key = (osfilename, os.path.getmtime(osfilename))
+    except (OSError, TypeError):
+        return ''
+    if key not in _helpcache:
+        try:
+            p = subprocess.run([osfilename, '--help'], capture_output=True,
+                               universal_newlines=True, timeout=30)
+            _helpcache[key] = p.stdout + p.stderr
+        except (OSError, subprocess.TimeoutExpired):
+            _helpcache[key] = ''
+    return _helpcache[key]
+
+# openscadBackend preference
+BACKEND_AUTO, BACKEND_CGAL, BACKEND_MANIFOLD = 0, 1, 2
+
+def openscadbackendargs(osfilename=None):
+    '''Extra command line arguments for every OpenSCAD render :
+    the geometry backend ( openscadBackend, Auto picks Manifold when the
+    executable offers it ) followed by openscadExtraArgs'''
+    import FreeCAD, shlex
+    prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD")
+    backend = prefs.GetInt('openscadBackend', BACKEND_AUTO)
+    args = []
+    helptext = getopenscadhelpcached(osfilename)
+    if '--backend' in helptext:
+        # 2024 and later snapshots
+        args.append('--backend=%s' % ('cgal' if backend == BACKEND_CGAL else 'manifold'))
+    elif backend != BACKEND_CGAL and 'manifold' in helptext:
+        # earlier snapshots, experimental feature
+        args.append('--enable=manifold')
+    extra = prefs.GetString('openscadExtraArgs', '')
+    try:
+        args += shlex.split(extra)
+    except ValueError as e:
+        write_log("OpenSCAD", f"Ignoring openscadExtraArgs: {e}")
+    return args
+
 
 
 def newtempfilename():
@@ -167,51 +252,56 @@ def callopenscad(
     outputext='csg',
     keepname=False,
     timeout=None,
-    check_syntax=False
+    check_syntax=False,
+    exportformat=None,
+    timeoutdialog=True
 ):
     '''call the open scad binary
     returns the filename of the result (or None),
-    please delete the file afterwards'''
-    import FreeCAD,os,subprocess,tempfile,time
-    from subprocess import TimeoutExpired
-
-    def check_output2(*args,**kwargs):
-        kwargs.update({'stdout':subprocess.PIPE,'stderr':subprocess.PIPE})
-        p=subprocess.Popen(*args,**kwargs)
-        try:
-            stdoutd,stderrd = p.communicate(timeout=timeout)
-            stdoutd = stdoutd.decode("utf8")
-            stderrd = stderrd.decode("utf8")
-            if p.returncode != 0:
-                raise OpenSCADError('%s %s\n' % (stdoutd.strip(),stderrd.strip()))
-                #raise Exception,'stdout %s\n stderr%s' %(stdoutd,stderrd)
-            if stderrd.strip():
-                FreeCAD.Console.PrintWarning(stderrd+u'\n')
-            if stdoutd.strip():
-                FreeCAD.Console.PrintMessage(stdoutd+u'\n')
-                return stdoutd
-
-        except TimeoutExpired:
+    please delete the file afterwards
+    exportformat is passed as --export-format (e.g. 'binstl')
+    timeoutdialog False raises OpenSCADError on timeout instead of
+    showing a dialog ( calls from worker threads )'''
+    import FreeCAD,os,tempfile,time
+    from freecad.OpenSCAD_Ext.core.openscad_runner import openscad_runner
+
+    def check_output2(cmd):
+        result = openscad_runner().run(cmd, timeout=timeout)
+        if result.timed_out:
             msg="Call to OpenSCAD to process timed out after " \
                 +str(timeout)+"secs"
+            if not timeoutdialog:
+                raise OpenSCADError(msg)
             errorDialog(msg)
-            p.kill()
-            # Second call no timeout to clean up?
-            stdoutd,stderrd = p.communicate()
+            return
+        if result.cancelled:
+            raise OpenSCADError('OpenSCAD call cancelled')
+        stdoutd, stderrd = result.stdout, result.stderr
+        if result.returncode != 0:
+            raise OpenSCADError('%s %s\n' % (stdoutd.strip(),stderrd.strip()))
+            #raise Exception,'stdout %s\n stderr%s' %(stdoutd,stderrd)
+        if stderrd.strip():
+            FreeCAD.Console.PrintWarning(stderrd+u'\n')
+        if stdoutd.strip():
+            FreeCAD.Console.PrintMessage(stdoutd+u'\n')
+            return stdoutd
 
     osfilename = FreeCAD.ParamGet(\
         "User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
         GetString('openscadexecutable')
     if osfilename and os.path.isfile(osfilename):
         if not outputfilename:
-            dir1=tempfile.gettempdir()
+            dir1=scratch_dir()
             if keepname:
                 outputfilename=os.path.join(dir1,'%s.%s' % (os.path.split(\
                     inputfilename)[1].rsplit('.',1)[0],outputext))
             else:
                 outputfilename=os.path.join(dir1,'%s.%s' % \
                     (next(tempfilenamegen),outputext))
-        check_output2([osfilename,'-o',outputfilename, inputfilename])
+        cmd = [osfilename,'-o',outputfilename] + openscadbackendargs(osfilename)
+        if exportformat:
+            cmd += ['--export-format', exportformat]
+        check_output2(cmd + [inputfilename])
         return outputfilename
     else:
         raise OpenSCADError('OpenSCAD executable unavailable')
@@ -222,8 +312,8 @@ def callopenscad_check_syntax(inputfilename, timeout=None):
     Call OpenSCAD to check syntax only.
     Returns True if OK, raises OpenSCADError on failure.
     """
-    import FreeCAD, os, subprocess
-    from subprocess import TimeoutExpired
+    import FreeCAD, os
+    from freecad.OpenSCAD_Ext.core.openscad_runner import openscad_runner
 
     osfilename = FreeCAD.ParamGet(
         "User parameter:BaseApp/Preferences/Mod/OpenSCAD"
@@ -234,35 +324,25 @@ def callopenscad_check_syntax(inputfilename, timeout=None):
 
     cmd = [osfilename, "--check-parameters", inputfilename]
 
-    p = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
-
-    try:
-        stdoutd, stderrd = p.communicate(timeout=timeout)
-        stdoutd = stdoutd.decode("utf8")
-        stderrd = stderrd.decode("utf8")
-
-        if p.returncode != 0:
-            raise OpenSCADError(
-                'OpenSCAD syntax error:\n%s%s' %
-                (stdoutd.strip(), stderrd.strip())
-            )
-
-        if stderrd.strip():
-            FreeCAD.Console.PrintWarning(stderrd + u'\n')
-        if stdoutd.strip():
-            FreeCAD.Console.PrintMessage(stdoutd + u'\n')
-
-        return True
-
-    except TimeoutExpired:
-        p.kill()
+    result = openscad_runner().run(cmd, timeout=timeout)
+    if result.timed_out:
         raise OpenSCADError(
             "OpenSCAD syntax check timed out after %s secs" % timeout
         )
+    stdoutd, stderrd = result.stdout, result.stderr
+
+    if result.returncode != 0:
+        raise OpenSCADError(
+            'OpenSCAD syntax error:\n%s%s' %
+            (stdoutd.strip(), stderrd.strip())
+        )
+
+    if stderrd.strip():
+        FreeCAD.Console.PrintWarning(stderrd + u'\n')
+    if stdoutd.strip():
+        FreeCAD.Console.PrintMessage(stdoutd + u'\n')
+
+    return True
 
 def get_openscad_path():
     # Reads path from preferences
@@ -281,10 +361,10 @@ def callopenscadstring_to_file(scad_str, check_syntax=False, outputfilename=None
     If outputfilename is None, a temporary file is created.
     timeout: seconds before subprocess is killed
     """
-    import subprocess
     import tempfile
     import os
     import FreeCAD
+    from freecad.OpenSCAD_Ext.core.openscad_runner import openscad_runner
 
     # --- get OpenSCAD executable from FreeCAD preferences ---
     prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD")
@@ -297,31 +377,20 @@ def callopenscadstring_to_file(scad_str, check_syntax=False, outputfilename=None
 
     # --- create output file if needed ---
     if outputfilename is None:
-        fd, outputfilename = tempfile.mkstemp(suffix=f".{outputext}")
-        os.close(fd)
+        outputfilename = scratch_path(f".{outputext}")
 
-    # --- write SCAD string to temp file ---
-    fd, scad_file = tempfile.mkstemp(suffix=".scad")
-    os.close(fd)
-    with open(scad_file, "w", encoding="utf-8") as f:
-        f.write(scad_str)
-
-    # --- build and run OpenSCAD command ---
-    cmd = [openscad_exe, "-o", outputfilename, scad_file]
+    # --- run OpenSCAD on the string ---
+    args = openscadbackendargs(openscad_exe)
     if check_syntax:
-        cmd.append("-q")
+        args.append("-q")
+    result = openscad_runner().render_string(
+        openscad_exe, scad_str, outputfilename, args=args, timeout=timeout)
 
-    try:
-        subprocess.run(cmd, check=True, capture_output=True, timeout=timeout)
-    except subprocess.TimeoutExpired:
-        os.remove(scad_file)
+    if result.timed_out:
         raise OpenSCADError(f"OpenSCAD call timed out after {timeout} seconds")
-    except subprocess.CalledProcessError as e:
-        os.remove(scad_file)
-        raise OpenSCADError(e.stderr.decode())
+    if result.returncode != 0:
+        raise OpenSCADError(result.stderr)
 
-    # --- clean up temporary SCAD file and return output ---
-    os.remove(scad_file)
     return outputfilename
 
 
@@ -329,8 +398,8 @@ def callopenscadstring(scadstr,outputext='csg',check_syntax=False):
     '''create a tempfile and call the open scad binary
     returns the filename of the result (or None),
     please delete the file afterwards'''
-    import os,tempfile,time
-    dir1=tempfile.gettempdir()
+    import os,time
+    dir1=scratch_dir()
     inputfilename=os.path.join(dir1,'%s.scad' % next(tempfilenamegen))
     inputfile = io.open(inputfilename,'w', encoding="utf8")
     inputfile.write(scadstr)
@@ -586,8 +655,8 @@ def meshoptempfile(opname,iterable1):
     FreeCAD Mesh objects
     uses stl files to supply the mesh data
     """
-    import os,tempfile
-    dir1=tempfile.gettempdir()
+    import os
+    dir1=scratch_dir()
     filenames = []
     for mesh in iterable1:
         outputfilename=os.path.join(dir1,'%s.stl' % next(tempfilenamegen))
@@ -647,7 +716,7 @@ def process2D_ObjectsViaOpenSCADShape(ObjList,Operation,doc):
     fn  = params.GetInt('fnForImport',32)
     fnStr = ",$fn=" + str(fn)
     #
-    dir1=tempfile.gettempdir()
+    dir1=scratch_dir()
     filenames = []
     for item in ObjList :
         outputfilename=os.path.join(dir1,'%s.dxf' % next(tempfilenamegen))
@@ -1,6 +1,7 @@
 from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
 
 from freecad.OpenSCAD_Ext.parsers.csg_parser.ast_nodes import (
+    AstNode,
     Cube, Sphere, Cylinder,
     Union, Difference, Intersection,
     Hull, Minkowski,
@@ -264,9 +265,18 @@ def flatten_ast_node(node, indent=0, _visited=None):
         if hasattr(node, attr):
             out += f"{pad}  {attr}: {getattr(node, attr)!r}\n"
 
-    # Walk all attributes
-    if hasattr(node, "__dict__"):
-        for key, value in node.__dict__.items():
+    # Walk all attributes ( __slots__ AST nodes have no __dict__ )
+    if isinstance(node, AstNode):
+        fields = {
+            "node_type": node.node_type,
+            "params": node.params,
+            "csg_params": node.csg_params,
+            "children": node.children,
+        }
+    else:
+        fields = getattr(node, "__dict__", {})
+    if fields:
+        for key, value in fields.items():
             if key.startswith("_"):
                 continue
             out += f"{pad}  {key}:\n"
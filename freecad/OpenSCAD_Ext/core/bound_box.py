@@ -0,0 +1,65 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Bounding box prefilters for booleans                                   *
+#*                                                                          *
+#*   Booleans whose operands can not touch give a known result :            *
+#*     difference   tool outside the base changes nothing                   *
+#*     intersection of disjoint operands is empty                           *
+#*     union        of disjoint operands is a plain compound                *
+#*   Boxes are axis aligned ( FreeCAD.BoundBox ), widened by tol so         *
+#*   touching operands are always kept.                                     *
+#****************************************************************************
+
+BOX_TOLERANCE = 1e-7
+
+
+def boxes_touch(a, b, tol=BOX_TOLERANCE):
+    """ True unless the two FreeCAD.BoundBox are separated by more than tol """
+    return not (
+        a.XMax + tol < b.XMin or b.XMax + tol < a.XMin or
+        a.YMax + tol < b.YMin or b.YMax + tol < a.YMin or
+        a.ZMax + tol < b.ZMin or b.ZMax + tol < a.ZMin
+    )
+
+
+def boxes_all_touch(boxes, tol=BOX_TOLERANCE):
+    """ Can all boxes share a common point ( i.e. is their intersection non empty ) """
+    if not boxes:
+        return False
+    lo = [max(b.XMin for b in boxes), max(b.YMin for b in boxes), max(b.ZMin for b in boxes)]
+    hi = [min(b.XMax for b in boxes), min(b.YMax for b in boxes), min(b.ZMax for b in boxes)]
+    return all(l <= h + tol for l, h in zip(lo, hi))
+
+
+def touching(base_box, boxes, tol=BOX_TOLERANCE):
+    """ Indices of boxes touching base_box """
+    return [i for i, b in enumerate(boxes) if boxes_touch(base_box, b, tol)]
+
+
+def overlap_clusters(boxes, tol=BOX_TOLERANCE):
+    """
+    Group box indices into clusters of ( transitively ) touching boxes,
+    sweep along X so disjoint inputs stay close to O(n log n).
+    """
+    parent = list(range(len(boxes)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i].XMin)
+    active = []
+    for i in order:
+        box = boxes[i]
+        active = [j for j in active if boxes[j].XMax + tol >= box.XMin]
+        for j in active:
+            if boxes_touch(box, boxes[j], tol):
+                parent[find(i)] = find(j)
+        active.append(i)
+
+    clusters = {}
+    for i in range(len(boxes)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
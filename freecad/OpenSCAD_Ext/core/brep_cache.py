@@ -0,0 +1,221 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Persistent BRep cache for OpenSCAD generated shapes                    *
+#*                                                                          *
+#*   Entries are content addressed : the key is a sha256 of the canonical   *
+#*   SCAD text plus everything else that changes the result (OpenSCAD      *
+#*   version, tolerance ...). Shapes are stored as <key>.brep and evicted   *
+#*   least recently used first once the cache exceeds its size cap.         *
+#****************************************************************************
+'''
+Usage:
+    cache = fallback_cache()
+    key = cache.key(canonical_scad(scad_str), openscad_render_key(), tolerance)
+    shape = cache.get(key)
+    if shape is None:
+        shape = ...
+        cache.put(key, shape)
+
+get() touches the entry so mtime doubles as LRU timestamp
+'''
+import os
+import hashlib
+import threading
+
+try:
+    import FreeCAD
+    import Part
+except ImportError:
+    # plain Python ( unit tests ), only the numpy functions are usable
+    FreeCAD = Part = None
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+
+PARAM_PATH = "User parameter:BaseApp/Preferences/Mod/OpenSCAD"
+
+
+def cache_root():
+    """ Base directory for all OpenSCAD_Ext caches """
+    if hasattr(FreeCAD, "getUserCachePath"):
+        base = FreeCAD.getUserCachePath()
+    else:
+        base = FreeCAD.getUserAppDataDir()
+    return os.path.join(base, "OpenSCAD_Ext")
+
+
+def canonical_scad(scad_str):
+    """
+    Canonical form of a SCAD string for hashing:
+    indentation, trailing blanks and empty lines do not change the result
+    """
+    lines = (line.strip() for line in scad_str.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+# -----------------------------
+# OpenSCAD version
+# -----------------------------
+
+def openscad_version_key(exe=None):
+    """
+    Version string of the configured OpenSCAD executable.
+    Only spawns `openscad -v` again if the executable changed.
+    """
+    from freecad.OpenSCAD_Ext.core.OpenSCADUtils import getopenscadversioncached
+    return getopenscadversioncached(exe) or "unknown"
+
+
+def openscad_render_key(exe=None):
+    """ openscad_version_key plus the backend / extra arguments in use """
+    from freecad.OpenSCAD_Ext.core.OpenSCADUtils import openscadbackendargs
+    return " ".join([openscad_version_key(exe)] + openscadbackendargs(exe))
+
+
+# -----------------------------
+# Cache
+# -----------------------------
+
+class BrepCache:
+    """
+    Directory of <key>.brep files with size capped LRU eviction.
+    Safe to use from several threads, writes are atomic ( tmp + rename ).
+    """
+
+    def __init__(self, name, max_bytes):
+        self.directory = os.path.join(cache_root(), name)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, *parts):
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(str(part).encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".brep")
+
+    def contains(self, key):
+        return os.path.isfile(self.path(key))
+
+    def get(self, key):
+        """ Return cached Part.Shape or None """
+        path = self.path(key)
+        if not os.path.isfile(path):
+            self.misses += 1
+            return None
+        try:
+            shape = Part.Shape()
+            shape.importBrep(path)
+        except Exception as e:
+            write_log("Cache", f"Discarding unreadable entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+        if shape.isNull():
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return shape
+
+    def put(self, key, shape):
+        """ Store shape, ignores None / null shapes """
+        if shape is None or shape.isNull():
+            return
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shape.exportBrep(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            write_log("Cache", f"Failed to store {path}: {e}")
+            self._remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """ Remove least recently used entries until under max_bytes """
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".brep"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _mtime, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+            write_log("Cache", f"Evicted {self.directory} down to {total} bytes")
+
+    def clear(self):
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".brep"):
+                    self._remove(entry.path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_fallback_cache = None
+
+
+def fallback_cache():
+    """
+    Cache for Hull / Minkowski OpenSCAD fallbacks.
+    Returns None if disabled in preferences.
+    """
+    global _fallback_cache
+    prefs = FreeCAD.ParamGet(PARAM_PATH)
+    if not prefs.GetBool("useBrepCache", True):
+        return None
+    max_bytes = prefs.GetInt("brepCacheMaxMB", 512) * 1024 * 1024
+    if _fallback_cache is None:
+        _fallback_cache = BrepCache("fallback", max_bytes)
+    else:
+        _fallback_cache.max_bytes = max_bytes
+    return _fallback_cache
+
+
+_render_cache = None
+
+
+def render_cache():
+    """
+    Cache for SCAD object renders, keyed on the source dependency closure.
+    Returns None if disabled in preferences.
+    """
+    global _render_cache
+    prefs = FreeCAD.ParamGet(PARAM_PATH)
+    if not prefs.GetBool("useRenderCache", True):
+        return None
+    max_bytes = prefs.GetInt("renderCacheMaxMB", 1024) * 1024 * 1024
+    if _render_cache is None:
+        _render_cache = BrepCache("render", max_bytes)
+    else:
+        _render_cache.max_bytes = max_bytes
+    return _render_cache
@@ -35,7 +35,12 @@ def checkObjShape(obj) :
         if printverbose: write_log("INFO",f"Check Object Shape {obj.Label}")
         if obj.Shape.isNull() == True :
             if printverbose: write_log("INFO",'Shape is Null - recompute')
-            obj.recompute()
+            # Document recomputes are deferred during import, so
+            # recompute what obj depends on as well
+            try:
+                obj.recompute(True)
+            except TypeError:
+                obj.recompute()
         if (obj.Shape.isNull() == True):
            print(f'Recompute failed : {obj.Name}')
     else:
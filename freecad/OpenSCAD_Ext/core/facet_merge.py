@@ -0,0 +1,232 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Coplanar facet merging for mesh → BRep conversion                      *
+#*                                                                          *
+#*   Adjacent facets on the same plane are merged into one polygonal face   *
+#*   ( with holes ) before any OCC work, instead of building a face per     *
+#*   triangle and cleaning up with removeSplitter().                        *
+#*                                                                          *
+#*   Mesh layout is the one used by core/mesh_io.py                         *
+#*       vertices (N, 3), indices flat, offsets (F + 1)                     *
+#****************************************************************************
+import numpy as np
+
+try:
+    import FreeCAD
+    import Part
+except ImportError:
+    # plain Python ( unit tests ), only the numpy functions are usable
+    FreeCAD = Part = None
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.mesh_io import face_edges
+
+
+def facet_normals(vertices, indices, offsets):
+    """
+    Newell normals of all ( planar polygon ) facets.
+    Returns unit normals (F, 3) and areas (F,)
+    """
+    edges = face_edges(indices, offsets)
+    cross = np.cross(vertices[edges[:, 0]], vertices[edges[:, 1]])
+    area_vec = 0.5 * np.add.reduceat(cross, offsets[:-1], axis=0)
+    areas = np.linalg.norm(area_vec, axis=1)
+    normals = area_vec / np.where(areas > 0, areas, 1.0)[:, None]
+    return normals, areas
+
+
+def _connected_labels(count, pairs):
+    """ Connected component label per element, pairs (P, 2) are the links """
+    labels = np.arange(count)
+    if len(pairs) == 0:
+        return labels
+    a, b = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, a, low)
+        np.minimum.at(new, b, low)
+        new = new[new]
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def plane_components(vertices, indices, offsets,
+                     angle_tol=1e-4, dist_tol=None):
+    """
+    Label facets so that edge adjacent, coplanar facets share a label.
+    Returns (labels (F,), normals (F, 3))
+    """
+    normals, areas = facet_normals(vertices, indices, offsets)
+    count = len(offsets) - 1
+
+    if dist_tol is None:
+        diag = np.linalg.norm(np.ptp(vertices, axis=0)) if len(vertices) else 1.0
+        dist_tol = max(diag * 1e-6, 1e-9)
+
+    # Plane key : quantized normal + quantized offset
+    first = vertices[indices[offsets[:-1]]]
+    dist = np.einsum("ij,ij->i", normals, first)
+    keys = np.concatenate((
+        np.round(normals / angle_tol),
+        np.round(dist / dist_tol)[:, None],
+    ), axis=1).astype(np.int64)
+    _, plane = np.unique(keys, axis=0, return_inverse=True)
+    plane = plane.reshape(-1)
+
+    # Facets sharing an undirected edge
+    edges = face_edges(indices, offsets)
+    owner = np.repeat(np.arange(count), np.diff(offsets))
+    und = np.sort(edges, axis=1)
+    order = np.lexsort((und[:, 1], und[:, 0]))
+    und, owner_sorted = und[order], owner[order]
+    same = np.all(und[1:] == und[:-1], axis=1)
+    pairs = np.stack((owner_sorted[:-1][same], owner_sorted[1:][same]), axis=1)
+
+    # Only link facets on the same plane, degenerate facets stay alone
+    keep = (plane[pairs[:, 0]] == plane[pairs[:, 1]]) \
+        & (areas[pairs[:, 0]] > 0) & (areas[pairs[:, 1]] > 0)
+    labels = _connected_labels(count, pairs[keep])
+    return labels, normals
+
+
+def drop_collinear(points, eps=1e-9):
+    """ Remove loop vertices lying on the segment between their neighbours """
+    if len(points) <= 3:
+        return points
+    d1 = points - np.roll(points, 1, axis=0)
+    d2 = np.roll(points, -1, axis=0) - points
+    cross = np.linalg.norm(np.cross(d1, d2), axis=1)
+    scale = np.linalg.norm(d1, axis=1) * np.linalg.norm(d2, axis=1)
+    keep = cross > eps * np.maximum(scale, eps)
+    if keep.sum() < 3:
+        return points
+    return points[keep]
+
+
+def _chain_loops(boundary):
+    """
+    Chain directed boundary edges (E, 2) into closed vertex loops.
+    Returns None if a vertex is pinched ( several outgoing edges ).
+    """
+    succ = {}
+    for a, b in boundary.tolist():
+        if a in succ:
+            return None
+        succ[a] = b
+    loops = []
+    while succ:
+        start, nxt = succ.popitem()
+        loop = [start]
+        while nxt != start:
+            loop.append(nxt)
+            nxt = succ.pop(nxt, None)
+            if nxt is None:
+                return None
+        loops.append(loop)
+    return loops
+
+
+def merged_faces(vertices, indices, offsets, angle_tol=1e-4, dist_tol=None):
+    """
+    Coplanar merge as vertex loops.
+    Returns list of (normal, [loop, ...]) one entry per output face,
+    loops are vertex index lists, outer boundary counter clockwise.
+    """
+    labels, normals = plane_components(
+        vertices, indices, offsets, angle_tol, dist_tol
+    )
+    count = len(offsets) - 1
+
+    edges = face_edges(indices, offsets)
+    owner = np.repeat(np.arange(count), np.diff(offsets))
+    edge_label = labels[owner]
+
+    # A directed edge is interior if its reverse belongs to the same component
+    key = edges[:, 0].astype(np.int64) * (len(vertices) + 1) + edges[:, 1]
+    rkey = edges[:, 1].astype(np.int64) * (len(vertices) + 1) + edges[:, 0]
+    lkey = np.stack((edge_label, key), axis=1)
+    rlkey = np.stack((edge_label, rkey), axis=1)
+    both = np.concatenate((lkey, rlkey))
+    _, inv, counts = np.unique(both, axis=0, return_inverse=True, return_counts=True)
+    inv = inv.reshape(-1)
+    interior = counts[inv[len(edges):]] > 1
+
+    boundary_edges = edges[~interior]
+    boundary_labels = edge_label[~interior]
+
+    order = np.argsort(boundary_labels, kind="stable")
+    boundary_edges = boundary_edges[order]
+    boundary_labels = boundary_labels[order]
+    splits = np.flatnonzero(np.diff(boundary_labels)) + 1
+
+    comp_size = np.bincount(labels, minlength=count)
+    faces = []
+    for group in np.split(np.arange(len(boundary_labels)), splits):
+        if len(group) == 0:
+            continue
+        label = int(boundary_labels[group[0]])
+        normal = normals[label]
+        if comp_size[label] == 1:
+            start, end = offsets[label], offsets[label + 1]
+            faces.append((normal, [indices[start:end].tolist()]))
+            continue
+        loops = _chain_loops(boundary_edges[group])
+        if loops is None:
+            # pinched component, keep its facets as they are
+            for f in np.flatnonzero(labels == label).tolist():
+                start, end = offsets[f], offsets[f + 1]
+                faces.append((normals[f], [indices[start:end].tolist()]))
+            continue
+        faces.append((normal, loops))
+    return faces
+
+
+def _make_face(vertices, loops):
+    wires = []
+    for loop in loops:
+        pts = drop_collinear(vertices[loop])
+        vecs = [FreeCAD.Vector(*p) for p in pts.tolist()]
+        wires.append(Part.makePolygon(vecs + vecs[:1]))
+    if len(wires) == 1:
+        return Part.Face(wires[0])
+    return Part.makeFace(wires, "Part::FaceMakerBullseye")
+
+
+def merged_shape_from_mesh(vertices, indices, offsets, tolerance=None,
+                           max_ratio=0.5):
+    """
+    Build a Solid ( or sewn shell if open ) from merged coplanar faces.
+    Returns None when merging does not pay off ( face count not reduced
+    below max_ratio of the facets ) or OCC fails, so the caller can use
+    the plain makeShapeFromMesh path instead.
+    Vertices are expected to be welded, so the default sewing
+    tolerance is tiny ( relative to the mesh size ).
+    """
+    count = len(offsets) - 1
+    if count == 0:
+        return None
+    if tolerance is None:
+        diag = np.linalg.norm(np.ptp(vertices, axis=0))
+        tolerance = max(diag * 1e-7, 1e-7)
+
+    faces = merged_faces(vertices, indices, offsets)
+    write_log("Merge", f"Coplanar merge {count} facets → {len(faces)} faces")
+    if len(faces) > max_ratio * count:
+        return None
+
+    try:
+        occ_faces = [_make_face(vertices, loops) for _normal, loops in faces]
+        shell = Part.Compound(occ_faces)
+        shell.sewShape(tolerance)
+        shells = shell.Shells
+        if len(shells) != 1:
+            return shell
+        solid = Part.Solid(shells[0])
+        if solid.Volume < 0:
+            solid.reverse()
+        return solid
+    except Exception as e:
+        write_log("Merge", f"Merged face construction failed: {e}")
+        return None
@@ -0,0 +1,216 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   numpy readers for OpenSCAD mesh output ( binary / ASCII STL, OFF )     *
+#*                                                                          *
+#*   Meshes are returned as                                                 *
+#*       vertices : float64 (N, 3)                                          *
+#*       indices  : int32 flat face index buffer                            *
+#*       offsets  : int32 (F + 1), face i = indices[offsets[i]:offsets[i+1]]*
+#****************************************************************************
+import os
+import re
+
+import numpy as np
+
+try:
+    import FreeCAD
+    import Part
+except ImportError:
+    # plain Python ( unit tests ), only the numpy functions are usable
+    FreeCAD = Part = None
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+
+_STL_RECORD = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+_ASCII_VERTEX_RE = re.compile(
+    rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)"
+)
+
+
+def triangle_offsets(count):
+    return np.arange(0, 3 * count + 1, 3, dtype=np.int32)
+
+
+# -----------------------------
+# STL
+# -----------------------------
+
+def _is_binary_stl(data):
+    if len(data) < 84:
+        return False
+    count = int(np.frombuffer(data, dtype="<u4", count=1, offset=80)[0])
+    return len(data) == 84 + count * _STL_RECORD.itemsize
+
+
+def read_stl_triangles(path):
+    """ Raw triangle corners float64 (T, 3, 3), binary or ASCII """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if _is_binary_stl(data):
+        count = int(np.frombuffer(data, dtype="<u4", count=1, offset=80)[0])
+        records = np.frombuffer(data, dtype=_STL_RECORD, count=count, offset=84)
+        return records["vertices"].astype(np.float64)
+
+    # ASCII : only the vertex lines carry geometry
+    coords = _ASCII_VERTEX_RE.findall(data)
+    points = np.array(coords, dtype=np.float64)
+    return points.reshape(-1, 3, 3)
+
+
+def write_stl_triangles(path, corners):
+    """ Triangle corners (T, 3, 3) → binary STL """
+    corners = np.asarray(corners, dtype=np.float64).reshape(-1, 3, 3)
+    records = np.zeros(len(corners), dtype=_STL_RECORD)
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    length = np.linalg.norm(normals, axis=1)
+    length[length == 0] = 1.0
+    records["normal"] = normals / length[:, None]
+    records["vertices"] = corners
+    with open(path, "wb") as f:
+        f.write(b"\0" * 80)
+        f.write(np.array([len(corners)], dtype="<u4").tobytes())
+        f.write(records.tobytes())
+
+
+def weld_vertices(points, tolerance=1e-6):
+    """
+    Merge points closer than tolerance ( grid snapping ).
+    Returns unique vertices and the index of each input point.
+    """
+    if len(points) == 0:
+        return np.zeros((0, 3)), np.zeros(0, dtype=np.int32)
+    grid = np.round(points / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(
+        grid, axis=0, return_index=True, return_inverse=True
+    )
+    return points[first], inverse.reshape(-1).astype(np.int32)
+
+
+def read_stl(path, tolerance=1e-6):
+    """
+    Read STL into welded (vertices, indices, offsets).
+    Triangles collapsed by welding are dropped.
+    """
+    corners = read_stl_triangles(path)
+    vertices, inverse = weld_vertices(corners.reshape(-1, 3), tolerance)
+    tris = inverse.reshape(-1, 3)
+
+    keep = (
+        (tris[:, 0] != tris[:, 1])
+        & (tris[:, 1] != tris[:, 2])
+        & (tris[:, 2] != tris[:, 0])
+    )
+    tris = tris[keep]
+    return vertices, tris.reshape(-1), triangle_offsets(len(tris))
+
+
+# -----------------------------
+# OFF
+# -----------------------------
+
+def read_off(path):
+    """
+    Read OFF into (vertices, indices, offsets), already indexed.
+    COFF / NOFF / CNOFF / STOFF headers are accepted, extra vertex
+    columns ( normals, colours, texture coords ) and per face colours
+    are dropped.
+    """
+    with open(path, "rb") as f:
+        lines = [
+            line.split(b"#", 1)[0].strip() for line in f
+        ]
+    lines = [line for line in lines if line]
+
+    header = lines[0].split()
+    if not header or not header[0].endswith(b"OFF"):
+        raise ValueError(f"Not an OFF file: {path}")
+    body = lines[1:]
+    counts = header[1:] or body.pop(0).split()
+    nv, nf = int(counts[0]), int(counts[1])
+
+    rows = body[:nv]
+    if len({len(row.split()) for row in rows}) <= 1:
+        vertices = np.array(
+            b" ".join(rows).split(), dtype=np.float64
+        ).reshape(nv, -1)[:, :3]
+    else:
+        # colours on some vertices only
+        vertices = np.array(
+            [row.split()[:3] for row in rows], dtype=np.float64
+        ).reshape(nv, 3)
+
+    faces = [line.split() for line in body[nv:nv + nf]]
+    sizes = np.array([int(face[0]) for face in faces], dtype=np.int32)
+    indices = np.array(
+        [v for face, n in zip(faces, sizes) for v in face[1:1 + n]],
+        dtype=np.int64,
+    ).astype(np.int32)
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int32)
+    np.cumsum(sizes, out=offsets[1:])
+    return vertices, indices, offsets
+
+
+def read_mesh(path, tolerance=1e-6):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".off":
+        return read_off(path)
+    return read_stl(path, tolerance)
+
+
+# -----------------------------
+# Topology checks / Shape construction
+# -----------------------------
+
+def face_edges(indices, offsets):
+    """ Directed edges (E, 2) of all faces, in face order """
+    nxt = np.arange(1, len(indices) + 1)
+    nxt[offsets[1:] - 1] = offsets[:-1]
+    return np.stack((indices, indices[nxt]), axis=1)
+
+
+def is_closed(indices, offsets):
+    """ Every undirected edge used by exactly two faces """
+    if len(indices) == 0:
+        return False
+    edges = np.sort(face_edges(indices, offsets), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    return bool(np.all(counts == 2))
+
+
+def mesh_to_shape(vertices, indices, offsets, tolerance=0.05):
+    """
+    Faces → sewn Part.Shape ( shell / compound of faces ).
+    Triangles go through makeShapeFromMesh, other polygons
+    are built face by face.
+    """
+    vectors = [FreeCAD.Vector(*p) for p in vertices.tolist()]
+    sizes = np.diff(offsets)
+
+    shape = Part.Shape()
+    if np.all(sizes == 3):
+        facets = [tuple(t) for t in indices.reshape(-1, 3).tolist()]
+        shape.makeShapeFromMesh((vectors, facets), tolerance)
+        return shape
+
+    faces = []
+    for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        loop = [vectors[i] for i in indices[start:end].tolist()]
+        wire = Part.makePolygon(loop + loop[:1])
+        try:
+            faces.append(Part.Face(wire))
+        except Part.OCCError:
+            # non planar polygon
+            try:
+                faces.append(Part.makeFilledFace(wire.Edges))
+            except Part.OCCError as e:
+                write_log("Mesh", f"Skipping bad facet: {e}")
+    shell = Part.makeShell(faces)
+    shape = shell.copy()
+    shape.sewShape(tolerance)
+    return shape
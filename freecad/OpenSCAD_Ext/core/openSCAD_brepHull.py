@@ -3,7 +3,10 @@ import Part
 import math
 from FreeCAD import Base
 
+import numpy as np
+
 from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.quickhull import hull_shape_from_points
 
 # ============================================================
 # Unit-safe helpers
@@ -104,6 +107,18 @@ def create_Brep_Hull_Shape(group):
                     if getRadius(cyl) == getRadius(sph):
                         return hullSphereCylinderEqRad(cyl, sph)
 
+    # -------------------------
+    # Planar faced children ( boxes, polyhedra, prisms ) :
+    # the hull of their vertices is exact
+    # -------------------------
+    if all(chkPolyhedral(obj) for obj in group):
+        pts = [v.Point for obj in group for v in obj.Shape.Vertexes]
+        shape = hull_shape_from_points(
+            np.array([[p.x, p.y, p.z] for p in pts])
+        )
+        if shape is not None:
+            return shape
+
     write_log("Info", "Hull not directly handled")
     return None
 
@@ -119,6 +134,13 @@ def chk2D(obj):
         return True
     return abs(shp.Volume) < 1e-9
 
+def chkPolyhedral(obj):
+    shp = obj.Shape
+    if shp.isNull() or not shp.Faces:
+        return False
+    return all(f.Surface.TypeId == "Part::GeomPlane" for f in shp.Faces) \
+        and all(e.Curve.TypeId == "Part::GeomLine" for e in shp.Edges)
+
 def chkParallel(group):
     r0 = group[0].Placement.Rotation
     for obj in group[1:]:
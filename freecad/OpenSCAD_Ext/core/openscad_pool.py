@@ -0,0 +1,37 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Bounded pool for running OpenSCAD subprocesses concurrently            *
+#*                                                                          *
+#*   Each worker thread only waits on its OpenSCAD process, so the number   *
+#*   of workers is the number of OpenSCAD processes running at once.        *
+#****************************************************************************
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import FreeCAD
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+
+PARAM_PATH = "User parameter:BaseApp/Preferences/Mod/OpenSCAD"
+
+
+def worker_count():
+    """ fallbackWorkers preference, 0 = one per core """
+    workers = FreeCAD.ParamGet(PARAM_PATH).GetInt("fallbackWorkers", 0)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def fallback_pool():
+    workers = worker_count()
+    write_log("Pool", f"OpenSCAD pool with {workers} worker(s)")
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="OpenSCAD")
+
+
+def shutdown_pool(pool):
+    """ Drop jobs nobody asked for, wait for the running ones """
+    try:
+        pool.shutdown(wait=True, cancel_futures=True)
+    except TypeError:   # Python < 3.9
+        pool.shutdown(wait=True)
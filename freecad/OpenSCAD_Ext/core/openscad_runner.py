@@ -0,0 +1,307 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Long lived runner for OpenSCAD jobs                                    *
+#*                                                                          *
+#*   All OpenSCAD calls go through one runner per session :                 *
+#*     - job queue bounded by fallbackWorkers ( core/openscad_pool.py )     *
+#*     - per job timeout, the process is killed when it expires             *
+#*     - crash recovery, a process killed by a signal is started again      *
+#*     - warm spares : OpenSCAD has no server mode, but from 2021.01 it     *
+#*       reads its input from stdin ( "-" ), so processes for string jobs   *
+#*       are started ahead and pay exec / library loading while idle        *
+#*   Nothing here shows dialogs, callers decide how to report a JobResult   *
+#****************************************************************************
+import atexit
+import os
+import subprocess
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import FreeCAD
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.openscad_pool import PARAM_PATH, worker_count
+from freecad.OpenSCAD_Ext.core.scratch import scratch_path, release
+
+JobResult = namedtuple("JobResult", "returncode stdout stderr timed_out cancelled")
+
+
+def _decode(data):
+    return data.decode("utf8", errors="replace") if data else ""
+
+
+def stdin_supported(version=None):
+    """ openscad -o out.stl - reads the model from stdin, OpenSCAD 2021.01+ """
+    from freecad.OpenSCAD_Ext.core.OpenSCADUtils import openscadversiondate
+    return openscadversiondate(version) >= (2021, 1)
+
+
+class OpenSCADRunner:
+    """
+    Queue of OpenSCAD jobs, at most `workers` processes run at once.
+    run() blocks the caller, submit() returns a Future.
+    """
+
+    def __init__(self, workers=None, spares=None):
+        self.workers = workers or worker_count()
+        if spares is None:
+            spares = FreeCAD.ParamGet(PARAM_PATH).GetInt("openscadWarmSpares", 1)
+        self.spares = max(spares, 0)
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._running = {}  # Popen → thread that started the job
+        self._cancelled = set()
+        self._warm = {}     # (cmd prefix, ext, cwd, OPENSCADPATH) → [(Popen, outputfile)]
+        self._stdin = {}    # executable → stdin_supported
+        self._owner = threading.local()
+
+    # -----------------------------
+    # Job ownership
+    # -----------------------------
+
+    def current_owner(self):
+        """ Thread ident jobs started now are cancelled with """
+        return getattr(self._owner, "ident", None) or threading.get_ident()
+
+    @contextmanager
+    def acting_for(self, ident):
+        """ Jobs started in this block belong to thread ident, see cancel() """
+        outer = getattr(self._owner, "ident", None)
+        self._owner.ident = ident
+        try:
+            yield
+        finally:
+            self._owner.ident = outer
+
+    # -----------------------------
+    # Processes
+    # -----------------------------
+
+    def _spawn(self, cmd):
+        p = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        with self._lock:
+            self._running[p] = self.current_owner()
+        return p
+
+    def _wait(self, p, timeout, data=None):
+        timed_out = False
+        try:
+            try:
+                out, err = p.communicate(input=data, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                write_log("OpenSCAD", f"Killing OpenSCAD after {timeout}s")
+                timed_out = True
+                p.kill()
+                out, err = p.communicate()
+        finally:
+            with self._lock:
+                self._running.pop(p, None)
+                cancelled = p in self._cancelled
+                self._cancelled.discard(p)
+        return JobResult(p.returncode, _decode(out), _decode(err), timed_out, cancelled)
+
+    def _crashed(self, result):
+        """ Killed by a signal ( negative return code ), not by us """
+        return (
+            result.returncode is not None and result.returncode < 0
+            and not result.timed_out and not result.cancelled
+        )
+
+    def _execute(self, start, timeout, retries, data):
+        """ start() → Popen, retried if the process crashes """
+        with self._slots:
+            for attempt in range(retries + 1):
+                try:
+                    p = start()
+                except OSError as e:
+                    return JobResult(None, "", str(e), False, False)
+                result = self._wait(p, timeout, data)
+                if not self._crashed(result) or attempt == retries:
+                    return result
+                write_log("OpenSCAD", f"OpenSCAD died ( signal {-result.returncode} ), restarting")
+            return result
+
+    # -----------------------------
+    # Jobs
+    # -----------------------------
+
+    def run(self, cmd, timeout=None, retries=1):
+        """ Run the complete command line cmd, returns JobResult """
+        return self._execute(lambda: self._spawn(cmd), timeout, retries, None)
+
+    def submit(self, fn, *args, **kwargs):
+        """ fn(*args, **kwargs) on the runner threads, e.g. submit(runner.run, cmd) """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="OpenSCADJob")
+            return self._executor.submit(fn, *args, **kwargs)
+
+    def render_string(self, executable, scad_str, outputfilename,
+                      args=(), timeout=None, retries=1):
+        """
+        Render scad_str to outputfilename with executable + args.
+        scad_str must not use relative include / use paths, when it is
+        fed through stdin they resolve against the working directory.
+        """
+        prefix = (executable, *args)
+        ext = os.path.splitext(outputfilename)[1]
+        data = scad_str.encode("utf8")
+
+        if self.spares and self._stdin_ok(executable):
+            # a spare resolves include <> against the directory and library
+            # path it was started with, only reuse it while they match
+            key = (prefix, ext, *_environment())
+            taken = []
+
+            def start():
+                p, outfile = self._take_spare(key)
+                taken.append(outfile)
+                return p
+
+            result = self._execute(start, timeout, retries, data)
+            self._fill_spares(key)
+            # every attempt wrote its own file, keep the last one
+            for outfile in taken[:-1]:
+                release(outfile)
+            if taken:
+                _move(taken[-1], outputfilename)
+            return result
+
+        scad_file = scratch_path(".scad")
+        with open(scad_file, "wb") as f:
+            f.write(data)
+        try:
+            return self.run([*prefix, "-o", outputfilename, scad_file], timeout, retries)
+        finally:
+            release(scad_file)
+
+    # -----------------------------
+    # Warm spares
+    # -----------------------------
+
+    def _stdin_ok(self, executable):
+        if executable not in self._stdin:
+            from freecad.OpenSCAD_Ext.core.OpenSCADUtils import getopenscadversioncached
+            self._stdin[executable] = stdin_supported(getopenscadversioncached(executable))
+        return self._stdin[executable]
+
+    def _start_spare(self, key):
+        prefix, ext = key[:2]
+        outfile = scratch_path(ext, prefix="spare-")
+        p = subprocess.Popen(
+            [*prefix, "-o", outfile, "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return p, outfile
+
+    def _take_spare(self, key):
+        """ Idle process still waiting on stdin, or a new one """
+        with self._lock:
+            spares = self._warm.get(key, [])
+            while spares:
+                p, outfile = spares.pop()
+                if p.poll() is None:
+                    self._running[p] = self.current_owner()
+                    return p, outfile
+                # died while idle
+                release(outfile)
+        p, outfile = self._start_spare(key)
+        with self._lock:
+            self._running[p] = self.current_owner()
+        return p, outfile
+
+    def _fill_spares(self, key):
+        with self._lock:
+            # working directory / OPENSCADPATH changed, older spares are stale
+            stale = [k for k in self._warm if k[2:] != key[2:]]
+            dropped = [spare for k in stale for spare in self._warm.pop(k)]
+            spares = self._warm.setdefault(key, [])
+            try:
+                while len(spares) < self.spares:
+                    spares.append(self._start_spare(key))
+            except OSError as e:
+                write_log("OpenSCAD", f"Warm spare not started: {e}")
+        _kill_spares(dropped)
+
+    # -----------------------------
+    # Shutdown
+    # -----------------------------
+
+    def cancel(self, thread=None):
+        """
+        Kill running jobs, all of them or those owned by thread
+        ( threading.get_ident(), see acting_for ), their results have
+        cancelled set
+        """
+        with self._lock:
+            running = [
+                p for p, ident in self._running.items()
+                if thread is None or ident == thread
+            ]
+            self._cancelled.update(running)
+        for p in running:
+            try:
+                p.kill()
+            except OSError:
+                pass
+        if running:
+            write_log("OpenSCAD", f"Cancelled {len(running)} OpenSCAD job(s)")
+
+    def shutdown(self):
+        self.cancel()
+        with self._lock:
+            warm, self._warm = self._warm, {}
+            executor, self._executor = self._executor, None
+        for spares in warm.values():
+            _kill_spares(spares)
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _environment():
+    """ What an OpenSCAD process inherits that changes include resolution """
+    return os.getcwd(), os.environ.get("OPENSCADPATH", "")
+
+
+def _kill_spares(spares):
+    for p, outfile in spares:
+        try:
+            p.kill()
+            p.communicate()
+        except OSError:
+            pass
+        release(outfile)
+
+
+def _move(src, dst):
+    try:
+        os.replace(src, dst)
+    except OSError:
+        # other file system
+        import shutil
+        shutil.move(src, dst)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def openscad_runner():
+    """ Session wide OpenSCADRunner """
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = OpenSCADRunner()
+            atexit.register(_runner.shutdown)
+        return _runner
@@ -0,0 +1,228 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Bulk polyhedron → Part.Shape                                           *
+#*                                                                          *
+#*   All clean up happens on numpy arrays before any OCC call :             *
+#*     - duplicate points welded, repeated face vertices removed            *
+#*     - degenerate ( < 3 vertices / zero area ) faces dropped              *
+#*     - non planar faces split into triangle fans                          *
+#*     - faces oriented consistently, outward ( OpenSCAD faces are          *
+#*       clockwise seen from outside )                                      *
+#*   then coplanar faces ( triangle fans of STL derived polyhedra ) are     *
+#*   merged and the shell is built in one pass ( core/facet_merge.py )      *
+#*                                                                          *
+#*   Mesh layout is the one used by core/mesh_io.py                         *
+#****************************************************************************
+from collections import deque
+
+import numpy as np
+
+try:
+    import Part
+except ImportError:
+    # plain Python ( unit tests ), only the numpy functions are usable
+    Part = None
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.mesh_io import (
+    face_edges,
+    weld_vertices,
+    is_closed,
+    mesh_to_shape,
+)
+from freecad.OpenSCAD_Ext.core.facet_merge import (
+    facet_normals,
+    merged_shape_from_mesh,
+)
+
+
+def face_owner(offsets):
+    """ Face index of every entry of the index buffer """
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def _offsets(sizes):
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int32)
+    np.cumsum(sizes, out=offsets[1:])
+    return offsets
+
+
+def reverse_faces(indices, offsets, mask=None):
+    """ Reverse the vertex order of all faces ( or those selected by mask ) """
+    owner = face_owner(offsets)
+    local = np.arange(len(indices)) - offsets[owner]
+    rev = offsets[owner + 1] - 1 - local
+    if mask is not None:
+        rev = np.where(mask[owner], rev, np.arange(len(indices)))
+    return indices[rev]
+
+
+def clean_faces(points, indices, offsets, tolerance=None):
+    """
+    Weld points, drop repeated consecutive vertices and faces left
+    with less than 3 vertices or no area.
+    Returns (points, indices, offsets)
+    """
+    if tolerance is None:
+        diag = np.linalg.norm(np.ptp(points, axis=0)) if len(points) else 1.0
+        tolerance = max(diag * 1e-9, 1e-12)
+    points, remap = weld_vertices(points, tolerance)
+    indices = remap[indices]
+
+    # vertex equal to the next one ( cyclic within the face )
+    nxt = face_edges(indices, offsets)[:, 1]
+    keep = indices != nxt
+    owner = face_owner(offsets)
+    sizes = np.bincount(owner[keep], minlength=len(offsets) - 1)
+    indices, offsets = indices[keep], _offsets(sizes)
+
+    good = sizes >= 3
+    if not np.all(good):
+        indices, offsets = indices[good[face_owner(offsets)]], _offsets(sizes[good])
+
+    _normals, areas = facet_normals(points, indices, offsets)
+    good = areas > 0
+    if not np.all(good):
+        indices = indices[good[face_owner(offsets)]]
+        offsets = _offsets(np.diff(offsets)[good])
+    return points, indices.astype(np.int32), offsets
+
+
+def triangulate_nonplanar(points, indices, offsets, tolerance=None):
+    """
+    Fan triangulate faces whose vertices are not on one plane, OCC can
+    not build a planar face for them. Planar faces are kept as they are.
+    Returns (indices, offsets)
+    """
+    sizes = np.diff(offsets)
+    if len(sizes) == 0 or np.all(sizes == 3):
+        return indices, offsets
+    if tolerance is None:
+        diag = np.linalg.norm(np.ptp(points, axis=0))
+        tolerance = max(diag * 1e-9, 1e-7)
+
+    normals, _areas = facet_normals(points, indices, offsets)
+    owner = face_owner(offsets)
+    first = points[indices[offsets[:-1]]]
+    dist = np.abs(np.einsum(
+        "ij,ij->i", points[indices] - first[owner], normals[owner]))
+    deviation = np.maximum.reduceat(dist, offsets[:-1])
+    bent = (sizes > 3) & (deviation > tolerance)
+    if not bent.any():
+        return indices, offsets
+
+    write_log("Polyhedron", f"Triangulating {int(bent.sum())} non planar faces")
+    kept = indices[~bent[owner]]
+    kept_sizes = sizes[~bent]
+    fans = []
+    for f in np.flatnonzero(bent).tolist():
+        face = indices[offsets[f]:offsets[f + 1]]
+        k = len(face)
+        fans.append(np.stack((
+            np.full(k - 2, face[0]), face[1:k - 1], face[2:k]), axis=1).reshape(-1))
+    fans = np.concatenate(fans)
+    indices = np.concatenate((kept, fans)).astype(np.int32)
+    offsets = _offsets(np.concatenate((kept_sizes, np.full(len(fans) // 3, 3))))
+    return indices, offsets
+
+
+def _consistent(indices, offsets):
+    """ No directed edge used twice ( neighbours traverse shared edges oppositely ) """
+    edges = face_edges(indices, offsets).astype(np.int64)
+    keys = edges[:, 0] * (int(edges.max()) + 1) + edges[:, 1]
+    return len(np.unique(keys)) == len(keys)
+
+
+def orient_consistently(indices, offsets):
+    """
+    Flip faces so that neighbours agree, breadth first from one face
+    per edge connected component.
+    """
+    count = len(offsets) - 1
+    edges = face_edges(indices, offsets)
+    owner = face_owner(offsets)
+
+    # pair the ( up to two ) faces of every undirected edge
+    und = np.sort(edges, axis=1)
+    order = np.lexsort((und[:, 1], und[:, 0]))
+    und_s = und[order]
+    same = np.flatnonzero(np.all(und_s[1:] == und_s[:-1], axis=1))
+    a, b = order[same], order[same + 1]
+    # True if both faces walk the edge in the same direction
+    agree = edges[a, 0] == edges[b, 0]
+
+    neighbours = [[] for _ in range(count)]
+    for fa, fb, conflict in zip(owner[a].tolist(), owner[b].tolist(), agree.tolist()):
+        neighbours[fa].append((fb, conflict))
+        neighbours[fb].append((fa, conflict))
+
+    flip = np.zeros(count, dtype=bool)
+    seen = np.zeros(count, dtype=bool)
+    for start in range(count):
+        if seen[start]:
+            continue
+        seen[start] = True
+        queue = deque([start])
+        while queue:
+            f = queue.popleft()
+            for g, conflict in neighbours[f]:
+                if not seen[g]:
+                    seen[g] = True
+                    flip[g] = flip[f] ^ conflict
+                    queue.append(g)
+
+    if flip.any():
+        write_log("Polyhedron", f"Reoriented {int(flip.sum())} faces")
+        indices = reverse_faces(indices, offsets, flip)
+    return indices
+
+
+def signed_volume(points, indices, offsets):
+    normals, areas = facet_normals(points, indices, offsets)
+    first = points[indices[offsets[:-1]]]
+    return float(np.einsum("ij,ij->i", normals * areas[:, None], first).sum() / 3.0)
+
+
+def polyhedron_shape(points, indices, offsets, openscad_order=True):
+    """
+    Part.Solid ( or shell / compound if not closed ) of a polyhedron.
+    openscad_order : faces are clockwise seen from outside.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    indices = np.asarray(indices, dtype=np.int32)
+    offsets = np.asarray(offsets, dtype=np.int32)
+    if len(points) == 0 or len(offsets) < 2:
+        return None
+
+    count = len(offsets) - 1
+    points, indices, offsets = clean_faces(points, indices, offsets)
+    if len(offsets) < 2:
+        return None
+    if len(offsets) - 1 < count:
+        write_log("Polyhedron", f"Dropped {count - len(offsets) + 1} degenerate faces")
+    indices, offsets = triangulate_nonplanar(points, indices, offsets)
+
+    if openscad_order:
+        indices = reverse_faces(indices, offsets)
+    if not _consistent(indices, offsets):
+        indices = orient_consistently(indices, offsets)
+
+    closed = is_closed(indices, offsets)
+    if closed and signed_volume(points, indices, offsets) < 0:
+        indices = reverse_faces(indices, offsets)
+
+    shape = merged_shape_from_mesh(points, indices, offsets, max_ratio=float("inf"))
+    if shape is not None:
+        return shape
+
+    write_log("Polyhedron", "Merged build failed, using per facet shell")
+    shape = mesh_to_shape(points, indices, offsets, tolerance=1e-6)
+    if closed:
+        try:
+            solid = Part.Solid(Part.Shell(shape.Faces))
+            if solid.Volume < 0:
+                solid.reverse()
+            return solid
+        except Exception as e:
+            write_log("Polyhedron", f"Not a valid solid: {e}")
+    return shape
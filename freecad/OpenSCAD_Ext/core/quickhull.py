@@ -0,0 +1,268 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Native convex hull ( quickhull ) over numpy vertex arrays              *
+#*                                                                          *
+#*   convex_hull()        3D hull → vertices + outward triangles            *
+#*   convex_hull_2d()     monotone chain for planar inputs                  *
+#*   hull_shape_from_points()  Part.Solid ( or Part.Face if planar )        *
+#*                             with coplanar triangles merged               *
+#****************************************************************************
+import numpy as np
+
+try:
+    import FreeCAD
+    import Part
+except ImportError:
+    # plain Python ( unit tests ), only the numpy functions are usable
+    FreeCAD = Part = None
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.mesh_io import triangle_offsets
+from freecad.OpenSCAD_Ext.core.facet_merge import (
+    merged_shape_from_mesh,
+    drop_collinear,
+)
+
+
+def _tolerance(pts):
+    scale = max(float(np.abs(pts).max()), float(np.ptp(pts, axis=0).max()), 1e-12)
+    return scale * 1e-9
+
+
+def _plane(pts, a, b, c):
+    n = np.cross(pts[b] - pts[a], pts[c] - pts[a])
+    length = np.linalg.norm(n)
+    if length == 0.0:
+        return None
+    n = n / length
+    return n, float(n @ pts[a])
+
+
+def _initial_simplex(pts, eps):
+    """ Four non coplanar point indices, or None if the input is flat """
+    i0 = int(np.argmin(pts[:, 0]))
+    i1 = int(np.argmax(np.linalg.norm(pts - pts[i0], axis=1)))
+    if np.linalg.norm(pts[i1] - pts[i0]) <= eps:
+        return None
+
+    line = (pts[i1] - pts[i0]) / np.linalg.norm(pts[i1] - pts[i0])
+    rel = pts - pts[i0]
+    off_line = np.linalg.norm(np.cross(rel, line), axis=1)
+    i2 = int(np.argmax(off_line))
+    if off_line[i2] <= eps:
+        return None
+
+    n, d = _plane(pts, i0, i1, i2)
+    dist = pts @ n - d
+    i3 = int(np.argmax(np.abs(dist)))
+    if abs(dist[i3]) <= eps:
+        return None
+    return i0, i1, i2, i3
+
+
+def convex_hull(points, eps=None):
+    """
+    Quickhull over (N, 3) points.
+    Returns (vertices (V, 3), triangles (T, 3)) with outward, counter
+    clockwise triangles, or None if the points are coplanar / degenerate.
+    """
+    pts = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    if len(pts) < 4:
+        return None
+    if eps is None:
+        eps = _tolerance(pts)
+
+    simplex = _initial_simplex(pts, eps)
+    if simplex is None:
+        return None
+
+    faces = {}       # fid → (a, b, c)
+    planes = {}      # fid → (normal, offset)
+    outside = {}     # fid → point indices above the face
+    edge_face = {}   # directed edge (a, b) → fid
+    next_fid = [0]
+
+    def add_face(a, b, c):
+        fid = next_fid[0]
+        next_fid[0] += 1
+        faces[fid] = (a, b, c)
+        planes[fid] = _plane(pts, a, b, c)
+        edge_face[(a, b)] = fid
+        edge_face[(b, c)] = fid
+        edge_face[(c, a)] = fid
+        return fid
+
+    def remove_face(fid):
+        a, b, c = faces.pop(fid)
+        planes.pop(fid)
+        outside.pop(fid, None)
+        for e in ((a, b), (b, c), (c, a)):
+            if edge_face.get(e) == fid:
+                del edge_face[e]
+
+    def assign(candidates, fids):
+        """ Give every candidate point to the face it is farthest above """
+        if len(candidates) == 0 or not fids:
+            return
+        normals = np.array([planes[f][0] for f in fids])
+        offsets = np.array([planes[f][1] for f in fids])
+        dist = pts[candidates] @ normals.T - offsets
+        best = np.argmax(dist, axis=1)
+        above = dist[np.arange(len(candidates)), best] > eps
+        for k, fid in enumerate(fids):
+            sel = candidates[above & (best == k)]
+            if len(sel):
+                outside[fid] = sel
+
+    # Tetrahedron, each face oriented away from the opposite vertex
+    tet = list(simplex)
+    new_fids = []
+    for opp in range(4):
+        a, b, c = [tet[k] for k in range(4) if k != opp]
+        n, d = _plane(pts, a, b, c)
+        if pts[tet[opp]] @ n - d > 0:
+            b, c = c, b
+        new_fids.append(add_face(a, b, c))
+    rest = np.setdiff1d(np.arange(len(pts)), tet)
+    assign(rest, new_fids)
+
+    while outside:
+        fid = next(iter(outside))
+        cand = outside[fid]
+        n, d = planes[fid]
+        apex = int(cand[np.argmax(pts[cand] @ n - d)])
+        p = pts[apex]
+
+        # Faces visible from apex ( connected to fid )
+        visible = {fid}
+        stack = [fid]
+        while stack:
+            f = stack.pop()
+            a, b, c = faces[f]
+            for u, v in ((a, b), (b, c), (c, a)):
+                g = edge_face.get((v, u))
+                if g is None or g in visible:
+                    continue
+                gn, gd = planes[g]
+                if p @ gn - gd > eps:
+                    visible.add(g)
+                    stack.append(g)
+
+        # Horizon : edges of visible faces whose neighbour is not visible
+        horizon = []
+        for f in visible:
+            a, b, c = faces[f]
+            for u, v in ((a, b), (b, c), (c, a)):
+                if edge_face.get((v, u)) not in visible:
+                    horizon.append((u, v))
+
+        orphans = [outside[f] for f in visible if f in outside]
+        for f in visible:
+            remove_face(f)
+
+        new_fids = []
+        for u, v in horizon:
+            if _plane(pts, u, v, apex) is None:
+                continue
+            new_fids.append(add_face(u, v, apex))
+
+        if orphans:
+            cand = np.concatenate(orphans)
+            cand = cand[cand != apex]
+            assign(cand, new_fids)
+
+    tris = np.array(list(faces.values()), dtype=np.int64)
+    used, remap = np.unique(tris, return_inverse=True)
+    return pts[used], remap.reshape(-1, 3).astype(np.int32)
+
+
+def convex_hull_2d(uv):
+    """ Andrew's monotone chain, returns counter clockwise indices into uv """
+    order = np.lexsort((uv[:, 1], uv[:, 0]))
+    pts = uv[order].tolist()
+
+    def half(seq):
+        chain = []
+        for k, q in seq:
+            while len(chain) >= 2:
+                (_, o), (_, a) = chain[-2], chain[-1]
+                if (a[0] - o[0]) * (q[1] - o[1]) - (a[1] - o[1]) * (q[0] - o[0]) > 0:
+                    break
+                chain.pop()
+            chain.append((k, q))
+        return chain
+
+    indexed = list(zip(order.tolist(), pts))
+    lower = half(indexed)
+    upper = half(indexed[::-1])
+    return [k for k, _ in lower[:-1] + upper[:-1]]
+
+
+def _planar_hull_face(pts):
+    """ Part.Face of the hull of coplanar points, None if collinear """
+    eps = _tolerance(pts)
+    i0 = 0
+    rel = pts - pts[i0]
+    i1 = int(np.argmax(np.linalg.norm(rel, axis=1)))
+    u = rel[i1]
+    if np.linalg.norm(u) <= eps:
+        return None
+    u = u / np.linalg.norm(u)
+    cross = np.cross(u, rel)
+    i2 = int(np.argmax(np.linalg.norm(cross, axis=1)))
+    if np.linalg.norm(cross[i2]) <= eps:
+        return None
+    n = cross[i2] / np.linalg.norm(cross[i2])
+
+    # 2D OpenSCAD geometry lives in XY, keep its face pointing +Z
+    if abs(n[2]) > 1.0 - 1e-12:
+        u, n = np.array([1.0, 0.0, 0.0]), np.array([0.0, 0.0, 1.0])
+    elif n[2] < 0:
+        n = -n
+    v = np.cross(n, u)
+
+    ring = convex_hull_2d(np.stack((rel @ u, rel @ v), axis=1))
+    loop = drop_collinear(pts[ring])
+    if len(loop) < 3:
+        return None
+    vecs = [FreeCAD.Vector(*p) for p in loop.tolist()]
+    return Part.Face(Part.makePolygon(vecs + vecs[:1]))
+
+
+def hull_mesh(points):
+    """
+    numpy only part of hull_shape_from_points, safe to run in a worker thread.
+    Returns (vertices, triangles), (points, None) if coplanar, None if degenerate.
+    """
+    pts = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    if len(pts) < 3:
+        return None
+    hull = convex_hull(pts)
+    if hull is None:
+        return pts, None
+    return hull
+
+
+def hull_shape_from_mesh(mesh):
+    """ Part shape of a hull_mesh() result """
+    if mesh is None:
+        return None
+
+    vertices, tris = mesh
+    if tris is None:
+        write_log("Hull", f"Native hull: {len(vertices)} coplanar points")
+        return _planar_hull_face(vertices)
+
+    write_log("Hull", f"Native hull: {len(vertices)} vertices → {len(tris)} triangles")
+    return merged_shape_from_mesh(
+        vertices, tris.reshape(-1), triangle_offsets(len(tris)),
+        max_ratio=float("inf"),
+    )
+
+
+def hull_shape_from_points(points):
+    """
+    Convex hull of (N, 3) points as a planar faced Part.Solid,
+    a Part.Face if the points are coplanar, None if degenerate / failed.
+    """
+    return hull_shape_from_mesh(hull_mesh(points))
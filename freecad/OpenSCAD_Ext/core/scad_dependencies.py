@@ -0,0 +1,150 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Dependency closure of a .scad file                                     *
+#*                                                                          *
+#*   include <...> / use <...> are followed recursively, import() /        *
+#*   surface() files are leaves. Names resolve as OpenSCAD does : first     *
+#*   relative to the including file, then along OPENSCADPATH.               *
+#*   Commented out includes are followed too, an extra dependency only      *
+#*   makes a cache key more specific.                                       *
+#****************************************************************************
+import hashlib
+import os
+import re
+import threading
+
+from freecad.OpenSCAD_Ext.libraries.ensure_openSCADPATH import ensure_openSCADPATH
+
+_INCLUDE_RE = re.compile(rb"\b(?:include|use)\s*<([^>]+)>")
+_IMPORT_RE = re.compile(rb"\b(?:import|surface)\s*\(\s*(?:file\s*=\s*)?\"([^\"]+)\"")
+_FILE_PARAM_RE = re.compile(r"(\b(?:import|surface)\s*\(\s*(?:file\s*=\s*)?\")([^\"]+)(\")")
+
+# path → ((mtime_ns, size), sha256, referenced names)
+_digests = {}
+_lock = threading.Lock()
+
+
+def library_dirs():
+    """ Directories of OPENSCADPATH, in search order """
+    ensure_openSCADPATH()
+    return [d for d in os.environ["OPENSCADPATH"].split(os.pathsep) if d]
+
+
+def resolve(name, base_dir):
+    """ Absolute path of an include / use / import name, None if not found """
+    name = os.path.expanduser(name.strip())
+    if os.path.isabs(name):
+        return os.path.normpath(name) if os.path.isfile(name) else None
+    for directory in [base_dir] + library_dirs():
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return os.path.normpath(os.path.abspath(path))
+    return None
+
+
+def _scan(path):
+    """ (sha256, includes, imports) of path, memoised on mtime / size """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        entry = _digests.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[1:]
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if path.lower().endswith(".scad"):
+        includes = [m.decode("utf8", "replace") for m in _INCLUDE_RE.findall(data)]
+        imports = [m.decode("utf8", "replace") for m in _IMPORT_RE.findall(data)]
+    else:
+        includes = imports = []
+    with _lock:
+        _digests[path] = (stamp, digest, includes, imports)
+    return digest, includes, imports
+
+
+def dependency_closure(path, missing=None):
+    """
+    [(path, sha256)] of path and everything it includes, uses or imports,
+    in discovery order. Names that do not resolve are listed as
+    ("missing:<name>", "") so creating them later changes the closure.
+    If missing is a list, (name, including directory) of each of them is
+    appended to it.
+    """
+    root = os.path.normpath(os.path.abspath(path))
+    closure = []
+    seen = set()
+    pending = [root]
+    while pending:
+        current = pending.pop(0)
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            digest, includes, imports = _scan(current)
+        except OSError:
+            closure.append((f"missing:{current}", ""))
+            if missing is not None:
+                missing.append((current, os.path.dirname(current)))
+            continue
+        closure.append((current, digest))
+        base_dir = os.path.dirname(current)
+        for name in includes + imports:
+            found = resolve(name, base_dir)
+            if found is None:
+                closure.append((f"missing:{name}", ""))
+                if missing is not None:
+                    missing.append((name, base_dir))
+            else:
+                pending.append(found)
+    return closure
+
+
+def candidate_dirs(name, base_dir):
+    """
+    Existing directories where creating name would make it resolve,
+    the nearest existing parent where a subdirectory is missing too
+    """
+    name = os.path.expanduser(name.strip())
+    if os.path.isabs(name):
+        paths = [name]
+    else:
+        paths = [os.path.join(d, name) for d in [base_dir] + library_dirs()]
+    dirs = []
+    for path in paths:
+        directory = os.path.dirname(os.path.normpath(os.path.abspath(path)))
+        while directory and not os.path.isdir(directory):
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        if os.path.isdir(directory) and directory not in dirs:
+            dirs.append(directory)
+    return dirs
+
+
+def absolute_files(scad_str, base_dir):
+    """
+    scad_str with relative import() / surface() files joined to base_dir,
+    for SCAD text that OpenSCAD runs from another directory.
+    OpenSCAD looks these up next to the file only, not along OPENSCADPATH.
+    """
+    def absolute(match):
+        name = match.group(2)
+        if os.path.isabs(name):
+            return match.group(0)
+        path = os.path.normpath(os.path.join(base_dir, name)).replace("\\", "/")
+        return match.group(1) + path + match.group(3)
+
+    return _FILE_PARAM_RE.sub(absolute, scad_str)
+
+
+def dependency_hash(path):
+    """ sha256 over the dependency closure of path, content based """
+    h = hashlib.sha256()
+    for dep, digest in dependency_closure(path):
+        h.update(dep.encode("utf8"))
+        h.update(b"\0")
+        h.update(digest.encode("ascii"))
+        h.update(b"\0")
+    return h.hexdigest()
@@ -0,0 +1,136 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Per session scratch space for OpenSCAD input / output files            *
+#*                                                                          *
+#*   - one directory per FreeCAD session, in /dev/shm when available so     *
+#*     .scad / .stl / .csg round trips never touch the disk                 *
+#*   - unique paths per job, concurrent renders can not collide             *
+#*   - size accounting : once the RAM directory holds more than             *
+#*     scratchMaxMB new files go to a directory in the normal temp dir      *
+#*   - everything is removed at exit, directories left by sessions that     *
+#*     did not exit cleanly are removed by the next one                     *
+#****************************************************************************
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+
+import FreeCAD
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+
+PARAM_PATH = "User parameter:BaseApp/Preferences/Mod/OpenSCAD"
+PREFIX = "fc-openscad-"
+RAM_DIR = "/dev/shm"
+
+_dirs = {}      # "ram" / "disk" → session directory
+_lock = threading.Lock()
+
+
+def _ram_available():
+    if not FreeCAD.ParamGet(PARAM_PATH).GetBool("scratchInRam", True):
+        return False
+    return os.path.isdir(RAM_DIR) and os.access(RAM_DIR, os.W_OK | os.X_OK)
+
+
+def _remove_stale(base):
+    """ Session directories whose FreeCAD process is gone """
+    if os.name != "posix":
+        return
+    try:
+        entries = os.listdir(base)
+    except OSError:
+        return
+    for name in entries:
+        if not name.startswith(PREFIX):
+            continue
+        try:
+            pid = int(name[len(PREFIX):].split("-", 1)[0])
+            os.kill(pid, 0)
+        except ValueError:
+            continue
+        except ProcessLookupError:
+            shutil.rmtree(os.path.join(base, name), ignore_errors=True)
+        except OSError:
+            # exists, owned by someone else
+            pass
+
+
+def _session_dir(kind):
+    with _lock:
+        path = _dirs.get(kind)
+        if path is not None and os.path.isdir(path):
+            return path
+        base = RAM_DIR if kind == "ram" else tempfile.gettempdir()
+        if not _dirs:
+            atexit.register(cleanup)
+        _remove_stale(base)
+        path = tempfile.mkdtemp(prefix=f"{PREFIX}{os.getpid()}-", dir=base)
+        _dirs[kind] = path
+        write_log("Scratch", f"Session scratch directory {path}")
+        return path
+
+
+def scratch_usage(kind="ram"):
+    """ (files, bytes) currently held in the session directory """
+    path = _dirs.get(kind)
+    files = size = 0
+    if path is None:
+        return files, size
+    for root, _dirs_, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+                files += 1
+            except OSError:
+                pass
+    return files, size
+
+
+def scratch_dir():
+    """ Session directory new files should go to """
+    if _ram_available():
+        limit = FreeCAD.ParamGet(PARAM_PATH).GetInt("scratchMaxMB", 512) * 1024 * 1024
+        if scratch_usage("ram")[1] < limit:
+            return _session_dir("ram")
+        write_log("Scratch", "RAM scratch space full, using temp dir")
+    return _session_dir("disk")
+
+
+def scratch_path(suffix="", prefix="job-"):
+    """ New empty file with a unique name, remove it with release() """
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix=prefix, dir=scratch_dir())
+    os.close(fd)
+    return path
+
+
+def scratch_job_dir(prefix="job-"):
+    """
+    Private directory for jobs whose files refer to each other by
+    relative name ( e.g. import("part.stl") ), remove it with release()
+    """
+    return tempfile.mkdtemp(prefix=prefix, dir=scratch_dir())
+
+
+def release(*paths):
+    """ Remove scratch files / job directories, missing ones are ignored """
+    for path in paths:
+        if not path:
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+            continue
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def cleanup():
+    """ Remove the session directories and everything in them """
+    with _lock:
+        dirs = list(_dirs.values())
+        _dirs.clear()
+    for path in dirs:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,88 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for core/brep_cache.py                                           *
+#****************************************************************************
+import os
+
+import pytest
+
+from freecad.OpenSCAD_Ext.core import brep_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(brep_cache, "cache_root", lambda: str(tmp_path))
+    return brep_cache.BrepCache("test", max_bytes=1000)
+
+
+def _entry(cache, key, size, mtime):
+    path = cache.path(key)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_canonical_scad():
+    a = "hull() {\n    cube(1);\n\n    sphere(2);   \n}\n"
+    b = "hull() {\ncube(1);\n  sphere(2);\n}"
+    assert brep_cache.canonical_scad(a) == brep_cache.canonical_scad(b)
+    assert brep_cache.canonical_scad(a) != brep_cache.canonical_scad(b.replace("2", "3"))
+
+
+def test_key(cache):
+    key = cache.key("cube(1);", "2021.01", 0.1)
+    assert key == cache.key("cube(1);", "2021.01", 0.1)
+    assert key != cache.key("cube(1);", "2021.01", 0.2)
+    # parts are separated, moving text between them changes the key
+    assert cache.key("ab", "c") != cache.key("a", "bc")
+    assert cache.path(key).endswith(key + ".brep")
+
+
+def test_miss(cache):
+    assert cache.get(cache.key("missing")) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_evict_least_recently_used(cache):
+    old = _entry(cache, "old", 400, 1000)
+    mid = _entry(cache, "mid", 400, 2000)
+    new = _entry(cache, "new", 400, 3000)
+
+    cache.evict()
+    assert not os.path.exists(old)
+    assert os.path.exists(mid) and os.path.exists(new)
+
+
+def test_evict_ignores_other_files(cache):
+    other = os.path.join(cache.directory, "notes.txt")
+    with open(other, "wb") as f:
+        f.write(b"x" * 5000)
+    kept = _entry(cache, "kept", 400, 1000)
+
+    cache.evict()
+    assert os.path.exists(other) and os.path.exists(kept)
+
+
+def test_clear(cache):
+    _entry(cache, "a", 10, 1000)
+    cache.clear()
+    assert not any(name.endswith(".brep") for name in os.listdir(cache.directory))
+
+
+def test_put_get_roundtrip(cache):
+    Part = pytest.importorskip("Part")
+    key = cache.key("cube([1, 2, 3]);")
+    cache.put(key, Part.makeBox(1, 2, 3))
+    assert cache.contains(key)
+
+    shape = cache.get(key)
+    assert shape.Volume == pytest.approx(6.0)
+    assert cache.hits == 1
+
+
+def test_unreadable_entry_is_discarded(cache):
+    pytest.importorskip("Part")
+    path = _entry(cache, "broken", 10, 1000)
+    assert cache.get("broken") is None
+    assert not os.path.exists(path)
@@ -0,0 +1,94 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for core/facet_merge.py                                          *
+#****************************************************************************
+import numpy as np
+import pytest
+
+from freecad.OpenSCAD_Ext.core import facet_merge
+from freecad.OpenSCAD_Ext.core.mesh_io import triangle_offsets, weld_vertices
+
+
+def grid_cube(n=5):
+    """
+    Cube [0, n]^3, every side split into n x n unit squares of two
+    triangles, as an STL export of it would be. Returns welded
+    (vertices, indices, offsets), outward counter clockwise.
+    """
+    corners = []
+    for axis in range(3):
+        b, c = (axis + 1) % 3, (axis + 2) % 3
+        for side in (0, n):
+            for u in range(n):
+                for v in range(n):
+                    quad = []
+                    for du, dv in ((0, 0), (1, 0), (1, 1), (0, 1)):
+                        p = [0.0, 0.0, 0.0]
+                        p[axis], p[b], p[c] = side, u + du, v + dv
+                        quad.append(p)
+                    if side == 0:
+                        quad.reverse()
+                    corners += [quad[0], quad[1], quad[2], quad[0], quad[2], quad[3]]
+    vertices, inverse = weld_vertices(np.array(corners, dtype=np.float64))
+    return vertices, inverse, triangle_offsets(len(inverse) // 3)
+
+
+def test_facet_normals_unit_and_area():
+    vertices = np.array([[0, 0, 0], [2, 0, 0], [2, 3, 0], [0, 3, 0]], dtype=np.float64)
+    normals, areas = facet_merge.facet_normals(
+        vertices, np.array([0, 1, 2, 3]), np.array([0, 4]))
+    assert np.allclose(normals, [[0, 0, 1]])
+    assert np.allclose(areas, [6.0])
+
+
+def test_grid_cube_merges_to_six_faces():
+    vertices, indices, offsets = grid_cube(5)
+    assert len(offsets) - 1 == 6 * 25 * 2
+
+    faces = facet_merge.merged_faces(vertices, indices, offsets)
+    assert len(faces) == 6
+    normals = sorted(tuple(np.round(normal).astype(int)) for normal, _loops in faces)
+    assert normals == sorted([
+        (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)
+    ])
+    for normal, loops in faces:
+        # one outer loop through the 20 boundary grid points of the side
+        assert len(loops) == 1
+        assert len(loops[0]) == 20
+        assert len(facet_merge.drop_collinear(vertices[loops[0]])) == 4
+
+
+def test_plane_components_keeps_bent_faces_apart():
+    # two triangles folded along the shared edge 0-2
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 1]], dtype=np.float64)
+    labels, _normals = facet_merge.plane_components(
+        vertices, np.array([0, 1, 2, 0, 2, 3]), triangle_offsets(2))
+    assert labels[0] != labels[1]
+
+
+def test_drop_collinear():
+    square = np.array([
+        [0, 0, 0], [1, 0, 0], [2, 0, 0], [2, 1, 0], [2, 2, 0], [0, 2, 0],
+    ], dtype=np.float64)
+    assert facet_merge.drop_collinear(square).tolist() == [
+        [0, 0, 0], [2, 0, 0], [2, 2, 0], [0, 2, 0]
+    ]
+    triangle = square[[0, 2, 4]]
+    assert facet_merge.drop_collinear(triangle) is triangle
+
+
+def test_merged_shape_grid_cube():
+    pytest.importorskip("Part")
+    vertices, indices, offsets = grid_cube(5)
+    solid = facet_merge.merged_shape_from_mesh(vertices, indices, offsets)
+    assert solid is not None
+    assert len(solid.Faces) == 6
+    assert solid.Volume == pytest.approx(125.0)
+
+
+def test_merged_shape_declines_when_nothing_merges():
+    # tetrahedron : every facet is its own face, ratio 1 > 0.5
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+    indices = np.array([0, 2, 1, 0, 1, 3, 0, 3, 2, 1, 2, 3])
+    assert facet_merge.merged_shape_from_mesh(
+        vertices, indices, triangle_offsets(4)) is None
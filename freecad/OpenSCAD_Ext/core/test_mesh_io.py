@@ -0,0 +1,122 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for core/mesh_io.py                                              *
+#****************************************************************************
+import numpy as np
+import pytest
+
+from freecad.OpenSCAD_Ext.core import mesh_io
+
+
+# Unit tetrahedron, outward counter clockwise triangles
+TETRA_POINTS = np.array([
+    [0.0, 0.0, 0.0],
+    [1.0, 0.0, 0.0],
+    [0.0, 1.0, 0.0],
+    [0.0, 0.0, 1.0],
+])
+TETRA_TRIS = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+
+
+def test_triangle_offsets():
+    assert mesh_io.triangle_offsets(3).tolist() == [0, 3, 6, 9]
+
+
+def test_binary_stl_roundtrip_welds_vertices(tmp_path):
+    path = str(tmp_path / "tetra.stl")
+    mesh_io.write_stl_triangles(path, TETRA_POINTS[TETRA_TRIS])
+
+    vertices, indices, offsets = mesh_io.read_stl(path)
+    assert vertices.shape == (4, 3)
+    assert len(offsets) == 5
+    assert np.allclose(vertices[indices].reshape(-1, 3, 3), TETRA_POINTS[TETRA_TRIS])
+    assert mesh_io.is_closed(indices, offsets)
+
+
+def test_ascii_stl(tmp_path):
+    path = tmp_path / "tetra.stl"
+    lines = ["solid t"]
+    for tri in TETRA_POINTS[TETRA_TRIS]:
+        lines += ["facet normal 0 0 0", "outer loop"]
+        lines += ["vertex %g %g %g" % tuple(p) for p in tri]
+        lines += ["endloop", "endfacet"]
+    lines.append("endsolid t")
+    path.write_text("\n".join(lines))
+
+    vertices, indices, offsets = mesh_io.read_stl(str(path))
+    assert vertices.shape == (4, 3)
+    assert len(indices) == 12
+
+
+def test_read_stl_drops_collapsed_triangles(tmp_path):
+    path = str(tmp_path / "sliver.stl")
+    tris = TETRA_POINTS[TETRA_TRIS].tolist()
+    tris.append([[0, 0, 0], [1e-9, 0, 0], [0, 1, 0]])
+    mesh_io.write_stl_triangles(path, tris)
+
+    _vertices, _indices, offsets = mesh_io.read_stl(path, tolerance=1e-6)
+    assert len(offsets) - 1 == 4
+
+
+def test_read_off_polygons(tmp_path):
+    path = tmp_path / "pyramid.off"
+    path.write_text(
+        "OFF\n"
+        "# square base, apex on top\n"
+        "5 5 0\n"
+        "0 0 0\n1 0 0\n1 1 0\n0 1 0\n0.5 0.5 1\n"
+        "4 0 3 2 1\n"
+        "3 0 1 4\n3 1 2 4\n3 2 3 4\n3 3 0 4\n"
+    )
+    vertices, indices, offsets = mesh_io.read_off(str(path))
+    assert vertices.shape == (5, 3)
+    assert np.diff(offsets).tolist() == [4, 3, 3, 3, 3]
+    assert indices[:4].tolist() == [0, 3, 2, 1]
+    assert mesh_io.is_closed(indices, offsets)
+
+
+@pytest.mark.parametrize("text", [
+    # counts on the header line, colour columns on vertices and faces
+    "COFF 4 4 0\n"
+    "0 0 0 255 0 0 255\n1 0 0 255 0 0 255\n0 1 0 0 0 255 255\n0 0 1 0 0 255 255\n"
+    "3 0 2 1 255 0 0\n3 0 1 3 0.5 0.5 0.5 1\n3 0 3 2\n3 1 2 3\n",
+    # normals on some vertices only
+    "NOFF\n4 4 0\n"
+    "0 0 0 0 0 -1\n1 0 0\n0 1 0 0 1 0\n0 0 1\n"
+    "3 0 2 1\n3 0 1 3\n3 0 3 2\n3 1 2 3\n",
+])
+def test_read_off_extra_columns(tmp_path, text):
+    path = tmp_path / "tetra.off"
+    path.write_text(text)
+    vertices, indices, offsets = mesh_io.read_off(str(path))
+    assert np.array_equal(vertices, TETRA_POINTS)
+    assert indices.reshape(-1, 3).tolist() == TETRA_TRIS.tolist()
+    assert offsets.tolist() == [0, 3, 6, 9, 12]
+
+
+def test_read_off_rejects_other_files(tmp_path):
+    path = tmp_path / "not.off"
+    path.write_text("solid t\nendsolid t\n")
+    with pytest.raises(ValueError):
+        mesh_io.read_off(str(path))
+
+
+def test_face_edges_wrap_around():
+    indices = np.array([0, 1, 2, 3, 4, 5, 6])
+    offsets = np.array([0, 3, 7])
+    edges = mesh_io.face_edges(indices, offsets)
+    assert edges.tolist() == [[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 6], [6, 3]]
+
+
+def test_is_closed():
+    indices = TETRA_TRIS.reshape(-1)
+    assert mesh_io.is_closed(indices, mesh_io.triangle_offsets(4))
+    assert not mesh_io.is_closed(indices[:9], mesh_io.triangle_offsets(3))
+    assert not mesh_io.is_closed(np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int32))
+
+
+def test_mesh_to_shape():
+    pytest.importorskip("Part")
+    shape = mesh_io.mesh_to_shape(
+        TETRA_POINTS, TETRA_TRIS.reshape(-1), mesh_io.triangle_offsets(4))
+    assert len(shape.Faces) == 4
@@ -0,0 +1,91 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for core/polyhedron_mesh.py                                      *
+#****************************************************************************
+import numpy as np
+import pytest
+
+from freecad.OpenSCAD_Ext.core import polyhedron_mesh
+from freecad.OpenSCAD_Ext.core.mesh_io import is_closed
+
+# Unit cube as OpenSCAD writes it : faces clockwise seen from outside
+CUBE_POINTS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=np.float64)
+CUBE_FACES = [
+    [0, 1, 2, 3],
+    [4, 5, 1, 0],
+    [7, 6, 5, 4],
+    [5, 6, 2, 1],
+    [6, 7, 3, 2],
+    [7, 4, 0, 3],
+]
+
+
+def flat(faces):
+    indices = np.array([i for face in faces for i in face], dtype=np.int32)
+    offsets = polyhedron_mesh._offsets([len(face) for face in faces])
+    return indices, offsets
+
+
+def test_reverse_faces():
+    indices, offsets = flat([[0, 1, 2], [3, 4, 5, 6]])
+    assert polyhedron_mesh.reverse_faces(indices, offsets).tolist() == [2, 1, 0, 6, 5, 4, 3]
+    mask = np.array([False, True])
+    assert polyhedron_mesh.reverse_faces(indices, offsets, mask).tolist() == [0, 1, 2, 6, 5, 4, 3]
+
+
+def test_clean_faces():
+    # duplicate of point 1, a repeated vertex, a two vertex and a zero area face
+    points = np.concatenate((CUBE_POINTS, [[1, 0, 0]]))
+    indices, offsets = flat(CUBE_FACES + [[0, 8, 8, 5, 4], [0, 1], [0, 1, 8]])
+    points, indices, offsets = polyhedron_mesh.clean_faces(points, indices, offsets)
+
+    assert len(points) == 8
+    assert len(offsets) - 1 == 7
+    assert np.diff(offsets)[-1] == 4
+    assert indices.max() < 8
+
+
+def test_triangulate_nonplanar():
+    points = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0.5], [0, 1, 0], [2, 0, 0], [2, 1, 0]],
+                      dtype=np.float64)
+    indices, offsets = flat([[0, 1, 2, 3], [1, 4, 5, 2]])
+    new_indices, new_offsets = polyhedron_mesh.triangulate_nonplanar(points, indices, offsets)
+    assert np.diff(new_offsets).tolist() == [3, 3, 3, 3]
+
+    planar = points.copy()
+    planar[2, 2] = 0.0
+    same = polyhedron_mesh.triangulate_nonplanar(planar, indices, offsets)
+    assert same[0] is indices and same[1] is offsets
+
+
+def test_orient_consistently():
+    indices, offsets = flat(CUBE_FACES)
+    flipped = polyhedron_mesh.reverse_faces(indices, offsets, np.array([0, 1, 0, 0, 1, 0], bool))
+    assert not polyhedron_mesh._consistent(flipped, offsets)
+
+    fixed = polyhedron_mesh.orient_consistently(flipped, offsets)
+    assert polyhedron_mesh._consistent(fixed, offsets)
+    assert is_closed(fixed, offsets)
+
+
+def test_signed_volume():
+    indices, offsets = flat(CUBE_FACES)
+    assert polyhedron_mesh.signed_volume(CUBE_POINTS, indices, offsets) == pytest.approx(-1.0)
+    outward = polyhedron_mesh.reverse_faces(indices, offsets)
+    assert polyhedron_mesh.signed_volume(CUBE_POINTS, outward, offsets) == pytest.approx(1.0)
+
+
+def test_polyhedron_shape():
+    pytest.importorskip("Part")
+    indices, offsets = flat(CUBE_FACES)
+    solid = polyhedron_mesh.polyhedron_shape(CUBE_POINTS, indices, offsets)
+    assert solid.ShapeType == "Solid"
+    assert solid.Volume == pytest.approx(1.0)
+    assert len(solid.Faces) == 6
+
+
+def test_polyhedron_shape_empty():
+    assert polyhedron_mesh.polyhedron_shape(np.zeros((0, 3)), [], [0]) is None
@@ -0,0 +1,95 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for core/quickhull.py                                            *
+#****************************************************************************
+import numpy as np
+import pytest
+
+from freecad.OpenSCAD_Ext.core import quickhull
+from freecad.OpenSCAD_Ext.core.mesh_io import is_closed, triangle_offsets
+
+CUBE_CORNERS = np.array(
+    [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64
+)
+
+
+def _check_hull(points, vertices, tris):
+    """ Closed, outward and containing every input point """
+    assert is_closed(tris.reshape(-1), triangle_offsets(len(tris)))
+    a, b, c = vertices[tris[:, 0]], vertices[tris[:, 1]], vertices[tris[:, 2]]
+    normals = np.cross(b - a, c - a)
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    dist = points @ normals.T - np.einsum("ij,ij->i", normals, a)
+    assert dist.max() <= 1e-9
+    # outward : the centroid is below every face
+    centre = vertices.mean(axis=0)
+    assert np.all(centre @ normals.T - np.einsum("ij,ij->i", normals, a) < 0)
+
+
+def test_cube_with_interior_points():
+    rng = np.random.default_rng(1)
+    points = np.concatenate((CUBE_CORNERS, rng.random((200, 3))))
+    vertices, tris = quickhull.convex_hull(points)
+
+    assert sorted(map(tuple, vertices.tolist())) == sorted(map(tuple, CUBE_CORNERS.tolist()))
+    assert len(tris) == 12
+    _check_hull(points, vertices, tris)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_cloud_contained(seed):
+    rng = np.random.default_rng(seed)
+    points = rng.normal(size=(500, 3))
+    vertices, tris = quickhull.convex_hull(points)
+    _check_hull(points, vertices, tris)
+    # Euler : V - E + F = 2 for a triangulated sphere
+    assert len(vertices) - 3 * len(tris) // 2 + len(tris) == 2
+
+
+def test_sphere_points_all_on_hull():
+    phi = np.linspace(0, np.pi, 9)[1:-1]
+    theta = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+    points = np.array([
+        [np.sin(p) * np.cos(t), np.sin(p) * np.sin(t), np.cos(p)]
+        for p in phi for t in theta
+    ] + [[0, 0, 1], [0, 0, -1]])
+    vertices, tris = quickhull.convex_hull(points)
+    assert len(vertices) == len(points)
+    _check_hull(points, vertices, tris)
+
+
+def test_degenerate_input():
+    assert quickhull.convex_hull(CUBE_CORNERS[:3]) is None
+    square = CUBE_CORNERS[CUBE_CORNERS[:, 2] == 0]
+    assert quickhull.convex_hull(square) is None
+    assert quickhull.convex_hull([[0, 0, 0], [1, 1, 1], [2, 2, 2], [3, 3, 3]]) is None
+
+
+def test_convex_hull_2d():
+    uv = np.array([[0, 0], [2, 0], [1, 1], [2, 2], [0, 2], [1, 0]], dtype=np.float64)
+    ring = quickhull.convex_hull_2d(uv)
+    assert sorted(ring) == [0, 1, 3, 4]
+    # counter clockwise
+    pts = uv[ring]
+    area = 0.5 * np.sum(pts[:, 0] * np.roll(pts[:, 1], -1) - np.roll(pts[:, 0], -1) * pts[:, 1])
+    assert area == pytest.approx(4.0)
+
+
+def test_hull_mesh_coplanar():
+    square = CUBE_CORNERS[CUBE_CORNERS[:, 2] == 0]
+    vertices, tris = quickhull.hull_mesh(square)
+    assert tris is None
+    assert len(vertices) == 4
+    assert quickhull.hull_mesh(square[:2]) is None
+
+
+def test_hull_shape_from_points():
+    pytest.importorskip("Part")
+    rng = np.random.default_rng(2)
+    points = np.concatenate((CUBE_CORNERS * 2, rng.random((50, 3))))
+    solid = quickhull.hull_shape_from_points(points)
+    assert solid.Volume == pytest.approx(8.0)
+    assert len(solid.Faces) == 6
+
+    face = quickhull.hull_shape_from_points(CUBE_CORNERS[CUBE_CORNERS[:, 2] == 0])
+    assert face.Area == pytest.approx(1.0)
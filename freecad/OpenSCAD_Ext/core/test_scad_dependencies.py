@@ -0,0 +1,112 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for core/scad_dependencies.py                                    *
+#****************************************************************************
+import os
+
+import pytest
+
+from freecad.OpenSCAD_Ext.core import scad_dependencies
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """ main.scad → include lib/a.scad, use <b.scad> from OPENSCADPATH """
+    project = tmp_path / "project"
+    library = tmp_path / "library"
+    (project / "lib").mkdir(parents=True)
+    library.mkdir()
+    monkeypatch.setattr(scad_dependencies, "library_dirs", lambda: [str(library)])
+
+    (project / "main.scad").write_text(
+        "include <lib/a.scad>\n"
+        "use <b.scad>\n"
+        "// include <commented.scad>\n"
+        "cube(1);\n"
+    )
+    (project / "lib" / "a.scad").write_text('import("part.stl");\n')
+    (project / "lib" / "part.stl").write_bytes(b"solid t\nendsolid t\n")
+    (library / "b.scad").write_text("module b() {}\n")
+    return project, library
+
+
+def _paths(closure):
+    return [path for path, _digest in closure]
+
+
+def test_closure(tree):
+    project, library = tree
+    closure = scad_dependencies.dependency_closure(str(project / "main.scad"))
+    paths = _paths(closure)
+
+    assert paths[0] == str(project / "main.scad")
+    assert str(project / "lib" / "a.scad") in paths
+    assert str(project / "lib" / "part.stl") in paths
+    assert str(library / "b.scad") in paths
+    assert "missing:commented.scad" in paths
+    assert all(digest or path.startswith("missing:") for path, digest in closure)
+
+
+def test_resolve_prefers_including_directory(tree):
+    project, library = tree
+    (project / "b.scad").write_text("")
+    assert scad_dependencies.resolve("b.scad", str(project)) == str(project / "b.scad")
+    assert scad_dependencies.resolve("b.scad", str(project / "lib")) == str(library / "b.scad")
+    assert scad_dependencies.resolve("nothing.scad", str(project)) is None
+
+
+def test_cycles_terminate(tmp_path, monkeypatch):
+    monkeypatch.setattr(scad_dependencies, "library_dirs", lambda: [])
+    (tmp_path / "a.scad").write_text("include <b.scad>\n")
+    (tmp_path / "b.scad").write_text("include <a.scad>\n")
+    closure = scad_dependencies.dependency_closure(str(tmp_path / "a.scad"))
+    assert len(closure) == 2
+
+
+def test_hash_follows_content(tree):
+    project, library = tree
+    main = str(project / "main.scad")
+    before = scad_dependencies.dependency_hash(main)
+    assert scad_dependencies.dependency_hash(main) == before
+
+    b = library / "b.scad"
+    b.write_text("module b() { cube(2); }\n")
+    # mtime granularity : make sure the memoised scan sees the edit
+    st = os.stat(b)
+    os.utime(b, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert scad_dependencies.dependency_hash(main) != before
+
+
+def test_hash_changes_when_missing_file_appears(tree):
+    project, _library = tree
+    main = str(project / "main.scad")
+    before = scad_dependencies.dependency_hash(main)
+    (project / "commented.scad").write_text("")
+    assert scad_dependencies.dependency_hash(main) != before
+
+
+def test_missing_and_candidate_dirs(tree):
+    project, library = tree
+    (project / "main.scad").write_text("include <sub/c.scad>\n")
+    missing = []
+    scad_dependencies.dependency_closure(str(project / "main.scad"), missing)
+    assert missing == [("sub/c.scad", str(project))]
+
+    # sub/ exists nowhere yet, watch the directories it would be created in
+    assert scad_dependencies.candidate_dirs("sub/c.scad", str(project)) == [
+        str(project), str(library)
+    ]
+    (project / "sub").mkdir()
+    assert scad_dependencies.candidate_dirs("sub/c.scad", str(project))[0] == str(project / "sub")
+
+
+def test_absolute_files(tmp_path):
+    base = str(tmp_path)
+    scad = ('import(file = "parts/a.stl", layer = "");\n'
+            'surface(file = "/abs/h.dat");\n'
+            'text(text = "parts/a.stl");\n')
+    fixed = scad_dependencies.absolute_files(scad, base)
+    expected = os.path.join(base, "parts", "a.stl").replace("\\", "/")
+    assert f'import(file = "{expected}", layer = "")' in fixed
+    assert 'surface(file = "/abs/h.dat")' in fixed
+    assert 'text(text = "parts/a.stl")' in fixed
@@ -30,7 +30,6 @@ __title__="FreeCAD OpenSCAD Workbench - AST / CSG importer"
 __author__ = "Keith Sloan <keith@sloan-home.co.uk>"
 __url__ = ["http://www.sloan-home.co.uk/ImportCSG"]
 
-import FreeCADGui
 from pathlib import Path
 
 from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
@@ -203,7 +202,9 @@ def processCSG(docSrc, filename, fnmax_param = None):
     raw_ast_nodes = parse_csg_file_to_AST_nodes(filename)
     ast_nodes = raw_ast_nodes
     #ast_nodes = normalize_ast(raw_ast_nodes)
-    shapePlaceList = process_AST(ast_nodes, mode="multiple")
+    shapePlaceList = process_AST(ast_nodes, mode="multiple",
+                                 base_dir=os.path.dirname(os.path.abspath(filename)),
+                                 fnmax=fnmax)
     write_log("AST",f"shapePlaceList {shapePlaceList}")
     for sp in shapePlaceList:
         write_log("Import",f"{sp}")
@@ -211,9 +212,33 @@ def processCSG(docSrc, filename, fnmax_param = None):
         obj.recompute()
 
     #add_shapes_to_document(doc, name, shapes)
-    FreeCADGui.SendMsgToActiveView("ViewFit")
+    if gui:
+        FreeCADGui.SendMsgToActiveView("ViewFit")
     if printverbose:
         print ('ImportCSG Version 0.6a')
     FreeCAD.Console.PrintMessage('End processing CSG file\n')
     doc.recompute()
 
+
+def csg_to_shapes(filename, base_dir=None, failures=None, fnmax=None):
+    """
+    Headless import : build the final geometry only, no document
+    objects are created ( works without the GUI ).
+
+    base_dir : directory relative import() files resolve against,
+               default the one of filename
+    failures, fnmax : see process_AST
+
+    Returns:
+        List of (name, Part.Compound), one per top level CSG node
+    """
+    write_log("Info",f"Headless AST / CSG import {filename}")
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(filename))
+    ast_nodes = parse_csg_file_to_AST_nodes(filename)
+    return [
+        (name, shape)
+        for name, shape, _placement in process_AST(
+            ast_nodes, mode="compound", base_dir=base_dir,
+            failures=failures, fnmax=fnmax)
+    ]
@@ -33,6 +33,7 @@ __url__ = ["http://www.sloan-home.co.uk/ImportCSG"]
 # For SCAD files first process via OpenSCAD to creae CSG file then import
 #
 import FreeCAD, Part, Draft, io, os, sys, xml.sax
+import numpy as np
 if FreeCAD.GuiUp:
     import FreeCADGui
     gui = True
@@ -54,6 +55,8 @@ from freecad.OpenSCAD_Ext.core.checkObjectShapes import *
 from freecad.OpenSCAD_Ext.core.OpenSCADUtils import *
 from freecad.OpenSCAD_Ext.core.OpenSCADHull import *
 from freecad.OpenSCAD_Ext.core.OpenSCADMinkowski import *
+from freecad.OpenSCAD_Ext.core.polyhedron_mesh import polyhedron_shape
+from freecad.OpenSCAD_Ext.core.brep_cache import cache_root
 
 # In theory FC 1.1+ should use ths for display import prompt
 DisplayName = "OpenSCAD Ext – CSG Importer"
@@ -145,6 +148,168 @@ def insert(filename,docname):
         pathName = os.path.dirname(os.path.normpath(filename))
         processCSG(doc, filename)
 
+# Lexer and LALR parser are built once per session, tables are kept in
+# the user cache directory under a name keyed on the grammar
+_lexer = None
+_parser = None
+
+def grammar_hash():
+    "hash of the token list and every grammar rule of this module"
+    import hashlib
+    module = sys.modules[__name__]
+    h = hashlib.sha1(repr(tokens).encode('utf-8'))
+    for name in sorted(dir(module)):
+        if name.startswith('p_') and callable(getattr(module, name)):
+            h.update(name.encode('utf-8'))
+            h.update((getattr(module, name).__doc__ or '').encode('utf-8'))
+    return h.hexdigest()[:16]
+
+def load_tables(path, name):
+    "cached parsetab module, None if missing or unreadable"
+    if not os.path.isfile(path):
+        return None
+    import importlib.util
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        tables = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(tables)
+        return tables
+    except Exception as e:
+        write_log("INFO",f"Ignoring parser tables {path}: {e}")
+        return None
+
+def getParser():
+    "session wide (lexer, parser)"
+    global _lexer, _parser
+    if _parser is not None:
+        return _lexer, _parser
+
+    if printverbose: write_log("INFO","Start Lex")
+    _lexer = lex.lex(module=tokrules)
+    if printverbose: write_log("INFO","End Lex")
+
+    if printverbose: write_log("INFO","Load Parser")
+    outputdir = os.path.join(cache_root(), 'ply')
+    name = 'parsetab_altcsg_' + grammar_hash()
+    tables = load_tables(os.path.join(outputdir, name + '.py'), name)
+    module = sys.modules[__name__]
+    # No debug out otherwise Linux has protection exception
+    if tables is not None:
+        _parser = yacc.yacc(module=module, debug=False, tabmodule=tables,
+                            write_tables=False)
+    else:
+        try:
+            os.makedirs(outputdir, exist_ok=True)
+            _parser = yacc.yacc(module=module, debug=False, tabmodule=name,
+                                outputdir=outputdir, write_tables=True)
+        except OSError:
+            _parser = yacc.yacc(module=module, debug=False, write_tables=False)
+    if printverbose: write_log("INFO","Parser Loaded")
+    return _lexer, _parser
+
+def processCSGHeadless(filename, fnmax_param = None, materialize_doc = None):
+    """
+    Batch / headless import : the final shapes only, one per top level
+    node. They are built directly by the AST pipeline
+    ( importASTCSG.csg_to_shapes ), no document objects are created.
+    Only if OpenSCAD fails on a node without a native AST builder are
+    they rebuilt by processCSG, in a hidden temporary document.
+
+    materialize_doc : if given, the parametric object tree is built in
+    that document afterwards, a separate processCSG run.
+
+    Returns list of Part.Shape
+    """
+    from freecad.OpenSCAD_Ext.importers.importASTCSG import csg_to_shapes
+
+    baseDir = os.path.dirname(os.path.abspath(filename))
+    tmpfile = None
+    if filename.lower().endswith('.scad'):
+        tmpfile = callopenscad(filename)
+        filename = tmpfile
+    try:
+        failures = []
+        shapes = [shape for _name, shape in \
+            csg_to_shapes(filename, baseDir, failures, fnmax_param) \
+            if shape is not None and not shape.isNull()]
+        if failures:
+            write_log("WARN",f"Headless import: {', '.join(failures)} not converted, using a document")
+            shapes = shapesFromDocument(filename, fnmax_param)
+        if materialize_doc is not None:
+            processCSG(materialize_doc, filename, fnmax_param)
+    finally:
+        if tmpfile is not None:
+            try:
+                os.unlink(tmpfile)
+            except OSError:
+                pass
+    return shapes
+
+def shapesFromDocument(filename, fnmax_param = None):
+    "shapes of the top level objects of processCSG in a hidden temporary document"
+    actDoc = FreeCAD.ActiveDocument
+    try:
+        wrkDoc = FreeCAD.newDocument("headless", hidden=True, temp=True)
+    except TypeError:
+        # FreeCAD without hidden / temporary documents
+        wrkDoc = FreeCAD.newDocument("headless")
+    try:
+        topLevel = processCSG(wrkDoc, filename, fnmax_param) or []
+        return [obj.Shape for obj in topLevel \
+            if hasattr(obj, 'Shape') and not obj.Shape.isNull()]
+    finally:
+        FreeCAD.closeDocument(wrkDoc.Name)
+        if actDoc is not None and actDoc.Name in FreeCAD.listDocuments():
+            FreeCAD.setActiveDocument(actDoc.Name)
+
+# Objects to hide once the import is finished, None outside an import
+_hidden = None
+
+def hideObj(obj):
+    "hide obj now, or at the end of the import if one is running"
+    if not gui:
+        return
+    if _hidden is not None:
+        _hidden.append(obj)
+    else:
+        obj.ViewObject.hide()
+
+def recomputeObj(obj):
+    "recompute obj and what it depends on, not the whole document"
+    try:
+        obj.recompute(True)
+    except TypeError:
+        # FreeCAD without the recursive argument
+        obj.recompute()
+
+def beginImport(doc):
+    "start an import transaction : one undo step, visibility deferred"
+    global _hidden
+    _hidden = []
+    doc.openTransaction("Import CSG")
+
+def endImport(doc):
+    "single recompute of the document, then all deferred hides in one pass"
+    global _hidden
+    hidden, _hidden = _hidden or [], None
+    doc.recompute()
+    names = {obj.Name for obj in doc.Objects}
+    for obj in hidden:
+        try:
+            # skip objects removed since ( e.g. replaced by transformGeometry )
+            if obj.Name in names:
+                obj.ViewObject.Visibility = False
+        except Exception:
+            pass
+    if printverbose: write_log("INFO",f"Hid {len(hidden)} objects")
+    doc.commitTransaction()
+
+def abortImport(doc):
+    "failed import : roll the half built tree back, nothing to recompute"
+    global _hidden
+    _hidden = None
+    doc.abortTransaction()
+
 def processCSG(docSrc, filename, fnmax_param = None):
     global doc
     global fnmax
@@ -164,31 +329,35 @@ def processCSG(docSrc, filename, fnmax_param = None):
     #print(f"tokens {tokens}")
 
     if printverbose: print ('ImportCSG Version 0.6a')
-    # Build the lexer
-    if printverbose: write_log("INFO","Start Lex")
-    lex.lex(module=tokrules)
-    if printverbose: write_log("INFO","End Lex")
-
-    # Build the parser   
-    if printverbose: write_log("INFO","Load Parser")
-    # No debug out otherwise Linux has protection exception
-    parser = yacc.yacc(debug=False, write_tables=False)
-    if printverbose: write_log("INFO","Parser Loaded")
+    # Lexer / parser reused across imports
+    lexer, parser = getParser()
+    lexer.lineno = 1
     # Give the lexer some input
     #f=open('test.scad', 'r')
     f = io.open(filename, 'r', encoding="utf8")
     #lexer.input(f.read())
 
     if printverbose: write_log("INFO","Start Parser")
-    # Swap statements to enable Parser debugging
-    #result = parser.parse(f.read(),debug=1)
-    result = parser.parse(f.read())
-    f.close()
+    # No document recompute until the whole file is parsed, objects
+    # needed early are recomputed on their own ( recomputeObj )
+    beginImport(doc)
+    try:
+        # Swap statements to enable Parser debugging
+        #result = parser.parse(f.read(),debug=1)
+        result = parser.parse(f.read(), lexer=lexer)
+    except Exception:
+        abortImport(doc)
+        raise
+    else:
+        endImport(doc)
+    finally:
+        f.close()
     if printverbose:
         print('End Parser')
         print(result)
     FreeCAD.Console.PrintMessage('End processing CSG file\n')
-    doc.recompute()
+    # top level objects
+    return result
 
 def p_block_list_(p):
     '''
@@ -420,7 +589,7 @@ def CGALFeatureObj(name,children,arguments=[]):
     CGALFeature(myobj,name,children,str(arguments))
     if gui:
         for subobj in children:
-            subobj.ViewObject.hide()
+            hideObj(subobj)
         if FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
             GetBool('useViewProviderTree'):
             from OpenSCADFeatures import ViewProviderTree
@@ -459,9 +628,9 @@ def p_offset_action(p):
     else :
        newobj=doc.addObject("Part::Offset",'offset')
        newobj.Shape = subobj[0].Shape.makeOffset(offset)
-    newobj.Document.recompute()
+    recomputeObj(newobj)
     if gui:
-        subobj.ViewObject.hide()
+        hideObj(subobj)
 #        if FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
 #            GetBool('useViewProviderTree'):
 #            from OpenSCADFeatures import ViewProviderTree
@@ -607,7 +776,7 @@ def p_resize_action(p):
             ViewProviderTree(new_part.ViewObject)
         else:
             new_part.ViewObject.Proxy = 0
-        p[6][0].ViewObject.hide()
+        hideObj(p[6][0])
     p[0] = [new_part]
 
 def p_not_supported(p):
@@ -688,7 +857,7 @@ def fuse(lst,name):
            checkObjShape(s)
        if gui:
            for subobj in myfuse.Shapes:
-               subobj.ViewObject.hide()
+               hideObj(subobj)
     else:
        if printverbose: write_log("INFO","Single Fuse")
        myfuse = doc.addObject('Part::Fuse',name)
@@ -699,8 +868,8 @@ def fuse(lst,name):
        myfuse.Shape = myfuse.Base.Shape.fuse(myfuse.Tool.Shape)
        myfuse.Placement = FreeCAD.Placement()
        if gui:
-           myfuse.Base.ViewObject.hide()
-           myfuse.Tool.ViewObject.hide()
+           hideObj(myfuse.Base)
+           hideObj(myfuse.Tool)
     return(myfuse)
 
 def p_union_action(p):
@@ -723,6 +892,9 @@ def p_difference_action(p):
     elif (len(p[5]) == 1 ): #single object
         p[0] = p[5]
     else:
+        # Every tool stays a Cut operand, the document remains parametric.
+        # Bounding box culling is done in the AST path ( processAST ),
+        # here the shapes are not built before recompute
         mycut = doc.addObject('Part::Cut',p[1])
         mycut.Base = p[5][0]
         checkObjShape(mycut.Base)
@@ -734,8 +906,8 @@ def p_difference_action(p):
            mycut.Tool = p[5][1]
            checkObjShape(mycut.Tool)
         if gui:
-            mycut.Base.ViewObject.hide()
-            mycut.Tool.ViewObject.hide()
+            hideObj(mycut.Base)
+            hideObj(mycut.Tool)
         if printverbose: write_log("INFO","Push Resulting Cut")
         #print(dir(mycut))
         #print(mycut)
@@ -756,7 +928,7 @@ def p_intersection_action(p):
            checkObjShape(s)
        if gui:
            for subobj in mycommon.Shapes:
-               subobj.ViewObject.hide()
+               hideObj(subobj)
     elif (len(p[5]) == 2):
        if printverbose: write_log("INFO","Single Common")
        mycommon = doc.addObject('Part::Common',p[1])
@@ -766,8 +938,8 @@ def p_intersection_action(p):
        checkObjShape(mycommon.Tool)
        mycommon.Shape = mycommon.Base.Shape.common(mycommon.Tool.Shape)
        if gui:
-           mycommon.Base.ViewObject.hide()
-           mycommon.Tool.ViewObject.hide()
+           hideObj(mycommon.Base)
+           hideObj(mycommon.Tool)
     elif (len(p[5]) == 1):
         mycommon = p[5][0]
     else : # 1 child
@@ -787,7 +959,7 @@ def process_rotate_extrude(obj,angle):
             ViewProviderTree(newobj.ViewObject)
         else:
             newobj.ViewObject.Proxy = 0
-        obj.ViewObject.hide()
+        hideObj(obj)
     myrev = doc.addObject("Part::Revolution","RotateExtrude")
     myrev.Source = newobj
     myrev.Axis = (0.00,1.00,0.00)
@@ -795,7 +967,7 @@ def process_rotate_extrude(obj,angle):
     myrev.Angle = angle
     myrev.Placement=FreeCAD.Placement(FreeCAD.Vector(),FreeCAD.Rotation(0,0,90))
     if gui:
-        newobj.ViewObject.hide()
+        hideObj(newobj)
     return(myrev)
 
 def process_rotate_extrude_prism(obj, angle, n):
@@ -811,7 +983,7 @@ def process_rotate_extrude_prism(obj, angle, n):
             ViewProviderTree(newobj.ViewObject)
         else:
             newobj.ViewObject.Proxy = 0
-        obj.ViewObject.hide()
+        hideObj(obj)
     return(newobj)
 
 
@@ -874,7 +1046,7 @@ def process_linear_extrude(obj,h) :
             ViewProviderTree(newobj.ViewObject)
         else:
             newobj.ViewObject.Proxy = 0
-        obj.ViewObject.hide()
+        hideObj(obj)
         #mylinear.ViewObject.hide()
     mylinear = doc.addObject("Part::Extrusion","LinearExtrude")
     mylinear.Base = newobj #obj
@@ -883,7 +1055,7 @@ def process_linear_extrude(obj,h) :
     # V17 change to False mylinear.Solid = True
     mylinear.Solid = False
     if gui:
-        newobj.ViewObject.hide()
+        hideObj(newobj)
     return(mylinear)
 
 def process_linear_extrude_with_transform(base,height,twist,scale) :   
@@ -934,7 +1106,7 @@ def p_linear_extrude_with_transform(p):
             center(newobj,0,0,h)
     p[0] = [newobj]
     if gui:
-       obj.ViewObject.hide()
+       hideObj(obj)
     if printverbose: write_log("INFO","End Linear Extrude with twist")
 
 def p_import_file1(p):
@@ -1019,7 +1191,7 @@ def process_mesh_file(fname, ext):
         mesh1=doc.getObject(objname)
     if mesh1 is not None:
         if gui:
-            mesh1.ViewObject.hide()
+            hideObj(mesh1)
         sh=Part.Shape()
         sh.makeShapeFromMesh(mesh1.Mesh.Topology,0.1)
         solid = Part.Solid(sh)
@@ -1152,7 +1324,7 @@ def performMultMatrix(part, matrixisrounded, transform_matrix) :
             new_part.Placement=FreeCAD.Placement(cmat)
         new_part.Label="mirrored %s" % part.Label
         if gui:
-            part.ViewObject.hide()
+            hideObj(part)
     elif FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
         GetBool('useMultmatrixFeature'):
         from OpenSCADFeatures import MatrixTransform
@@ -1165,11 +1337,11 @@ def performMultMatrix(part, matrixisrounded, transform_matrix) :
                 ViewProviderTree(new_part.ViewObject)
             else:
                 new_part.ViewObject.Proxy = 0
-            part.ViewObject.hide()
+            hideObj(part)
     else :
         if printverbose: write_log("INFO","Transform Geometry")
 #       Need to recompute to stop transformGeometry causing a crash        
-        doc.recompute()
+        recomputeObj(part)
         print(f"Matrix Deformation {part.Label}")
         #new_part = doc.addObject("Part::Feature","Matrix Deformation")
         new_part = doc.addObject("Part::Feature","Matrix Deformation "+part.Label)
@@ -1180,7 +1352,7 @@ def performMultMatrix(part, matrixisrounded, transform_matrix) :
         if hasattr(part, 'Name'):
             doc.removeObject(part.Name)
         elif gui:
-            part.ViewObject.hide()
+            hideObj(part)
 #   Does not fix problemfile or beltTighener although later is closer       
 #        newobj=doc.addObject("Part::FeaturePython",'RefineMultMatrix')
 #    if False :  
@@ -1280,7 +1452,7 @@ def p_cylinder_action(p):
                     else :
                         pass
                     if gui:
-                        mycyl.Base.ViewObject.hide()
+                        hideObj(mycyl.Base)
                 else: #Use Part::Prism primitive
                     mycyl=doc.addObject("Part::Prism","prism")
                     mycyl.Polygon = n
@@ -1328,7 +1500,7 @@ def p_cylinder_action(p):
                 ViewProviderTree(newobj.ViewObject)
             else:
                 newobj.ViewObject.Proxy = 0
-            mycyl.ViewObject.hide()
+            hideObj(mycyl)
         p[0] = [newobj]
     else :
         p[0] = [mycyl]
@@ -1373,7 +1545,7 @@ def p_circle_action(p) :
         #mycircle.Radius = r
         #mycircle.MakeFace = True
         mycircle = Draft.makeCircle(r,face=True) # would call doc.recompute
-        FreeCAD.ActiveDocument.recompute()
+        recomputeObj(mycircle)
         #mycircle = doc.addObject('Part::Circle',p[1]) #would not create a face
         #mycircle.Radius = r
         #print('Circle Shape : ' +str(mycircle.Shape.isNull()))      
@@ -1497,40 +1669,44 @@ def p_polyhedron_action(p) :
     '''polyhedron_action : polyhedron LPAREN points EQ OSQUARE points_list_3d ESQUARE COMMA faces EQ OSQUARE path_set ESQUARE COMMA keywordargument_list RPAREN SEMICOL
                       | polyhedron LPAREN points EQ OSQUARE points_list_3d ESQUARE COMMA triangles EQ OSQUARE points_list_3d ESQUARE COMMA keywordargument_list RPAREN SEMICOL'''
     if printverbose: write_log("INFO","Polyhedron Points")
-    v = []
-    for i in p[6] :
-        if printverbose: write_log("INFO", i)
-        v.append(FreeCAD.Vector(float(i[0]),float(i[1]),float(i[2])))
+    points = np.array(p[6], dtype=np.float64).reshape(-1, 3)
+    faces = [[int(float(k)) for k in i] for i in p[12]]
     if printverbose:
-        print(v)
+        print(points)
         print ("Polyhedron "+p[9])
-        print (p[12])
-    faces_list = []    
+        print (faces)
+    sizes = np.array([len(f) for f in faces], dtype=np.int32)
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int32)
+    np.cumsum(sizes, out=offsets[1:])
+    indices = np.array([k for f in faces for k in f], dtype=np.int32)
     mypolyhed = doc.addObject('Part::Feature',p[1])
-    for i in p[12] :
-        if printverbose: write_log("INFO", i)
-        v2 = FreeCAD.Vector
-        pp =[v2(v[k]) for k in i]
+    # normals, orientation and coplanar merge done in bulk
+    shape = polyhedron_shape(points, indices, offsets)
+    if shape is None:
+        if printverbose: write_log("INFO","Bulk polyhedron failed, building face by face")
+        shape = polyhedronFaceByFace(points, faces)
+    mypolyhed.Shape = shape
+    p[0] = [mypolyhed]
+
+def polyhedronFaceByFace(points, faces):
+    "one face per polygon, filled face for non planar ones"
+    v = [FreeCAD.Vector(*pt) for pt in points.tolist()]
+    faces_list = []
+    for i in faces :
+        pp = [v[k] for k in i]
         # Add first point to end of list to close polygon
         pp.append(pp[0])
-        print("pp")
-        print(pp)
+        w = Part.makePolygon(pp)
         try:
-            w = Part.makePolygon(pp)
-            print("w")
-            print(w)
             f = Part.Face(w)
-        except:
-            secWireList = w.Edges[:]
-            f = Part.makeFilledFace(Part.__sortEdges__(secWireList))
-        #f = make_face(v[int(i[0])],v[int(i[1])],v[int(i[2])])
+        except Exception:
+            f = Part.makeFilledFace(Part.__sortEdges__(w.Edges[:]))
         faces_list.append(f)
     shell=Part.makeShell(faces_list)
     solid=Part.Solid(shell).removeSplitter()
     if solid.Volume < 0:
         solid.reverse()
-    mypolyhed.Shape=solid
-    p[0] = [mypolyhed]
+    return solid
 
 def p_projection_action(p) :
     'projection_action : projection LPAREN keywordargument_list RPAREN OBRACE block_list EBRACE'
@@ -1548,14 +1724,14 @@ def p_projection_action(p) :
             plane.Placement = FreeCAD.Placement(FreeCAD.Vector(\
                      -planedim,-planedim,0),FreeCAD.Rotation())
             if gui:
-                plane.ViewObject.hide()
+                hideObj(plane)
         if (len(p[6]) > 1):
             subobj = [fuse(p[6],"projection_cut_implicit_group")]
         else:
             subobj = p[6]
         obj.Shapes = [plane]+subobj
         if gui:
-            subobj[0].ViewObject.hide()
+            hideObj(subobj[0])
         p[0] = [obj]
     else: # cut == 'false' => true projection
         #if gui and not FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
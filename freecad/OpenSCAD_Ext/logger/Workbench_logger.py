@@ -1,7 +1,16 @@
-import os, sys, datetime, threading, FreeCAD
+import os, sys, datetime, threading, tempfile
+
+try:
+    import FreeCAD
+except ImportError:
+    # plain Python ( unit tests of the numpy modules )
+    FreeCAD = None
 
 # --- Log file path ---
-LOG_DIR = os.path.join(FreeCAD.getUserAppDataDir(), "OpenSCAD_Ext")
+if FreeCAD is not None:
+    LOG_DIR = os.path.join(FreeCAD.getUserAppDataDir(), "OpenSCAD_Ext")
+else:
+    LOG_DIR = os.path.join(tempfile.gettempdir(), "OpenSCAD_Ext")
 LOG_FILE = os.path.join(LOG_DIR, "workbench.log")
 
 if not os.path.exists(LOG_DIR):
@@ -20,6 +29,8 @@ def write_log(level, msg):
 
     # Also send to FreeCAD Report View
     #if FreeCAD.GuiUp:
+        if FreeCAD is None:
+            return
         if level in ("ERROR", "FC-ERR"):
             FreeCAD.Console.PrintError(f"[{level}] {msg}\n")
         else:
@@ -52,5 +63,5 @@ def init():
     msg = "OpenSCAD_Ext logger successfully registered — output active"
     write_log("INIT", msg)
     print(msg)  # ensures print() also goes to log
-if FreeCAD.GuiUp:
+if FreeCAD is not None and FreeCAD.GuiUp:
     FreeCAD.Console.PrintError(f"OpenSCAD_Ext logger active, log file: {LOG_FILE}\n")
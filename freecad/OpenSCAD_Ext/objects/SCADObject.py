@@ -28,9 +28,14 @@ from pathlib import Path
 
 from PySide import QtGui, QtWidgets
 from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.scratch import scratch_dir, scratch_path, release
+from freecad.OpenSCAD_Ext.objects.SCADWatcher import watchObject
 from freecad.OpenSCAD_Ext.commands.baseSCAD import BaseParams
 from freecad.OpenSCAD_Ext.core.OpenSCADUtils import callopenscad, \
-                                               OpenSCADError
+                                               OpenSCADError, \
+                                               binarystlsupported
+from freecad.OpenSCAD_Ext.core.mesh_io import read_mesh, mesh_to_shape, \
+                                               is_closed
 
 def create_scad_object(title, newFile, sourceFile, scadName="SCAD_Object"):
     write_log("Info",f"create scad object  ; newFile {newFile} scadName = {scadName} sourceFile = {sourceFile}")
@@ -52,48 +57,144 @@ def create_scad_object(title, newFile, sourceFile, scadName="SCAD_Object"):
         scadObj.editFile(sourceFile)
 
 # Shared between SCADObject and SCADModule
+def openscadErrorMessage(srcObj, e):
+    #print(f"OpenSCADError {e} {e.value}")
+    before = e.value.split('in file',1)[0]
+    print(f"Before : {before}")
+    after = e.value.rsplit(',',1)[1]
+    print(f"After  : {after}")
+    after = after.splitlines()[0]
+    print(f"After  : {after}")
+    srcObj.message = before + after
+    print(f"End After - Error Message {srcObj.message}")
+
+# OpenSCAD phase of a render, no document access so it can run
+# in a worker thread ( SCADRenderJob )
+# returns a scratch file : .stl for Mesh mode, .csg for Brep mode
+def runOpenSCAD(name, wrkSrc, mode, timeout, timeoutdialog=True):
+    ext = 'stl' if mode == "Mesh" else 'csg'
+    outFile = scratch_path('.'+ext, prefix=name+'-')
+    print(f"Call OpenSCAD - Input file {wrkSrc} Output file {outFile}")
+    try:
+        callopenscad(wrkSrc, \
+            outputfilename=outFile, outputext=ext, \
+            timeout=int(timeout), \
+            exportformat='binstl' if ext == 'stl' and binarystlsupported() else None, \
+            timeoutdialog=timeoutdialog)
+    except Exception:
+        release(outFile)
+        raise
+    return outFile
+
+# STL → Shape, no document access either
+def meshShape(stlFile):
+    if os.path.getsize(stlFile) == 0: # If Timeout nothing written
+        return None
+    print(f"STL File name {stlFile}")
+    vertices, indices, offsets = read_mesh(stlFile)
+    print(f"Count Facets {len(offsets) - 1}")
+    print(f"Is Solid {is_closed(indices, offsets)}")
+    return mesh_to_shape(vertices, indices, offsets, 0.1)
+
 def createMesh(srcObj, wrkSrc):
     print(f"Create Mesh {srcObj.Name} {wrkSrc}")
     try:
-        tmpDir = tempfile.gettempdir()
-        tmpOutFile = os.path.join(tmpDir, srcObj.Name+'.stl')
-        print(f"Call OpenSCAD - Input file {wrkSrc} Output file {tmpOutFile}")
-        tmpFileName=callopenscad(wrkSrc, \
-            outputfilename=tmpOutFile, outputext='stl', \
-            timeout=int(srcObj.timeout))
-        if os.path.exists(tmpFileName): # If Timeout no file
-            print(f"STL File name {tmpFileName}")
-            mesh = Mesh.Mesh()
-            print(f"files {tmpOutFile} {tmpFileName}")
-            mesh.read(tmpFileName)
-            #print(dir(mesh))
-            print(f"Mesh bound box {mesh.BoundBox}")
-            print(f"Count Facets {mesh.CountFacets}")
-            #print(f"Facets {mesh.Facets}")
-            print(f"Is Solid {mesh.isSolid()}")
-            shape = Part.Shape()
-            shape.makeShapeFromMesh(mesh.Topology, 0.1)
-            return shape
+        stlFile = runOpenSCAD(srcObj.Name, wrkSrc, "Mesh", srcObj.timeout)
+        try:
+            return meshShape(stlFile)
+        finally:
+            release(stlFile)
 
     except OpenSCADError as e:
-        #print(f"OpenSCADError {e} {e.value}")
-        before = e.value.split('in file',1)[0]
-        print(f"Before : {before}")
-        after = e.value.rsplit(',',1)[1]
-        print(f"After  : {after}")
-        after = after.splitlines()[0]
-        print(f"After  : {after}")
-        srcObj.message = before + after
-        print(f"End After - Error Message {srcObj.message}")
+        openscadErrorMessage(srcObj, e)
         #FreeCAD.closeDocument("work")
         # work document is for Brep Only
         srcObj.execute = False
 
+# relative import() files of the source resolve against its directory
+def sourceDir(srcObj):
+	return os.path.dirname(os.path.abspath(srcObj.sourceFile))
+
+# Render cache key : dependency closure of the source plus everything
+# else that changes the result, None if the cache is off or not usable
+def renderCacheKey(srcObj):
+    from freecad.OpenSCAD_Ext.core.brep_cache import render_cache, openscad_render_key
+    from freecad.OpenSCAD_Ext.core.scad_dependencies import dependency_hash
+    cache = render_cache()
+    # keep_work_doc wants the work document, only a real render makes it
+    if cache is None or srcObj.keep_work_doc:
+        return None
+    try:
+        deps = dependency_hash(srcObj.sourceFile)
+    except OSError as e:
+        write_log("Render", f"No render cache key for {srcObj.Label}: {e}")
+        return None
+    # the in memory and work document Brep paths build different shapes
+    return cache.key(deps, srcObj.mode, srcObj.fnmax, openscad_render_key(), \
+        srcObj.mode == "Brep" and useWorkDoc(srcObj))
+
+def cachedShape(cacheKey):
+    from freecad.OpenSCAD_Ext.core.brep_cache import render_cache
+    cache = render_cache()
+    if cacheKey is None or cache is None:
+        return None
+    return cache.get(cacheKey)
+
+def storeShape(cacheKey, shp):
+    from freecad.OpenSCAD_Ext.core.brep_cache import render_cache
+    cache = render_cache()
+    if cacheKey is None or cache is None or shp is None:
+        return
+    cache.put(cacheKey, shp)
+
 # Source may be processed
 def createBrep(srcObj, tmpDir, wrkSrc):
+	print(f"Create Brep {srcObj.scadName} {srcObj.fnmax}")
+	try:
+		print("Call OpenSCAD to create csg file from scad")
+		csgFile = runOpenSCAD(srcObj.Name, wrkSrc, "Brep", srcObj.timeout)
+	except OpenSCADError as e:
+		openscadErrorMessage(srcObj, e)
+		srcObj.execute = False
+		return None
+	try:
+		return brepFromCSG(srcObj, csgFile)
+	finally:
+		release(csgFile)
+
+# Brep shapes are built in memory by the AST pipeline by default, nodes
+# without a native builder are rendered by OpenSCAD. The legacy path
+# builds in a "work" document with importAltCSG : brepInMemory off or
+# keep_work_doc opt in to it, and it takes over when a fallback fails
+def useWorkDoc(srcObj):
+	return srcObj.keep_work_doc or not FreeCAD.ParamGet(\
+		"User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
+		GetBool('brepInMemory', True)
+
+# CSG → Shape through the AST pipeline, no document access so it can run
+# in a worker thread. baseDir is the directory of the .scad source, the
+# .csg is in the scratch directory. Node types OpenSCAD could not convert
+# are appended to failures, the shape then lacks them. fnmax as the
+# work document path, None reads the preference
+def csgShape(csgFile, baseDir=None, failures=None, fnmax=None):
+	from freecad.OpenSCAD_Ext.importers.importASTCSG import csg_to_shapes
+	shapes = [shape for _name, shape in csg_to_shapes(csgFile, baseDir, failures, fnmax) \
+		if shape is not None and not shape.isNull()]
+	if not shapes:
+		return None
+	return shapes[0] if len(shapes) == 1 else Part.makeCompound(shapes)
+
+# CSG parse / BRep build phase, the work document path is main thread only.
+# It is also used when the AST path left nodes out
+def brepFromCSG(srcObj, tmpFileName, workDoc=False):
+	if not (workDoc or useWorkDoc(srcObj)):
+		failures = []
+		shape = csgShape(tmpFileName, sourceDir(srcObj), failures, srcObj.fnmax)
+		if not failures:
+			return shape
+		write_log("Render", f"{srcObj.Label}: {', '.join(failures)} not converted, using a work document")
 	from importAltCSG import  processCSG
 
-	print(f"Create Brep {srcObj.scadName} {srcObj.fnmax}")
 	actDoc = FreeCAD.activeDocument().Name
 	print(f"Active Document {actDoc}")
 	wrkDoc = FreeCAD.newDocument("work")
@@ -101,12 +202,7 @@ def createBrep(srcObj, tmpDir, wrkSrc):
 		print(f"Source : {srcObj.scadName}")
 		print(f"SourceFile : {srcObj.sourceFile}")
 		print(wrkDoc)
-		csgOutFile = os.path.join(tmpDir, srcObj.Name+'.csg')
 		# brepOutFile = os.path.join(tmpDir, srcObj.Name+'.brep')
-		print("Call OpenSCAD to create csg file from scad")
-		tmpFileName=callopenscad(wrkSrc, \
-			outputfilename=csgOutFile, outputext='csg', \
-			timeout=int(srcObj.timeout))
 		if hasattr(srcObj, "source"):
 			source = srcObj.scadName
 		if hasattr(srcObj, "sourceFile"):
@@ -153,15 +249,7 @@ def createBrep(srcObj, tmpDir, wrkSrc):
 		#return retObj
 
 	except OpenSCADError as e:
-		#print(f"OpenSCADError {e} {e.value}")
-		before = e.value.split('in file',1)[0]
-		print(f"Before : {before}")
-		after = e.value.rsplit(',',1)[1]
-		print(f"After  : {after}")
-		after = after.splitlines()[0]
-		print(f"After  : {after}")
-		srcObj.message = before + after
-		print(f" End After - Error Message {srcObj.message}")
+		openscadErrorMessage(srcObj, e)
 		FreeCAD.closeDocument("work")
 		srcObj.execute = False
 
@@ -198,7 +286,7 @@ def createBrep(srcObj, tmpDir, wrkSrc):
 def shapeFromSourceFile(srcObj, module=False, modules=False):
     global doc
     print(f"shapeFrom Source File : keepWork {srcObj.keep_work_doc}")
-    tmpDir = tempfile.gettempdir()
+    tmpDir = scratch_dir()
     #if modules == True:
     #    wrkSrc = os.path.join(tmpDir, srcObj.Name+'.scad')
     #    #   wrkSrcFp = fopen(wrkSrc)
@@ -464,6 +552,12 @@ class SCADfileBase:
         print(f"execute")
 
 
+    def onDocumentRestored(self, obj):
+        # re-render when the sources change while the document is open
+        self.Object = obj
+        watchObject(obj)
+
+
     # use name render for new workbench
     # redirect for compatibility with old Alternate
     #
@@ -477,8 +571,43 @@ class SCADfileBase:
         print(f"Execute {obj.Name} Mode {obj.mode} keepWork {obj.keep_work_doc}")
         start = timer()
         #print(dir(obj))
-        obj.message = ""
+        cacheKey, shp = self.prepareRender(obj)
+        if shp is not None:
+            self.applyShape(obj, shp, start)
+            return
+        apply = lambda o, s, t: self.applyShape(o, s, t, cacheKey)
+        if FreeCAD.GuiUp and FreeCAD.ParamGet(\
+            "User parameter:BaseApp/Preferences/Mod/OpenSCAD").\
+            GetBool('renderInBackground', True):
+            # OpenSCAD runs in a worker thread, applyShape is called
+            # on the main thread once it is done
+            from freecad.OpenSCAD_Ext.objects.SCADRenderJob import startRender
+            startRender(obj, apply)
+            return
         shp = shapeFromSourceFile(obj, modules = obj.modules)
+        apply(obj, shp, start)
+
+
+    def prepareRender(self, obj):
+        """ Reset message, watch sources, (cacheKey, cached shape or None) """
+        obj.message = ""
+        watchObject(obj)
+        cacheKey = renderCacheKey(obj)
+        shp = cachedShape(cacheKey)
+        if shp is not None:
+            write_log("Render", f"{obj.Label} : render cache hit")
+        return cacheKey, shp
+
+
+    def applyShape(self, obj, shp, start, cacheKey=None):
+        from timeit import default_timer as timer
+        if shp is not None and not obj.message and cacheKey is not None:
+            # sources edited while OpenSCAD ran, the shape is from the new
+            # content, storing it under the snapshot key would be wrong
+            if renderCacheKey(obj) == cacheKey:
+                storeShape(cacheKey, shp)
+            else:
+                write_log("Render", f"{obj.Label} : sources changed during render, not cached")
         if shp is not None:
             print(f"Initial Shape {obj.Shape}")
             print(f"Returned Shape {shp}")
@@ -0,0 +1,376 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Background rendering of SCAD objects                                   *
+#*                                                                          *
+#*   The OpenSCAD run and the STL / CSG → Shape conversion happen in a      *
+#*   worker thread, FreeCAD stays usable meanwhile.                         *
+#*   Progress goes to a non modal dialog whose Cancel kills the OpenSCAD    *
+#*   process of this render only. The result is applied on the main        *
+#*   thread, which also parses the CSG when a work document is wanted       *
+#*   ( keep_work_doc or brepInMemory off ) or the AST path left nodes out.  *
+#****************************************************************************
+import os
+import threading
+from timeit import default_timer as timer
+
+import FreeCAD
+import FreeCADGui
+from PySide import QtCore, QtGui
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.OpenSCADUtils import OpenSCADError
+from freecad.OpenSCAD_Ext.core.openscad_runner import openscad_runner
+from freecad.OpenSCAD_Ext.core.scratch import release
+from freecad.OpenSCAD_Ext.objects.SCADObject import (
+    runOpenSCAD,
+    meshShape,
+    csgShape,
+    brepFromCSG,
+    useWorkDoc,
+    openscadErrorMessage,
+)
+
+# (document name, object name) → running SCADRenderJob
+_jobs = {}
+
+
+def renderPhase(name, sourceFile, mode, timeout, cancelled,
+                inMemory=True, converting=None, fnmax=None):
+    """
+    Thread safe part of a render : OpenSCAD, then STL → Shape for Mesh
+    mode and, when inMemory, CSG → Shape for Brep mode.
+    Returns the Shape, or the scratch .csg ( str ) the main thread has
+    to parse in a work document, also when the AST path left nodes out.
+    """
+    outFile = runOpenSCAD(name, sourceFile, mode, timeout, timeoutdialog=False)
+    if mode != "Mesh" and not inMemory:
+        return outFile
+    failures = []
+    keep = False
+    try:
+        if cancelled():
+            return None
+        if converting is not None:
+            converting("Mesh build" if mode == "Mesh" else "CSG parse / BRep build")
+        if mode == "Mesh":
+            return meshShape(outFile)
+        shape = csgShape(outFile, os.path.dirname(os.path.abspath(sourceFile)), failures, fnmax)
+        if not failures:
+            return shape
+        write_log("Render", f"{name}: {', '.join(failures)} not converted, using a work document")
+        keep = True
+        return outFile
+    finally:
+        # the main thread releases a returned .csg
+        if not keep:
+            release(outFile)
+
+
+def reportError(obj, error):
+    if isinstance(error, OpenSCADError):
+        openscadErrorMessage(obj, error)
+    else:
+        obj.message = str(error)
+    FreeCAD.Console.PrintError(f"Render of {obj.Label} failed: {error}\n")
+    obj.execute = False
+
+
+class SCADRenderJob(QtCore.QObject):
+    """
+    Render of one SCAD object.
+    apply(obj, shape, start) is called on the main thread when done.
+    """
+    progress = QtCore.Signal(str, int)      # phase, step
+    done = QtCore.Signal(object, object)    # result, exception
+
+    STEPS = 2
+
+    def __init__(self, obj, apply):
+        super().__init__()
+        # snapshot, the worker thread never touches the document
+        self.key = (obj.Document.Name, obj.Name)
+        self.label = obj.Label
+        self.sourceFile = obj.sourceFile
+        self.mode = obj.mode
+        self.timeout = obj.timeout
+        self.fnmax = obj.fnmax
+        self.inMemory = not useWorkDoc(obj)
+        self.apply = apply
+        self.cancelled = False
+        self.thread = None
+        self.dialog = None
+        self.start_time = timer()
+        # emitted from the worker, delivered queued on the main thread
+        self.progress.connect(self._progress)
+        self.done.connect(self._finished)
+
+    def start(self):
+        self.dialog = QtGui.QProgressDialog(
+            f"{self.label}: OpenSCAD", "Cancel", 0, self.STEPS,
+            FreeCADGui.getMainWindow())
+        self.dialog.setWindowTitle("Render SCAD Object")
+        self.dialog.setWindowModality(QtCore.Qt.NonModal)
+        self.dialog.setAutoClose(False)
+        self.dialog.setAutoReset(False)
+        self.dialog.setMinimumDuration(0)
+        self.dialog.canceled.connect(self.cancel)
+        self.dialog.show()
+
+        self.thread = threading.Thread(
+            target=self._run, name=f"Render {self.key[1]}", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        if self.cancelled:
+            return
+        self.cancelled = True
+        write_log("Render", f"Render of {self.label} cancelled")
+        if self.thread is not None:
+            openscad_runner().cancel(self.thread.ident)
+
+    # -----------------------------
+    # Worker thread
+    # -----------------------------
+
+    def _run(self):
+        try:
+            self.progress.emit("OpenSCAD", 0)
+            self.done.emit(renderPhase(
+                self.key[1], self.sourceFile, self.mode, self.timeout,
+                lambda: self.cancelled, self.inMemory,
+                lambda phase: self.progress.emit(phase, 1), self.fnmax), None)
+        except Exception as e:
+            self.done.emit(None, e)
+
+    # -----------------------------
+    # Main thread
+    # -----------------------------
+
+    def _progress(self, phase, step):
+        if self.dialog is not None:
+            self.dialog.setLabelText(f"{self.label}: {phase}")
+            self.dialog.setValue(step)
+
+    def _object(self):
+        doc = FreeCAD.listDocuments().get(self.key[0])
+        return doc.getObject(self.key[1]) if doc is not None else None
+
+    def _finished(self, result, error):
+        # a newer render of the same object replaced this one
+        current = _jobs.get(self.key) is self
+        if current:
+            del _jobs[self.key]
+        # work document path, parsed here
+        csgFile = result if isinstance(result, str) else None
+        try:
+            obj = self._object() if current else None
+            if obj is None or self.cancelled:
+                if obj is not None:
+                    obj.message = "Render cancelled"
+                    obj.execute = False
+                return
+            if error is not None:
+                reportError(obj, error)
+                return
+            shape = result
+            if csgFile is not None:
+                self._progress("CSG parse / BRep build", 1)
+                QtGui.QApplication.processEvents()
+                shape = brepFromCSG(obj, csgFile, workDoc=True)
+            self._progress("Done", self.STEPS)
+            self.apply(obj, shape, self.start_time)
+        finally:
+            if csgFile is not None:
+                release(csgFile)
+            if self.dialog is not None:
+                # closing a QProgressDialog emits canceled
+                self.dialog.canceled.disconnect(self.cancel)
+                self.dialog.close()
+                self.dialog.deleteLater()
+                self.dialog = None
+
+
+def startRender(obj, apply):
+    """ Render obj in the background, a running render of obj is cancelled """
+    key = (obj.Document.Name, obj.Name)
+    running = _jobs.get(key)
+    if running is not None:
+        running.cancel()
+    job = SCADRenderJob(obj, apply)
+    _jobs[key] = job
+    job.start()
+    return job
+
+
+def cancelAll():
+    for job in list(_jobs.values()):
+        job.cancel()
+
+
+class SCADBatchRender(QtCore.QObject):
+    """
+    Render of several SCAD objects at once. The OpenSCAD / mesh phases run
+    concurrently on the runner threads, shapes are applied on the main
+    thread in one document transaction once every object is done.
+    """
+    done = QtCore.Signal(object, object, object)    # key, result, exception
+
+    def __init__(self, objs):
+        super().__init__()
+        self.tasks = {}     # key → (label, mode, cacheKey)
+        self.results = {}   # key → (result, exception)
+        self.cached = {}    # key → shape from the render cache
+        self.docName = objs[0].Document.Name
+        self.cancelled = False
+        self.threads = set()
+        self.dialog = None
+        self.start_time = timer()
+        self._snapshots = []
+        for obj in objs:
+            key = (obj.Document.Name, obj.Name)
+            cacheKey, shp = obj.Proxy.prepareRender(obj)
+            self.tasks[key] = (obj.Label, obj.mode, cacheKey)
+            if shp is not None:
+                self.cached[key] = shp
+            else:
+                self._snapshots.append(
+                    (key, obj.sourceFile, obj.mode, obj.timeout,
+                     not useWorkDoc(obj), obj.fnmax))
+        self.done.connect(self._finished)
+
+    def start(self):
+        if not self._snapshots:
+            self._apply()
+            return
+        self.dialog = QtGui.QProgressDialog(
+            f"OpenSCAD: 0 / {len(self._snapshots)}", "Cancel",
+            0, len(self._snapshots), FreeCADGui.getMainWindow())
+        self.dialog.setWindowTitle("Render SCAD Objects")
+        self.dialog.setWindowModality(QtCore.Qt.NonModal)
+        self.dialog.setAutoClose(False)
+        self.dialog.setAutoReset(False)
+        self.dialog.setMinimumDuration(0)
+        self.dialog.canceled.connect(self.cancel)
+        self.dialog.show()
+        runner = openscad_runner()
+        for snapshot in self._snapshots:
+            runner.submit(self._run, *snapshot)
+
+    def cancel(self):
+        if self.cancelled:
+            return
+        self.cancelled = True
+        write_log("Render", "Batch render cancelled")
+        for ident in list(self.threads):
+            openscad_runner().cancel(ident)
+
+    # Worker threads
+
+    def _run(self, key, sourceFile, mode, timeout, inMemory, fnmax):
+        if self.cancelled:
+            self.done.emit(key, None, None)
+            return
+        ident = threading.get_ident()
+        self.threads.add(ident)
+        try:
+            self.done.emit(key, renderPhase(
+                key[1], sourceFile, mode, timeout,
+                lambda: self.cancelled, inMemory, fnmax=fnmax), None)
+        except Exception as e:
+            self.done.emit(key, None, e)
+        finally:
+            self.threads.discard(ident)
+
+    # Main thread
+
+    def _superseded(self, key):
+        """ A newer batch or single render took over the object """
+        if key in _jobs:
+            return True
+        return _batch is not None and _batch is not self and key in _batch.tasks
+
+    def _finished(self, key, result, error):
+        self.results[key] = (result, error)
+        count = len(self.results)
+        if self.dialog is not None:
+            self.dialog.setLabelText(f"OpenSCAD: {count} / {len(self._snapshots)}")
+            self.dialog.setValue(count)
+        if count == len(self._snapshots):
+            self._apply()
+
+    def _apply(self):
+        global _batch
+        if _batch is self:
+            _batch = None
+        doc = FreeCAD.listDocuments().get(self.docName)
+        csgFiles = [
+            result for result, _error in self.results.values()
+            if isinstance(result, str)
+        ]
+        try:
+            if doc is None:
+                return
+            if self.cancelled:
+                for key in self.tasks:
+                    if self._superseded(key):
+                        continue
+                    obj = doc.getObject(key[1])
+                    if obj is not None and key not in self.cached:
+                        obj.message = "Render cancelled"
+                        obj.execute = False
+                return
+            if self.dialog is not None:
+                self.dialog.setLabelText("Applying shapes")
+                QtGui.QApplication.processEvents()
+            doc.openTransaction("Render SCAD objects")
+            try:
+                for key, (label, mode, cacheKey) in self.tasks.items():
+                    if self._superseded(key):
+                        continue
+                    obj = doc.getObject(key[1])
+                    if obj is None:
+                        continue
+                    if key in self.cached:
+                        obj.Proxy.applyShape(obj, self.cached[key], self.start_time)
+                        continue
+                    result, error = self.results.get(key, (None, None))
+                    if error is not None:
+                        reportError(obj, error)
+                        continue
+                    # work document path, main thread only
+                    shape = brepFromCSG(obj, result, workDoc=True) \
+                        if isinstance(result, str) else result
+                    obj.Proxy.applyShape(obj, shape, self.start_time, cacheKey)
+            finally:
+                doc.commitTransaction()
+            write_log("Render",
+                f"Rendered {len(self.tasks)} SCAD objects in {timer() - self.start_time:.2f}s")
+        finally:
+            release(*csgFiles)
+            if self.dialog is not None:
+                # closing a QProgressDialog emits canceled
+                self.dialog.canceled.disconnect(self.cancel)
+                self.dialog.close()
+                self.dialog.deleteLater()
+                self.dialog = None
+
+
+_batch = None
+
+
+def startBatchRender(objs):
+    """
+    Render objs ( SCADfileBase objects of one document ) concurrently,
+    shapes are applied together once all of them are done
+    """
+    global _batch
+    if _batch is not None:
+        _batch.cancel()
+    for obj in objs:
+        # no longer current, its _finished leaves the object alone
+        running = _jobs.pop((obj.Document.Name, obj.Name), None)
+        if running is not None:
+            running.cancel()
+    _batch = SCADBatchRender(objs)
+    _batch.start()
+    return _batch
@@ -0,0 +1,145 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Auto re-render of SCAD objects when their sources change               *
+#*                                                                          *
+#*   Every rendered / restored SCAD object registers the dependency         *
+#*   closure of its sourceFile ( core/scad_dependencies.py ). One           *
+#*   QFileSystemWatcher covers the union of all closures, changes are       *
+#*   collected for watchDebounceMs and then only the objects whose          *
+#*   closure hash actually changed are re-rendered. Directories where a     *
+#*   missing include would appear are watched too, so creating it later     *
+#*   re-renders as well. With background rendering each of those renders    *
+#*   runs in its own SCADRenderJob, so editing a shared library refreshes   *
+#*   the affected objects in parallel.                                      *
+#****************************************************************************
+import os
+
+import FreeCAD
+from PySide import QtCore
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.scad_dependencies import (
+    candidate_dirs,
+    dependency_closure,
+    dependency_hash,
+)
+
+PARAM_PATH = "User parameter:BaseApp/Preferences/Mod/OpenSCAD"
+
+
+class SCADWatcher(QtCore.QObject):
+    """
+    (document name, object name) → closure of its sourceFile,
+    re-renders objects whose closure changed on disk
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._entries = {}      # key → (set of paths, set of dirs, dependency hash)
+        self._dirty = set()
+        self._watcher = QtCore.QFileSystemWatcher()
+        self._watcher.fileChanged.connect(self._changed)
+        self._watcher.directoryChanged.connect(self._changed)
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+
+    # -----------------------------
+    # Registration
+    # -----------------------------
+
+    def watch(self, obj):
+        """ (Re)register obj with the current closure of its sourceFile """
+        key = (obj.Document.Name, obj.Name)
+        if not obj.sourceFile:
+            self.unwatch(key)
+            return
+        missing = []
+        closure = dependency_closure(obj.sourceFile, missing)
+        paths = {path for path, _digest in closure if not path.startswith("missing:")}
+        dirs = set()
+        for name, base_dir in missing:
+            dirs.update(candidate_dirs(name, base_dir))
+        self._entries[key] = (paths, dirs, dependency_hash(obj.sourceFile))
+        self._sync()
+
+    def unwatch(self, key):
+        if self._entries.pop(key, None) is not None:
+            self._sync()
+
+    def _sync(self):
+        """ Watched paths = union of all closures and missing name dirs """
+        wanted_files = set()
+        wanted_dirs = set()
+        for paths, dirs, _hash in self._entries.values():
+            wanted_files |= paths
+            wanted_dirs |= dirs
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        stale = watched - wanted_files - wanted_dirs
+        if stale:
+            self._watcher.removePaths(list(stale))
+        # editors saving via rename drop the path from the watcher, re-add
+        new = [path for path in wanted_files - watched if os.path.isfile(path)]
+        new += [path for path in wanted_dirs - watched if os.path.isdir(path)]
+        if new:
+            self._watcher.addPaths(new)
+
+    # -----------------------------
+    # Changes
+    # -----------------------------
+
+    def _changed(self, path):
+        self._dirty.add(path)
+        delay = FreeCAD.ParamGet(PARAM_PATH).GetInt("watchDebounceMs", 500)
+        self._timer.start(max(delay, 0))
+
+    def _flush(self):
+        dirty, self._dirty = self._dirty, set()
+        if not FreeCAD.ParamGet(PARAM_PATH).GetBool("autoRerender", True):
+            return
+        for key, (paths, dirs, old_hash) in list(self._entries.items()):
+            if not (paths | dirs) & dirty:
+                continue
+            obj = _object(key)
+            if obj is None:
+                del self._entries[key]
+                continue
+            if not os.path.isfile(obj.sourceFile):
+                # mid save ( editors writing a temp file and renaming it ),
+                # the file watch is gone, its directory reports the rename
+                parent = os.path.dirname(os.path.abspath(obj.sourceFile))
+                self._entries[key] = (paths, dirs | {parent}, old_hash)
+                continue
+            new_hash = dependency_hash(obj.sourceFile)
+            if new_hash == old_hash:
+                if dirs & dirty:
+                    # e.g. a missing subdirectory appeared, watch it instead
+                    self.watch(obj)
+                continue
+            write_log("Watch", f"Sources of {obj.Label} changed, re-rendering")
+            # executeFunction registers the new closure again
+            obj.Proxy.executeFunction(obj)
+        self._sync()
+
+
+def _object(key):
+    doc = FreeCAD.listDocuments().get(key[0])
+    return doc.getObject(key[1]) if doc is not None else None
+
+
+_watcher = None
+
+
+def watchObject(obj):
+    """ Watch obj's sources if enabled, GUI only ( needs the event loop ) """
+    global _watcher
+    if not FreeCAD.GuiUp:
+        return
+    if not FreeCAD.ParamGet(PARAM_PATH).GetBool("autoRerender", True):
+        return
+    if _watcher is None:
+        _watcher = SCADWatcher()
+    try:
+        _watcher.watch(obj)
+    except OSError as e:
+        write_log("Watch", f"Not watching {obj.Label}: {e}")
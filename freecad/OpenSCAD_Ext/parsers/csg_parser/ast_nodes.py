@@ -1,17 +1,39 @@
 # ast_nodes.py
+import sys
 from typing import Optional, Any
 
+import numpy as np
+
 # -------------------------------------------------
 # Base AST Node
 # -------------------------------------------------
 class AstNode:
     """
     Base AST node storing:
-      - node_type: OpenSCAD keyword
+      - node_type: OpenSCAD keyword ( interned )
       - params: typed parameters (for FreeCAD BRep creation)
       - csg_params: raw parameters (for flattening / OpenSCAD fallback)
       - children: child AST nodes
+
+    Nodes use __slots__ ( no per instance __dict__ ). When parsed from
+    a file csg_params is not stored, only the statement's bytes and
+    the span in them; the text is materialized on access and params
+    are parsed from it on first access.
+    The underscore slots after _span are filled in by processAST.
     """
+    __slots__ = (
+        "node_type",
+        "children",
+        "_params",
+        "_csg_params",
+        "_source",
+        "_span",
+        "_shape",
+        "_fallback_scad",
+        "_stl_future",
+        "_key",
+    )
+
     def __init__(
         self,
         node_type: str,
@@ -19,11 +41,55 @@ class AstNode:
         csg_params: Optional[Any] = None,
         children=None
     ):
-        self.node_type = node_type
-        self.params = params or {}
-        self.csg_params = csg_params
+        self.node_type = sys.intern(node_type)
+        self._params = params or {}
+        self._csg_params = csg_params
+        self._source = None
+        self._span = None
         self.children = children or []
 
+    def set_source(self, source, span):
+        """
+        Keep raw parameters as span = (start, end, header) into source
+        ( bytes / mmap ) instead of a string, see csg_params.
+        Typed params are dropped and parsed again on demand.
+        """
+        self._params = None
+        self._csg_params = None
+        self._source = source
+        self._span = span
+
+    @property
+    def params(self):
+        if self._params is None:
+            from freecad.OpenSCAD_Ext.parsers.csg_parser.parse_csg_file_to_AST_nodes import (
+                parse_node_params,
+            )
+            self._params = parse_node_params(self.node_type, self.csg_params)
+        return self._params
+
+    @params.setter
+    def params(self, value):
+        self._params = value
+
+    @property
+    def csg_params(self):
+        if self._source is None:
+            return self._csg_params
+        # deferred import, the parser imports this module
+        from freecad.OpenSCAD_Ext.parsers.csg_parser.parse_csg_file_to_AST_nodes import (
+            split_csg_statement,
+        )
+        start, end, header = self._span
+        statement = self._source[start:end].decode("utf-8", errors="replace")
+        return split_csg_statement(statement)[header][1]
+
+    @csg_params.setter
+    def csg_params(self, value):
+        self._csg_params = value
+        self._source = None
+        self._span = None
+
     def __repr__(self):
         return (
             f"<{self.node_type} "
@@ -37,14 +103,20 @@ class AstNode:
 # 2D primitives
 # -------------------------------------------------
 class Circle(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("circle", params or {}, csg_params, children)
 
 class Square(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("square", params or {}, csg_params, children)
 
 class Polygon(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("polygon", params or {}, csg_params, children)
 
@@ -53,26 +125,29 @@ class Polygon(AstNode):
 # 3D primitives
 # -------------------------------------------------
 class Cube(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("cube", params or {}, csg_params, children)
 
 class Sphere(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("sphere", params or {}, csg_params, children)
 
 class Cylinder(AstNode):
-    def __init__(self, params=None, csg_params=None, children=None):
-        super().__init__("cylinder", params or {}, csg_params, children)
+    __slots__ = ()
 
-class Polyhedron(AstNode):
     def __init__(self, params=None, csg_params=None, children=None):
-        super().__init__("polyhedron", params or {}, csg_params, children)
-
+        super().__init__("cylinder", params or {}, csg_params, children)
 
 # -------------------------------------------------
 # Color
 # -------------------------------------------------
 class Color(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("color", params or {}, csg_params, children)
 
@@ -81,26 +156,38 @@ class Color(AstNode):
 # Boolean / CSG operators
 # -------------------------------------------------
 class Union(AstNode):
+    __slots__ = ()
+
     def __init__(self, children=None, params=None, csg_params=None):
         super().__init__("union", params or {}, csg_params, children)
 
 class Difference(AstNode):
+    __slots__ = ()
+
     def __init__(self, children=None, params=None, csg_params=None):
         super().__init__("difference", params or {}, csg_params, children)
 
 class Intersection(AstNode):
+    __slots__ = ()
+
     def __init__(self, children=None, params=None, csg_params=None):
         super().__init__("intersection", params or {}, csg_params, children)
 
 class Hull(AstNode):
+    __slots__ = ()
+
     def __init__(self, children=None, params=None, csg_params=None):
         super().__init__("hull", params or {}, csg_params, children)
 
 class Minkowski(AstNode):
+    __slots__ = ()
+
     def __init__(self, children=None, params=None, csg_params=None):
         super().__init__("minkowski", params or {}, csg_params, children)
 
 class Group(AstNode):
+    __slots__ = ()
+
     def __init__(self, children=None, params=None, csg_params=None):
         super().__init__("group", params or {}, csg_params, children)
 
@@ -109,18 +196,26 @@ class Group(AstNode):
 # Transforms
 # -------------------------------------------------
 class Translate(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("translate", params or {}, csg_params, children)
 
 class Rotate(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("rotate", params or {}, csg_params, children)
 
 class Scale(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("scale", params or {}, csg_params, children)
 
 class MultMatrix(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("multmatrix", params or {}, csg_params, children)
 
@@ -129,10 +224,14 @@ class MultMatrix(AstNode):
 # Extrusions
 # -------------------------------------------------
 class LinearExtrude(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("linear_extrude", params or {}, csg_params, children)
 
 class RotateExtrude(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("rotate_extrude", params or {}, csg_params, children)
 
@@ -143,6 +242,8 @@ class RotateExtrude(AstNode):
 # ToDo Needs additional params
 
 class Text(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__(
             "text",
@@ -152,16 +253,32 @@ class Text(AstNode):
         )
 
 class Polyhedron(AstNode):
+    __slots__ = ()
+
     def __init__(self, params=None, csg_params=None, children=None):
         super().__init__("polyhedron", params or {}, csg_params, children)
 
     @property
     def points(self):
-        return self.params.get("points", [])
+        """ float64 (N, 3) numpy array """
+        return self.params.get("points", np.zeros((0, 3)))
+
+    @property
+    def face_indices(self):
+        """ int32 flat face index buffer """
+        return self.params.get("face_indices", np.zeros(0, dtype=np.int32))
+
+    @property
+    def face_offsets(self):
+        """ int32 (F + 1), face i = face_indices[offsets[i]:offsets[i+1]] """
+        return self.params.get("face_offsets", np.zeros(1, dtype=np.int32))
 
     @property
     def faces(self):
-        return self.params.get("faces", [])
+        """ Faces as lists of point indices ( built on demand ) """
+        indices = self.face_indices
+        offsets = self.face_offsets.tolist()
+        return [indices[a:b].tolist() for a, b in zip(offsets[:-1], offsets[1:])]
 
     @property
     def convexity(self):
@@ -171,6 +288,8 @@ class Polyhedron(AstNode):
 # Unknown / unsupported nodes
 # -------------------------------------------------
 class UnknownNode(AstNode):
+    __slots__ = ()
+
     def __init__(self, node_type, params=None, csg_params=None, children=None):
         super().__init__(node_type, params or {}, csg_params, children)
 
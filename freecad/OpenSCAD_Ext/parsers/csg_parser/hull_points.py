@@ -0,0 +1,308 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Vertex sampling of AST subtrees for the native hull                    *
+#*                                                                          *
+#*   hull(children) only depends on the vertices of the children, so each   *
+#*   supported subtree is reduced to a point array using the same           *
+#*   tessellation OpenSCAD uses ( $fn / $fa / $fs ).                        *
+#*                                                                          *
+#*   Returns None for anything whose vertices can not be derived without    *
+#*   evaluating booleans ( difference, intersection, minkowski, text ...)  *
+#****************************************************************************
+import ast
+import math
+
+import numpy as np
+
+from freecad.OpenSCAD_Ext.parsers.csg_parser.parse_csg_file_to_AST_nodes import (
+    normalizeBool,
+    split_top_level_commas,
+)
+
+# OpenSCAD GRID_FINE
+GRID_FINE = 0.00000095367431640625
+
+# Nodes whose vertices are the union of their children's vertices
+PASS_THROUGH = ("group", "root", "union", "hull", "color", "render")
+
+
+def get_fragments_from_r(r, fn=0.0, fs=2.0, fa=12.0):
+    """ Same as OpenSCAD Calc::get_fragments_from_r """
+    if r < GRID_FINE:
+        return 3
+    if fn > 0.0:
+        return int(fn) if fn >= 3 else 3
+    return int(math.ceil(max(min(360.0 / fa, r * 2 * math.pi / fs), 5)))
+
+
+def _num(params, key, default):
+    value = params.get(key, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def _fragments(params, r):
+    return get_fragments_from_r(
+        r,
+        _num(params, "$fn", 0),
+        _num(params, "$fs", 2),
+        _num(params, "$fa", 12),
+    )
+
+
+def circle_points(r, fragments, z=0.0):
+    phi = 2 * math.pi * np.arange(fragments) / fragments
+    return np.stack(
+        (r * np.cos(phi), r * np.sin(phi), np.full(fragments, z)), axis=1
+    )
+
+
+def _vector(value, length):
+    if isinstance(value, (list, tuple)):
+        vec = [float(v) for v in value]
+        while len(vec) < length:
+            vec.append(vec[-1] if vec else 1.0)
+        return vec[:length]
+    return [float(value)] * length
+
+
+def _raw_param(node, key):
+    """ Parameter straight from the raw csg text ( nested lists safe ) """
+    for part in split_top_level_commas(node.csg_params or ""):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            if k.strip() == key:
+                return ast.literal_eval(v.strip())
+    return None
+
+
+# -----------------------------
+# Primitives ( local coordinates )
+# -----------------------------
+
+def _cube(node):
+    p = node.params
+    sx, sy, sz = _vector(p.get("size", 1), 3)
+    pts = np.array([
+        [x, y, z] for x in (0, sx) for y in (0, sy) for z in (0, sz)
+    ], dtype=np.float64)
+    if normalizeBool(p.get("center", False)):
+        pts -= [sx / 2, sy / 2, sz / 2]
+    return pts
+
+
+def _sphere(node):
+    p = node.params
+    r = _num(p, "r", 1)
+    fragments = _fragments(p, r)
+    rings = (fragments + 1) // 2
+    out = []
+    for i in range(rings):
+        phi = math.pi * (i + 0.5) / rings
+        out.append(circle_points(r * math.sin(phi), fragments, r * math.cos(phi)))
+    return np.concatenate(out)
+
+
+def _cylinder(node):
+    p = node.params
+    h = _num(p, "h", 1)
+    r1 = _num(p, "r1", _num(p, "r", 1))
+    r2 = _num(p, "r2", r1)
+    z1, z2 = (-h / 2, h / 2) if normalizeBool(p.get("center", False)) else (0.0, h)
+    fragments = _fragments(p, max(r1, r2))
+    out = []
+    for r, z in ((r1, z1), (r2, z2)):
+        if r > 0:
+            out.append(circle_points(r, fragments, z))
+        else:
+            out.append(np.array([[0.0, 0.0, z]]))
+    return np.concatenate(out)
+
+
+def _circle(node):
+    r = _num(node.params, "r", 1)
+    return circle_points(r, _fragments(node.params, r))
+
+
+def _square(node):
+    p = node.params
+    sx, sy = _vector(p.get("size", 1), 2)
+    pts = np.array([[0, 0, 0], [sx, 0, 0], [sx, sy, 0], [0, sy, 0]], dtype=np.float64)
+    if normalizeBool(p.get("center", False)):
+        pts -= [sx / 2, sy / 2, 0]
+    return pts
+
+
+def _polygon(node):
+    pts = _raw_param(node, "points")
+    if not pts:
+        return None
+    pts = np.asarray(pts, dtype=np.float64)[:, :2]
+    return np.concatenate((pts, np.zeros((len(pts), 1))), axis=1)
+
+
+def _polyhedron(node):
+    pts = np.asarray(node.points, dtype=np.float64)
+    if pts.size == 0:
+        return None
+    return pts.reshape(-1, 3)
+
+
+PRIMITIVES = {
+    "cube": _cube,
+    "sphere": _sphere,
+    "cylinder": _cylinder,
+    "circle": _circle,
+    "square": _square,
+    "polygon": _polygon,
+    "polyhedron": _polyhedron,
+}
+
+
+# -----------------------------
+# Transforms
+# -----------------------------
+
+def transform_matrix(node):
+    """ 4x4 matrix of a transform node, None if not a transform """
+    t = node.node_type
+    p = node.params
+    m = np.identity(4)
+    if t == "multmatrix":
+        m = np.asarray(p.get("matrix"), dtype=np.float64)
+    elif t == "translate":
+        m[:3, 3] = _vector(p.get("v", 0), 3)
+    elif t == "scale":
+        m[:3, :3] = np.diag(_vector(p.get("v", 1), 3))
+    elif t == "rotate":
+        a = p.get("a", 0)
+        v = p.get("v")
+        if isinstance(a, (list, tuple)):
+            # Euler X then Y then Z, as OpenSCAD
+            ax, ay, az = (math.radians(x) for x in _vector(a, 3))
+            rx = np.array([[1, 0, 0], [0, math.cos(ax), -math.sin(ax)], [0, math.sin(ax), math.cos(ax)]])
+            ry = np.array([[math.cos(ay), 0, math.sin(ay)], [0, 1, 0], [-math.sin(ay), 0, math.cos(ay)]])
+            rz = np.array([[math.cos(az), -math.sin(az), 0], [math.sin(az), math.cos(az), 0], [0, 0, 1]])
+            m[:3, :3] = rz @ ry @ rx
+        else:
+            axis = np.asarray(_vector(v if v is not None else [0, 0, 1], 3))
+            axis = axis / np.linalg.norm(axis)
+            angle = math.radians(float(a))
+            k = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+            m[:3, :3] = np.identity(3) + math.sin(angle) * k + (1 - math.cos(angle)) * (k @ k)
+    else:
+        return None
+    if m.shape != (4, 4):
+        return None
+    return m
+
+
+def _extrude(node):
+    p = node.params
+    if abs(_num(p, "twist", 0)) > 0:
+        return None
+    profile = node_points_list(node.children, np.identity(4))
+    if profile is None or len(profile) == 0:
+        return None
+    h = _num(p, "height", 100)
+    z1, z2 = (-h / 2, h / 2) if normalizeBool(p.get("center", False)) else (0.0, h)
+    sx, sy = _vector(p.get("scale", 1), 2)
+    bottom = profile.copy()
+    bottom[:, 2] = z1
+    top = profile * [sx, sy, 0]
+    top[:, 2] = z2
+    return np.concatenate((bottom, top))
+
+
+# -----------------------------
+# Public
+# -----------------------------
+
+def node_points(node, matrix=None):
+    """
+    Vertices of node's geometry as (N, 3) array, transformed by matrix.
+    None if the subtree can not be sampled.
+    """
+    t = node.node_type
+    if matrix is None:
+        matrix = np.identity(4)
+
+    if t in PRIMITIVES:
+        pts = PRIMITIVES[t](node)
+    elif t in PASS_THROUGH:
+        return node_points_list(node.children, matrix)
+    elif t == "linear_extrude":
+        pts = _extrude(node)
+    else:
+        m = transform_matrix(node)
+        if m is None:
+            return None
+        return node_points_list(node.children, matrix @ m)
+
+    if pts is None:
+        return None
+    return pts @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def node_points_list(nodes, matrix=None):
+    out = []
+    for child in nodes:
+        pts = node_points(child, matrix)
+        if pts is None:
+            return None
+        out.append(pts)
+    if not out:
+        return np.zeros((0, 3))
+    return np.concatenate(out)
+
+
+def hull_points(node):
+    """ Vertices the hull of node's children is built from, or None """
+    return node_points_list(node.children)
+
+
+def _box_corners(lo, hi):
+    return np.array([
+        [x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])
+    ])
+
+
+def node_bounds(node, matrix=None):
+    """
+    Axis aligned (lo, hi) enclosing node's geometry, transformed by matrix.
+    Minkowski boxes add up, hull / group / union are bounded by their
+    children. None if some part can not be sampled.
+    """
+    if matrix is None:
+        matrix = np.identity(4)
+    t = node.node_type
+
+    if t == "minkowski":
+        boxes = [node_bounds(child) for child in node.children]
+        if not boxes or any(box is None for box in boxes):
+            return None
+        lo = np.sum([box[0] for box in boxes], axis=0)
+        hi = np.sum([box[1] for box in boxes], axis=0)
+        pts = _box_corners(lo, hi) @ matrix[:3, :3].T + matrix[:3, 3]
+        return pts.min(axis=0), pts.max(axis=0)
+
+    if t in PASS_THROUGH or (t not in PRIMITIVES and t != "linear_extrude"):
+        if t not in PASS_THROUGH:
+            m = transform_matrix(node)
+            if m is None:
+                return None
+            matrix = matrix @ m
+        boxes = [node_bounds(child, matrix) for child in node.children]
+        if not boxes or any(box is None for box in boxes):
+            return None
+        return (
+            np.min([box[0] for box in boxes], axis=0),
+            np.max([box[1] for box in boxes], axis=0),
+        )
+
+    pts = node_points(node, matrix)
+    if pts is None or len(pts) == 0:
+        return None
+    return pts.min(axis=0), pts.max(axis=0)
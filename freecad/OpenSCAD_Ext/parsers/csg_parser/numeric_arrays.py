@@ -0,0 +1,116 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Scanner for large numeric CSG arrays ( polyhedron points / faces )     *
+#*                                                                          *
+#*   Parses the raw parameter text straight into numpy arrays instead of    *
+#*   ast.literal_eval nested lists :                                        *
+#*       points        float64 (N, 3)                                       *
+#*       face_indices  int32 flat index buffer                              *
+#*       face_offsets  int32 (F + 1), face i = indices[off[i]:off[i+1]]     *
+#*   ( same layout as core/mesh_io.py )                                     *
+#****************************************************************************
+import ast
+import re
+
+import numpy as np
+
+from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+
+# key = value, only matches outside the numeric arrays ( they hold no "=" )
+_KEY_RE = re.compile(r"([A-Za-z_$][A-Za-z0-9_$]*)\s*=")
+
+_NO_BRACKETS = str.maketrans("[]", "  ")
+
+
+def keyword_spans(raw):
+    """
+    Raw value text of every top level keyword argument, {key: text}.
+    Only str.count / regex over the text, no per character Python loop.
+    """
+    found = []
+    for m in _KEY_RE.finditer(raw):
+        start = m.start()
+        depth = raw.count("[", 0, start) - raw.count("]", 0, start)
+        if depth == 0:
+            found.append((m.group(1), m.start(), m.end()))
+
+    spans = {}
+    for i, (key, _start, value_start) in enumerate(found):
+        end = found[i + 1][1] if i + 1 < len(found) else len(raw)
+        value = raw[value_start:end].strip()
+        if value.endswith(","):
+            value = value[:-1].rstrip()
+        spans[key] = value
+    return spans
+
+
+def parse_points(text, dim=3):
+    """ "[[x,y,z],...]" → float64 (N, dim) """
+    groups = text.count("[") - 1
+    if groups <= 0:
+        return np.zeros((0, dim))
+    try:
+        values = np.fromstring(text.translate(_NO_BRACKETS), dtype=np.float64, sep=",")
+    except ValueError:
+        # numpy >= 2 raises on text it can not read to the end
+        values = None
+    if values is None or len(values) != groups * dim:
+        write_log("CSG_PARSE", "Point array not uniform, using literal_eval")
+        return np.asarray(ast.literal_eval(text), dtype=np.float64).reshape(-1, dim)
+    return values.reshape(groups, dim)
+
+
+def parse_faces(text):
+    """
+    "[[a,b,c],[d,e,f,g],...]" → (indices int32, offsets int32)
+    Every "]" becomes a -1 sentinel marking the end of a face.
+    """
+    groups = text.count("[") - 1
+    if groups <= 0:
+        return np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int32)
+
+    flat = text.replace("[", " ").replace("]", ",-1")
+    try:
+        values = np.fromstring(flat, dtype=np.int64, sep=",")
+        ends = np.flatnonzero(values == -1)
+    except ValueError:
+        # numpy >= 2 raises on text it can not read to the end
+        ends = None
+
+    # last sentinel closes the outer list
+    if ends is None or len(ends) != groups + 1:
+        write_log("CSG_PARSE", "Face array not flat integers, using literal_eval")
+        faces = ast.literal_eval(text)
+        sizes = np.array([len(f) for f in faces], dtype=np.int32)
+        indices = np.array([int(i) for f in faces for i in f], dtype=np.int32)
+    else:
+        ends = ends[:-1]
+        sizes = np.diff(np.concatenate(([-1], ends))) - 1
+        indices = values[values != -1].astype(np.int32)
+
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int32)
+    np.cumsum(sizes, out=offsets[1:])
+    return indices, offsets
+
+
+def parse_polyhedron_params(raw):
+    """
+    polyhedron(points = ..., faces = ..., convexity = ...) raw text
+    → dict with points, face_indices, face_offsets, convexity
+    """
+    spans = keyword_spans(raw or "")
+    # older OpenSCAD versions write triangles = instead of faces =
+    faces_text = spans.get("faces", spans.get("triangles", "[]"))
+
+    params = {
+        "points": parse_points(spans.get("points", "[]")),
+        "convexity": None,
+    }
+    params["face_indices"], params["face_offsets"] = parse_faces(faces_text)
+
+    if "convexity" in spans:
+        try:
+            params["convexity"] = ast.literal_eval(spans["convexity"])
+        except Exception:
+            params["convexity"] = spans["convexity"]
+    return params
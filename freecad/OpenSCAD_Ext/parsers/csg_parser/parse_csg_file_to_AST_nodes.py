@@ -10,12 +10,15 @@ Usage:
 #import FreeCAD
 import re
 import ast
+import mmap
+import sys
 from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
 from freecad.OpenSCAD_Ext.parsers.csg_parser.ast_nodes import AstNode, Cube, Sphere, Cylinder, Union, Difference, Intersection
 from freecad.OpenSCAD_Ext.parsers.csg_parser.ast_nodes import Group, Translate, Rotate, Scale, MultMatrix, Hull, Minkowski
 from freecad.OpenSCAD_Ext.parsers.csg_parser.ast_nodes import LinearExtrude, RotateExtrude, Text, Color, Polyhedron, UnknownNode
 
 from freecad.OpenSCAD_Ext.parsers.csg_parser.process_polyhedron import process_polyhedron
+from freecad.OpenSCAD_Ext.parsers.csg_parser.numeric_arrays import parse_polyhedron_params
 
 # --- parse_scad_argument and parse_csg_params assumed defined here ---
 
@@ -234,7 +237,7 @@ def parse_csg_params(param_str):
         if "=" in tok:
             # keyword argument
             key, val = tok.split("=", 1)
-            key = key.strip()
+            key = sys.intern(key.strip())
             val = val.strip()
 
             try:
@@ -340,180 +343,356 @@ def parse_csg_node_header(line):
     return node_type, raw_csg_params, opens_block
 '''
 
-def parse_csg_lines(lines, start=0, indent=0):
+NODE_CLASSES = {
+    "cube": Cube,
+    "sphere": Sphere,
+    "cylinder": Cylinder,
+    "union": Union,
+    "difference": Difference,
+    "intersection": Intersection,
+    "group": Group,
+    "translate": Translate,
+    "rotate": Rotate,
+    "scale": Scale,
+    "multmatrix": MultMatrix,
+    "hull": Hull,
+    "minkowski": Minkowski,
+    "linear_extrude": LinearExtrude,
+    "rotate_extrude": RotateExtrude,
+    "text": Text,
+    "color": Color,
+    "polyhedron": Polyhedron,
+}
+
+
+def parse_node_params(node_type, raw_csg_params):
     """
-    Recursively parse CSG lines into AST nodes.
+    Typed params of one node from its raw parameter text.
+    Called at parse time, or on first access of AstNode.params
+    for nodes parsed from a file.
+    """
+    # ---- Parse parameters ( polyhedron arrays are scanned separately )
+    try:
+        if node_type == "polyhedron":
+            params, csg_positional = {}, None
+        else:
+            params, csg_positional = parse_csg_params(raw_csg_params)
+    except Exception as e:
+        write_log("CSG_PARSE", f"Failed to parse params for '{node_type}': {e}")
+        params = {}
+        csg_positional = None
+
+    # ---- Special handling: cube positional size
+    if node_type == "cube":
+        if "size" not in params:
+            params["size"] = csg_positional if csg_positional is not None else 1
+        params.setdefault("center", False)
+
+    elif node_type == "multmatrix":
+        try:
+            params["matrix"] = ast.literal_eval(raw_csg_params)
+        except Exception as e:
+            write_log(
+                "CSG_PARSE",
+                f"Failed to evaluate multmatrix params: {raw_csg_params} -> {e}"
+            )
+            params["matrix"] = [
+                [1, 0, 0, 0],
+                [0, 1, 0, 0],
+                [0, 0, 1, 0],
+                [0, 0, 0, 1],
+            ]
+
+    elif node_type == "polyhedron":
+        # numpy arrays straight from the raw text
+        try:
+            params.update(parse_polyhedron_params(raw_csg_params))
+        except Exception as e:
+            write_log("CSG_PARSE", f"Failed to parse polyhedron arrays: {e}")
 
-    Parsing happens first (params, children).
+    return params
+
+
+def build_ast_node(node_type, raw_csg_params, children, lazy=False):
+    """
+    Construct the AST node of one parsed statement.
+
+    Parsing happens first (params, children), unless lazy : params are
+    then parsed on first access ( see AstNode.set_source ).
     AST nodes are constructed in ONE place using NODE_CLASSES.
 
     "Special" constructors are used only when the AST class
     requires extracted or transformed parameters.
     """
-    nodes = []
-    i = start
-
-    NODE_CLASSES = {
-        "cube": Cube,
-        "sphere": Sphere,
-        "cylinder": Cylinder,
-        "union": Union,
-        "difference": Difference,
-        "intersection": Intersection,
-        "group": Group,
-        "translate": Translate,
-        "rotate": Rotate,
-        "scale": Scale,
-        "multmatrix": MultMatrix,
-        "hull": Hull,
-        "minkowski": Minkowski,
-        "linear_extrude": LinearExtrude,
-        "rotate_extrude": RotateExtrude,
-        "text": Text,
-        "color": Color,
-        "polyhedron": Polyhedron,
-    }
-
-    while i < len(lines):
-        line = lines[i].strip()
-
-        # ---- End of block
-        if line.startswith("}") or line.startswith(");"):
-            return nodes, i + 1
-
-        # ---- Skip empty / comment
-        if not line or line.startswith("//"):
-            i += 1
-            continue
+    params = None if lazy else parse_node_params(node_type, raw_csg_params)
+
+    # ---- Determine AST class
+    cls = NODE_CLASSES.get(node_type)
+
+    if cls is None:
+        write_log("CSG_PARSE", f"Unknown node '{node_type}', preserving as UnknownNode")
+        node = UnknownNode(
+            node_type=node_type,
+            params=params,
+            csg_params=raw_csg_params,
+            children=children
+        )
+    else:
+        try:
+            # ---- Special constructors (signature differs)
 
-        # ---- Parse node header
-        node_type, raw_csg_params, opens_block = parse_csg_node_header(line)
-        if node_type is None:
-            write_log("CSG_PARSE", f"Skipping unrecognized line: {line}")
-            i += 1
-            continue
+            if node_type in ("translate", "scale", "rotate"):
+                node = cls(
+                    vector=(params or {}).get("vector"),
+                    angle=(params or {}).get("angle"),
+                    children=children,
+                    params=params,
+                    csg_params=raw_csg_params
+                )
 
-        node_type = node_type.lower()
-        children = []
-        next_i = i + 1
+            elif node_type in ("linear_extrude", "rotate_extrude", "multmatrix", "polyhedron"):
+                node = cls(
+                    children=children,
+                    params=params,
+                    csg_params=raw_csg_params
+                )
 
-        # ---- Parse children if block
-        if opens_block:
-            children, next_i = parse_csg_lines(lines, i + 1, indent + 1)
+            # ---- Normal constructor path
+            else:
+                node = cls(
+                    params=params,
+                    csg_params=raw_csg_params,
+                    children=children
+                )
 
-        # ---- Parse parameters
-        try:
-            params, csg_positional = parse_csg_params(raw_csg_params)
-        except Exception as e:
-            write_log("CSG_PARSE", f"Failed to parse params for '{node_type}': {e}")
-            params = {}
-            csg_positional = None
-
-        # ---- Special handling: cube positional size
-        if node_type == "cube":
-            if "size" not in params:
-                params["size"] = csg_positional if csg_positional is not None else 1
-            params.setdefault("center", False)
-
-        # ---- Determine AST class
-        cls = NODE_CLASSES.get(node_type)
-
-        if cls is None:
-            write_log("CSG_PARSE", f"Unknown node '{node_type}', preserving as UnknownNode")
-            node = UnknownNode(
+        except TypeError as e:
+            write_log(
+                "CSG_PARSE",
+                f"Constructor mismatch for '{node_type}', using AstNode fallback: {e}"
+            )
+            node = AstNode(
                 node_type=node_type,
                 params=params,
                 csg_params=raw_csg_params,
                 children=children
             )
+
+    return node
+
+
+# -------------------------------------------------
+# Streaming statement tokenizer
+# -------------------------------------------------
+# Statements end with "{" ( opens a block ), ";" ( leaf ) or "}" ( closes
+# a block ). Delimiters inside string literals ( text("a;b") ) are skipped,
+# "//" starts a comment, statements may span several lines.
+STATEMENT_DELIM_RE = re.compile(rb'"(?:[^"\\\n]|\\.)*"|//|[{};]')
+# fast path for lines without strings or comments
+PLAIN_DELIM_RE = re.compile(rb'[{};]')
+
+
+def iter_csg_statements(lines):
+    """
+    Yield (statement, delimiter, span) from an iterable of byte or str
+    lines, without holding more than the current statement in memory.
+    span is the (start, end) byte range of the statement in the input,
+    None if a comment had to be cut out of it.
+    """
+    pending = []
+    pending_start = 0
+    dirty = False
+    offset = 0
+    for line in lines:
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+
+        # ---- Leftover without a parameter list is not a statement
+        if pending and not any(b"(" in piece for piece in pending):
+            text = b"".join(pending).decode("utf-8", errors="replace").strip()
+            write_log("CSG_PARSE", f"Skipping unrecognized line: {text}")
+            pending = []
+            dirty = False
+
+        pos = 0
+        end = len(line)
+        plain = b'"' not in line and b"//" not in line
+        delim_re = PLAIN_DELIM_RE if plain else STATEMENT_DELIM_RE
+        for m in delim_re.finditer(line):
+            delim = m.group()
+            if delim == b"//":
+                end = m.start()     # comment to end of line
+                break
+            if len(delim) > 1:
+                continue    # string literal
+            if not pending:
+                pending_start = offset + pos
+            pending.append(line[pos:m.start()])
+            span = None if dirty else (pending_start, offset + m.start())
+            pos = m.end()
+            yield b"".join(pending).decode("utf-8", errors="replace").strip(), delim.decode(), span
+            pending = []
+            dirty = False
+        rest = line[pos:end]
+        if rest.strip():
+            if not pending:
+                pending_start = offset + pos
+            pending.append(rest)
+        if pending and end < len(line):
+            dirty = True
+        offset += len(line)
+
+    if pending:
+        text = b"".join(pending).decode("utf-8", errors="replace").strip()
+        write_log("CSG_PARSE", f"Unterminated statement at end of file: {text[:80]}")
+
+
+PAREN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[()]')
+PLAIN_PAREN_RE = re.compile(r'[()]')
+
+
+def split_csg_statement(statement):
+    """
+    Split a statement into its node headers, [(node_type, raw_csg_params)].
+    Usually one header; braceless chains such as
+    linear_extrude(height = 10) multmatrix(...) text("Hello")
+    give one header per nested node, outermost first.
+    """
+    headers = []
+    rest = statement
+    while rest:
+        m = NODE_HEADER_RE.match(rest)
+        if not m:
+            break
+        node_type = m.group("name").lower()
+        pos = m.end()
+        while pos < len(rest) and rest[pos].isspace():
+            pos += 1
+
+        raw_csg_params = None
+        if pos < len(rest) and rest[pos] == "(":
+            # matching ")" : only parentheses and strings are visited
+            level = 0
+            close = len(rest)
+            paren_re = PAREN_RE if '"' in rest else PLAIN_PAREN_RE
+            for m in paren_re.finditer(rest, pos):
+                c = m.group()
+                if c == "(":
+                    level += 1
+                elif c == ")":
+                    level -= 1
+                    if level == 0:
+                        close = m.start()
+                        break
+            raw_csg_params = rest[pos + 1:close].strip()
+            pos = close + 1
+
+        headers.append((node_type, raw_csg_params))
+        rest = rest[pos:].strip()
+
+    if rest:
+        write_log("CSG_PARSE", f"Ignoring trailing text in statement: {rest}")
+    return headers
+
+
+def _statement_source(source, span):
+    """
+    Own copy of one statement's bytes, nodes must not keep the whole
+    input buffer ( an open mmap ) alive. Returns (bytes, span into it)
+    """
+    if source is None or span is None:
+        return None, None
+    return bytes(source[span[0]:span[1]]), (0, span[1] - span[0])
+
+
+def _build(node_type, raw_csg_params, children, source, span, header):
+    if source is None or span is None:
+        return build_ast_node(node_type, raw_csg_params, children)
+    # raw text stays in the statement bytes, params parsed on demand
+    node = build_ast_node(node_type, raw_csg_params, children, lazy=True)
+    node.set_source(source, (span[0], span[1], header))
+    return node
+
+
+def _wrap(headers, node, source=None, span=None):
+    """ Nest node inside the braceless wrapper headers ( innermost last ) """
+    for header in range(len(headers) - 1, -1, -1):
+        node_type, raw_csg_params = headers[header]
+        node = _build(node_type, raw_csg_params, [node], source, span, header)
+    return node
+
+
+def parse_csg_lines(lines, start=0, indent=0, source=None):
+    """
+    Parse CSG lines ( or any iterable of lines ) into AST nodes.
+
+    Iterative : open blocks are kept on an explicit stack, so nesting
+    depth is not limited by Python's recursion limit.
+
+    source : buffer the lines were read from ( bytes / mmap ), nodes
+    then keep their statement's bytes instead of raw parameter strings
+    and the buffer can be closed once parsing is done.
+
+    Returns (nodes, index of the line after the last one consumed)
+    """
+    if start:
+        lines = lines[start:]
+
+    consumed = [start]
+
+    def counted(lines):
+        for line in lines:
+            consumed[0] += 1
+            yield line
+
+    root = []
+    # open blocks : (node_type, raw_csg_params, children, wrappers, (bytes, span))
+    stack = []
+    children = root
+
+    def close_block():
+        node_type, raw_csg_params, block, wrappers, (text, span) = stack.pop()
+        parent = stack[-1][2] if stack else root
+        node = _build(node_type, raw_csg_params, block, text, span, len(wrappers))
+        parent.append(_wrap(wrappers, node, text, span))
+        return parent
+
+    for statement, delim, span in iter_csg_statements(counted(lines)):
+
+        if delim == "}":
+            if statement:
+                write_log("CSG_PARSE", f"Skipping unrecognized statement: {statement}")
+            if not stack:
+                write_log("CSG_PARSE", "Unbalanced '}' ignored")
+                continue
+            children = close_block()
+            continue
+
+        # ---- Skip empty statements ( e.g. ";" after "}" )
+        if not statement:
+            continue
+
+        # ---- Parse node header(s)
+        headers = split_csg_statement(statement)
+        if not headers:
+            write_log("CSG_PARSE", f"Skipping unrecognized line: {statement}")
+            continue
+        node_type, raw_csg_params = headers[-1]
+        wrappers = headers[:-1]
+        text, text_span = _statement_source(source, span)
+
+        if delim == "{":
+            stack.append((node_type, raw_csg_params, [], wrappers, (text, text_span)))
+            children = stack[-1][2]
         else:
-            try:
-                # ---- Special constructors (signature differs)
-
-                if node_type in ("translate", "scale", "rotate"):
-                    node = cls(
-                        vector=params.get("vector"),
-                        angle=params.get("angle"),
-                        children=children,
-                        params=params,
-                        csg_params=raw_csg_params
-                    )
-
-                elif node_type in ("linear_extrude", "rotate_extrude"):
-                    node = cls(
-                        children=children,
-                        params=params,
-                        csg_params=raw_csg_params
-                    )
-
-                elif node_type == "multmatrix":
-                    try:
-                        params["matrix"] = ast.literal_eval(raw_csg_params)
-                    except Exception as e:
-                        write_log(
-                            "CSG_PARSE",
-                            f"Failed to evaluate multmatrix params: {raw_csg_params} -> {e}"
-                        )
-                        params["matrix"] = [
-                            [1, 0, 0, 0],
-                            [0, 1, 0, 0],
-                            [0, 0, 1, 0],
-                            [0, 0, 0, 1],
-                        ]
-                    node = cls(
-                        children=children,
-                        params=params,
-                        csg_params=raw_csg_params
-                    )
-
-                elif node_type == "polyhedron":
-                    # split top-level commas safely
-                    poly_params = {}
-                    parts = split_top_level_commas(raw_csg_params)
-                    for p in parts:
-                        if "=" not in p:
-                            continue
-                        key, val = p.split("=", 1)
-                        key = key.strip()
-                        val = val.strip()
-                        try:
-                            parsed_val = ast.literal_eval(val)
-                        except Exception as e:
-                            write_log("CSG_PARSE", f"Failed to eval polyhedron param {p}: {e}")
-                            parsed_val = val
-                        poly_params[key] = parsed_val
-
-                    # add structured attributes inside params
-                    params["points"] = poly_params.get("points", [])
-                    params["faces"] = poly_params.get("faces", [])
-                    params["convexity"] = poly_params.get("convexity")
-
-                    node = cls(children=children, params=params, csg_params=raw_csg_params)
-
-                # ---- Normal constructor path
-                else:
-                    node = cls(
-                        params=params,
-                        csg_params=raw_csg_params,
-                        children=children
-                    )
-
-            except TypeError as e:
-                write_log(
-                    "CSG_PARSE",
-                    f"Constructor mismatch for '{node_type}', using AstNode fallback: {e}"
-                )
-                node = AstNode(
-                    node_type=node_type,
-                    params=params,
-                    csg_params=raw_csg_params,
-                    children=children
-                )
+            node = _build(node_type, raw_csg_params, [], text, text_span, len(wrappers))
+            children.append(_wrap(wrappers, node, text, text_span))
 
-        nodes.append(node)
-        i = next_i
+    # ---- Blocks left open at end of input
+    while stack:
+        write_log("CSG_PARSE", f"Unclosed block '{stack[-1][0]}' at end of file")
+        close_block()
 
-    return nodes, i
+    return root, consumed[0]
 
 
 # -------------------------------------------------
@@ -522,14 +701,22 @@ def parse_csg_lines(lines, start=0, indent=0):
 def parse_csg_file_to_AST_nodes(filename):
     """
     Reads a .csg file and returns a list of AstNode objects
+    ( streamed line by line, the file is never read as a whole )
     """
     write_log("CSG_PARSE", f"Parsing CSG file: {filename}")
-    with open(filename, "r") as f:
-        lines = f.readlines()
-    nodes, _ = parse_csg_lines(lines, start=0)
+    with open(filename, "rb") as f:
+        try:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            return []
+        # nodes copy their statements, the map is closed before returning
+        # so the file can be removed ( Windows ) while nodes are alive
+        with source:
+            nodes, _ = parse_csg_lines(iter(source.readline, b""), source=source)
     write_log("CSG_PARSE", f"Parsed {len(nodes)} top-level nodes")
     
     # write_log("AST","Dump of AST Tree")
     # dump_ast_tree(nodes[0])
 
-    return nodes
\ No newline at end of file
+    return nodes
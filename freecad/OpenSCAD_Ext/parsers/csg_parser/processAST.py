@@ -12,8 +12,13 @@ Placement() = identity
 Placement is always applied last, never baked unless required
 '''
 import os
+import hashlib
 import subprocess
 import tempfile
+import threading
+
+import numpy as np
+
 import FreeCAD
 import Part
 import Mesh
@@ -52,6 +57,42 @@ from freecad.OpenSCAD_Ext.parsers.csg_parser.ast_nodes import (
 )
 
 from freecad.OpenSCAD_Ext.parsers.csg_parser.process_polyhedron import process_polyhedron 
+from freecad.OpenSCAD_Ext.core.brep_cache import (
+    fallback_cache,
+    canonical_scad,
+    openscad_version_key,
+    openscad_render_key,
+)
+from freecad.OpenSCAD_Ext.core.OpenSCADUtils import binarystlsupported, openscadbackendargs
+from freecad.OpenSCAD_Ext.core.openscad_pool import fallback_pool, shutdown_pool, worker_count
+from freecad.OpenSCAD_Ext.core.openscad_runner import openscad_runner
+from freecad.OpenSCAD_Ext.core.scratch import scratch_path, release
+from freecad.OpenSCAD_Ext.core.scad_dependencies import absolute_files
+from freecad.OpenSCAD_Ext.core.mesh_io import (
+    read_mesh,
+    read_stl_triangles,
+    write_stl_triangles,
+    mesh_to_shape,
+    is_closed as mesh_is_closed,
+)
+from freecad.OpenSCAD_Ext.core.facet_merge import merged_shape_from_mesh
+from freecad.OpenSCAD_Ext.core.polyhedron_mesh import polyhedron_shape
+from freecad.OpenSCAD_Ext.core.quickhull import (
+    hull_mesh,
+    hull_shape_from_mesh,
+    hull_shape_from_points,
+)
+from freecad.OpenSCAD_Ext.parsers.csg_parser.hull_points import (
+    hull_points,
+    node_bounds,
+    transform_matrix,
+)
+from freecad.OpenSCAD_Ext.parsers.csg_parser.parse_csg_file_to_AST_nodes import normalizeBool
+from freecad.OpenSCAD_Ext.core.bound_box import (
+    boxes_all_touch,
+    touching,
+    overlap_clusters,
+)
 
 
 
@@ -70,9 +111,10 @@ class OpenSCADError(BaseError):
         return repr(self.value)
 
 
-def generate_stl_from_scad(scad_str, timeout_sec=60):
+def generate_stl_from_scad(scad_str, timeout_sec=60, binary=True):
     """
     Generate STL from a SCAD string using the Workbench-configured OpenSCAD executable.
+    binary=False keeps ASCII STL, its coordinates are not rounded to float32.
     Returns path to STL on success, None on error/timeout.
     """
     # Get OpenSCAD path from FreeCAD preferences
@@ -83,29 +125,29 @@ def generate_stl_from_scad(scad_str, timeout_sec=60):
         write_log("OpenSCAD", f"OpenSCAD executable not configured or invalid: {openscad_exe}")
         return None
 
-    # Create temp SCAD file
-    with tempfile.NamedTemporaryFile(suffix=".scad", delete=False) as scad_file:
-        scad_file_path = scad_file.name
-        scad_file.write(scad_str.encode("utf-8"))
-        scad_file.flush()
-
     # STL output path
-    stl_path = scad_file_path.replace(".scad", ".stl")
+    stl_path = scratch_path(".stl", prefix="fallback-")
 
-    # OpenSCAD CLI command
-    cmd = [openscad_exe, "-o", stl_path, scad_file_path]
+    # binary STL when OpenSCAD supports it
+    args = openscadbackendargs(openscad_exe)
+    if binary and binarystlsupported(openscad_version_key(openscad_exe)):
+        args += ["--export-format", "binstl"]
 
-    write_log("OpenSCAD", f"Running: {' '.join(cmd)}")
+    write_log("OpenSCAD", f"Running: {openscad_exe} {' '.join(args)} -o {stl_path}")
 
-    try:
-        subprocess.run(cmd, timeout=timeout_sec, check=True)
+    # fallback SCAD is generated from the AST, no includes, relative
+    # import() files were made absolute by _with_base_dir
+    result = openscad_runner().render_string(
+        openscad_exe, scad_str, stl_path, args=args, timeout=timeout_sec)
+    if result.timed_out:
+        write_log("OpenSCAD", f"Timeout after {timeout_sec}s")
+    elif result.returncode != 0:
+        write_log("OpenSCAD", f"OpenSCAD error ({result.returncode}): {result.stderr.strip()}")
+    else:
         write_log("OpenSCAD", f"Generated STL: {stl_path}")
         return stl_path
-    except subprocess.TimeoutExpired:
-        write_log("OpenSCAD", f"Timeout after {timeout_sec}s")
-    except subprocess.CalledProcessError as e:
-        write_log("OpenSCAD", f"OpenSCAD error: {e}")
 
+    release(stl_path)
     return None
 
 
@@ -178,9 +220,9 @@ import Part
 import Mesh
 import FreeCAD as App
 
-def stl_to_shape(stl_path, tolerance=0.05, timeout=None):
+def stl_to_shape(stl_path, tolerance=0.05):
     """
-    Import STL into FreeCAD and convert to Part.Shape.
+    Read STL ( binary or ASCII ) / OFF with numpy and convert to Part.Shape.
     Always attempts to return a Solid.
     Returns a Part.Shape or None on failure.
     """
@@ -195,25 +237,27 @@ def stl_to_shape(stl_path, tolerance=0.05, timeout=None):
             f"Importing STL and converting to Part.Shape: {stl_path}"
         )
 
-        # Load STL
-        mesh = Mesh.Mesh(stl_path)
-
-        # Instrumentation (API-safe)
-        try:
-            is_closed = mesh.isSolid()
-        except Exception:
-            is_closed = False
-
-        facets = getattr(mesh, "CountFacets", 0)
+        # Load STL / OFF straight into welded numpy arrays
+        vertices, indices, offsets = read_mesh(stl_path)
+        is_closed = mesh_is_closed(indices, offsets)
 
         write_log(
             "AST_Hull:Minkowski",
-            f"Mesh facets={facets}, solid={is_closed}"
+            f"Mesh facets={len(offsets) - 1}, solid={is_closed}"
         )
 
+        # Coplanar facets merged into polygon faces, no removeSplitter needed
+        if is_closed:
+            solid = merged_shape_from_mesh(vertices, indices, offsets)
+            if solid is not None and solid.ShapeType == "Solid":
+                write_log(
+                    "AST_Hull:Minkowski",
+                    f"Merged solid faces={len(solid.Faces)}, valid={solid.isValid()}"
+                )
+                return solid
+
         # Mesh → Shape (shell)
-        shape = Part.Shape()
-        shape.makeShapeFromMesh(mesh.Topology, tolerance)
+        shape = mesh_to_shape(vertices, indices, offsets, tolerance)
         shape = shape.removeSplitter()
 
         # Always attempt solid
@@ -270,8 +314,10 @@ def fallback_to_OpenSCAD(node, operation_type="Hull", tolerance=1.0, timeout=60)
     """
     Fallback processing for Hull / Minkowski nodes:
     - Uses flatten_hull_minkowski_node for OpenSCAD string
-    - Generates STL via OpenSCAD CLI
-    - Imports STL into FreeCAD with timeout
+    - Looks up the persistent BRep cache ( core/brep_cache.py )
+    - Generates STL via OpenSCAD CLI, or waits for the job
+      started by prefetch_fallbacks
+    - Imports STL into FreeCAD, timeout applies to the OpenSCAD run
     - Caches result in node._shape
     """
     # Return cached shape if already processed
@@ -282,15 +328,38 @@ def fallback_to_OpenSCAD(node, operation_type="Hull", tolerance=1.0, timeout=60)
     write_log(operation_type, f"{operation_type} fallback to OpenSCAD")
 
     # Flatten node to SCAD string
-    scad_str = flatten_hull_minkowski_node(node, indent=4)
+    scad_str = getattr(node, "_fallback_scad", None)
+    if scad_str is None:
+        scad_str = _with_base_dir(flatten_hull_minkowski_node(node, indent=4))
     write_log("CSG", scad_str)
 
+    # Persistent cache : same SCAD + OpenSCAD version + tolerance → same shape
+    cache = fallback_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key(canonical_scad(scad_str), openscad_render_key(), tolerance)
+        shape = cache.get(cache_key)
+        if shape is not None:
+            write_log(operation_type, f"BRep cache hit {cache_key[:12]}")
+            node._shape = shape
+            return shape
+
     # Generate STL via OpenSCAD CLI
-    stl_file = generate_stl_from_scad(scad_str)
+    future = getattr(node, "_stl_future", None)
+    if future is not None:
+        # removed by release_fallback_files, repeated subtrees share it
+        stl_file = future.result()
+    else:
+        stl_file = generate_stl_from_scad(scad_str, timeout)
+
 
+    # Import STL with tolerance
+    shape = stl_to_shape(stl_file, tolerance=tolerance)
+    if future is None:
+        release(stl_file)
 
-    # Import STL safely with timeout and tolerance
-    shape = stl_to_shape(stl_file, tolerance=tolerance, timeout=timeout)
+    if cache is not None and shape is not None:
+        cache.put(cache_key, shape)
 
     # Cache shape to prevent reprocessing
     node._shape = shape
@@ -298,26 +367,329 @@ def fallback_to_OpenSCAD(node, operation_type="Hull", tolerance=1.0, timeout=60)
 
     return shape
 
+# -----------------------------
+# Parallel fallback pre-pass
+# -----------------------------
+
+FALLBACK_TOLERANCE = 1.0
+
+# Nodes that only carry attributes, their geometry is their children's
+PASS_THROUGH = ("color", "render")
+
+
+def collect_fallback_nodes(nodes):
+    """
+    Outermost Hull / Minkowski nodes in tree order.
+    Nested ones are part of the outer node's flattened SCAD.
+    """
+    found = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (Hull, Minkowski)):
+            found.append(node)
+            continue
+        stack.extend(reversed(getattr(node, "children", [])))
+    return found
+
+
+def prefetch_fallbacks(nodes, pool):
+    """
+    Start OpenSCAD for every fallback bound subtree up front.
+    fallback_to_OpenSCAD picks the STL up from node._stl_future,
+    STL → Shape conversion stays on the calling thread in walk order.
+    """
+    cache = fallback_cache()
+    version = openscad_render_key() if cache is not None else None
+    submitted = 0
+    futures = {}    # scad text → nodes, repeated subtrees share one job
+    jobs = []       # (scad text, first node) in tree order
+
+    for node in collect_fallback_nodes(nodes):
+        if hasattr(node, "_shape") or hasattr(node, "_stl_future"):
+            continue
+
+        # Handled natively by try_hull, no OpenSCAD needed
+        if isinstance(node, Hull) and hull_points(node) is not None:
+            continue
+
+        scad_str = _with_base_dir(flatten_hull_minkowski_node(node, indent=4))
+        node._fallback_scad = scad_str
+
+        if cache is not None:
+            key = cache.key(canonical_scad(scad_str), version, FALLBACK_TOLERANCE)
+            if cache.contains(key):
+                continue
+
+        if scad_str not in futures:
+            futures[scad_str] = []
+            jobs.append((scad_str, node))
+        futures[scad_str].append(node)
+
+    for batch in fallback_batches(jobs):
+        if len(batch) == 1:
+            scad_str = batch[0][0]
+            future = submit_owned(pool, generate_stl_from_scad, scad_str)
+            for node in futures[scad_str]:
+                node._stl_future = future
+        else:
+            future = submit_owned(pool, generate_stl_batch, [(scad_str, box) for scad_str, box in batch])
+            for i, (scad_str, _box) in enumerate(batch):
+                for node in futures[scad_str]:
+                    node._stl_future = _SlotFuture(future, i)
+        submitted += 1
+
+    write_log("AST", f"Prefetch: {len(jobs)} OpenSCAD fallback(s) in {submitted} job(s)")
+    return submitted
+
+
+def release_fallback_files(nodes):
+    """ Remove the STL files of finished prefetch jobs once the walk is done """
+    for node in collect_fallback_nodes(nodes):
+        future = getattr(node, "_stl_future", None)
+        if future is None:
+            continue
+        del node._stl_future
+        try:
+            release(future.result())
+        except Exception:
+            # failed / cancelled job, nothing was written
+            pass
+
+
+# -----------------------------
+# Batched fallbacks
+# -----------------------------
+
+BATCH_GAP = 1.0
+
+
+class _SlotFuture:
+    """ One slot of a generate_stl_batch future, as seen by fallback_to_OpenSCAD """
+
+    def __init__(self, future, index):
+        self.future = future
+        self.index = index
+
+    def result(self):
+        return self.future.result()[self.index]
+
+
+def fallback_batches(jobs):
+    """
+    Group (scad text, node) jobs into OpenSCAD runs.
+    Subtrees without a bounding box estimate run alone, the others are
+    spread over at least one run per worker, at most fallbackBatchSize each.
+    Returns lists of (scad text, (lo, hi) or None)
+    """
+    size = FreeCAD.ParamGet(
+        "User parameter:BaseApp/Preferences/Mod/OpenSCAD"
+    ).GetInt("fallbackBatchSize", 8)
+
+    single, boxed = [], []
+    for scad_str, node in jobs:
+        box = node_bounds(node) if size > 1 else None
+        if box is None:
+            single.append([(scad_str, None)])
+        else:
+            boxed.append((scad_str, box))
+
+    if not boxed:
+        return single
+    runs = max(-(-len(boxed) // size), min(worker_count(), len(boxed)))
+    per_run = -(-len(boxed) // runs)
+    return single + [boxed[i:i + per_run] for i in range(0, len(boxed), per_run)]
+
+
+def generate_stl_batch(items, timeout_sec=60):
+    """
+    One OpenSCAD run for several independent subtrees.
+    items : [(scad text, (lo, hi))], each subtree is moved along X into
+    its own slot, separated by BATCH_GAP, and the STL is split back by
+    triangle centroid. ASCII STL, float32 binary STL would lose precision
+    in proportion to the slot offset.
+    If a slot is empty or has vertices outside its box ( ± BATCH_GAP / 2,
+    e.g. the estimate disagrees with OpenSCAD's tessellation ) triangles
+    may have gone to the wrong subtree, all subtrees then run one by one.
+    Returns one STL path ( or None ) per item
+    """
+    slots = []      # (shift, slot start, slot end)
+    cursor = 0.0
+    parts = []
+    for scad_str, (lo, hi) in items:
+        shift = cursor - float(lo[0])
+        slots.append((shift, cursor, cursor + float(hi[0] - lo[0])))
+        parts.append(f"translate([{shift!r}, 0, 0]) {{\n{scad_str}\n}}")
+        cursor = slots[-1][2] + BATCH_GAP
+
+    write_log("OpenSCAD", f"Batch of {len(items)} fallback subtrees")
+    stl_file = generate_stl_from_scad(
+        "\n".join(parts), timeout_sec * len(items), binary=False)
+    if stl_file is None:
+        write_log("OpenSCAD", "Batch failed, running subtrees one by one")
+        return [generate_stl_from_scad(scad_str, timeout_sec) for scad_str, _box in items]
+
+    try:
+        corners = read_stl_triangles(stl_file)
+    finally:
+        release(stl_file)
+
+    # slot i owns centroids up to the middle of the gap after it
+    limits = np.array([end + BATCH_GAP / 2 for _shift, _start, end in slots[:-1]])
+    owner = np.searchsorted(limits, corners[:, :, 0].mean(axis=1))
+
+    split = []
+    for i, ((shift, start, end), (_scad_str, (lo, hi))) in enumerate(zip(slots, items)):
+        tris = corners[owner == i]
+        box_lo = np.array([start, lo[1], lo[2]], dtype=np.float64) - BATCH_GAP / 2
+        box_hi = np.array([end, hi[1], hi[2]], dtype=np.float64) + BATCH_GAP / 2
+        pts = tris.reshape(-1, 3)
+        if len(tris) == 0 or np.any(pts < box_lo) or np.any(pts > box_hi):
+            write_log("OpenSCAD", f"Batch slot {i} outside its bounds, running subtrees one by one")
+            return [generate_stl_from_scad(scad_str, timeout_sec) for scad_str, _box in items]
+        tris[:, :, 0] -= shift
+        split.append(tris)
+
+    paths = []
+    for tris in split:
+        path = scratch_path(".stl", prefix="fallback-")
+        write_stl_triangles(path, tris)
+        paths.append(path)
+    return paths
+
+
 # -----------------------------
 # Hull / Minkowski native attempts
 # -----------------------------
 
 def try_hull(node):
     """
-    #Attempt to generate a native FreeCAD hull from children shapes.
+    #Attempt to generate a native FreeCAD hull from the children's vertices
+    #( sampled at their $fn, see hull_points.py ) with the numpy quickhull.
     #Returns Part.Shape or None if not possible.
     """
     write_log("AST","Try Hull")
-    return None
 
-    shapes = [process_AST_node(c) for c in node.children if process_AST_node(c)]
-    if len(shapes) < 2:
-        return None  # Need at least 2 shapes for hull
+    points = hull_points(node)
+    if points is None or len(points) < 3:
+        write_log("AST_Hull", "Children can not be sampled, falling back")
+        return None
 
-    # TODO: implement native FreeCAD convex hull
-    # Returning None for now to trigger OpenSCAD fallback
-    write_log("AST_Hull", "Native hull not implemented, falling back")
-    return None
+    try:
+        shape = hull_shape_from_points(points)
+    except Exception as e:
+        write_log("AST_Hull", f"Native hull failed, falling back: {e}")
+        return None
+
+    if shape is None:
+        write_log("AST_Hull", "Native hull degenerate, falling back")
+    return shape
+
+
+# -----------------------------
+# Chain hulls : union of hull(){a;b} hull(){b;c} ...
+# -----------------------------
+
+def subtree_key(node):
+    """
+    Structural hash of a subtree ( node type, raw parameters, children ).
+    Memoized on node._key, computed bottom up without recursion.
+    """
+    if hasattr(node, "_key"):
+        return node._key
+
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if hasattr(current, "_key"):
+            continue
+        if not expanded:
+            stack.append((current, True))
+            stack.extend((c, False) for c in current.children)
+            continue
+        h = hashlib.sha1()
+        h.update(current.node_type.encode("utf-8"))
+        h.update(str(current.csg_params).encode("utf-8"))
+        for child in current.children:
+            h.update(child._key.encode("ascii"))
+        current._key = h.hexdigest()
+    return node._key
+
+
+def chain_hull_segments(node):
+    """
+    Hull children of a union / group where consecutive hulls share
+    a child subtree ( sequential / chain hull ), or None.
+    """
+    hulls = []
+    for child in node.children:
+        while child.node_type == "group" and len(child.children) == 1:
+            child = child.children[0]
+        if not isinstance(child, Hull):
+            return None
+        hulls.append(child)
+
+    if len(hulls) < 2:
+        return None
+
+    for prev, nxt in zip(hulls, hulls[1:]):
+        shared = {subtree_key(c) for c in prev.children}
+        if not any(subtree_key(c) in shared for c in nxt.children):
+            return None
+    return hulls
+
+
+def _native_hull_mesh(node):
+    points = hull_points(node)
+    if points is None or len(points) < 3:
+        return None
+    return hull_mesh(points)
+
+
+def process_chain_hull(hulls):
+    """
+    Evaluate all segments concurrently then fuse them in one boolean.
+    Native segments run their numpy hull in the process_AST pool,
+    OpenSCAD bound ones were prefetched by process_AST, which also
+    releases their STL files once the whole tree is done ( segments
+    share them with identical hulls elsewhere ). OCC work stays on
+    this thread.
+    """
+    write_log("AST_Hull", f"Chain hull with {len(hulls)} segments")
+
+    run = _current_run()
+    native = {}
+    if run is not None:
+        native = {
+            id(h): run.pool.submit(_native_hull_mesh, h)
+            for h in hulls
+            if not hasattr(h, "_shape") and hull_points(h) is not None
+        }
+
+    shapes = []
+    for h in hulls:
+        shape = None
+        future = native.get(id(h))
+        build = future.result if future is not None else None
+        if build is None and run is None and not hasattr(h, "_shape") \
+                and hull_points(h) is not None:
+            # no process_AST pool, hull on this thread
+            build = lambda h=h: _native_hull_mesh(h)
+        if build is not None:
+            try:
+                shape = hull_shape_from_mesh(build())
+            except Exception as e:
+                write_log("AST_Hull", f"Native segment failed: {e}")
+        if shape is None:
+            shape = fallback_to_OpenSCAD(h, operation_type="Hull", tolerance=FALLBACK_TOLERANCE, timeout=60)
+        if shape is not None and not shape.isNull():
+            shapes.append(shape)
+
+    if not shapes:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+    return shapes[0].multiFuse(shapes[1:])
 
 
 def try_minkowski(node):
@@ -326,14 +698,10 @@ def try_minkowski(node):
     #Returns Part.Shape or None if not possible.
     """
     write_log("AST","Try Minkowski")
-    #return None
-
-    shapes = [process_AST_node(c) for c in node.children if process_AST_node(c)]
-    if len(shapes) != 2:
-        return None  # Minkowski sum requires exactly 2 shapes
 
     # TODO: implement native FreeCAD Minkowski sum
-    # Returning None for now to trigger OpenSCAD fallback
+    # Returning None for now to trigger OpenSCAD fallback, the children
+    # are not built : the fallback renders the whole subtree
     write_log("AST_Minkowski", "Native Minkowski not implemented, falling back")
     return None
 
@@ -342,6 +710,29 @@ def try_minkowski(node):
 # SCAD flattening (Hull / Minkowski fallback)
 # ============================================================
 
+def flatten_subtree(node, indent=4):
+    """
+    Subtree back to SCAD text, raw csg_params and all children.
+    CSG output is valid SCAD, so this renders exactly the same geometry.
+    """
+    lines = []
+    stack = [(node, indent, False)]
+    while stack:
+        current, depth, closing = stack.pop()
+        pad = " " * depth
+        if closing:
+            lines.append(f"{pad}}}")
+            continue
+        header = f"{pad}{current.node_type}({current.csg_params or ''})"
+        if not current.children:
+            lines.append(header + ";")
+            continue
+        lines.append(header + " {")
+        stack.append((current, depth, True))
+        stack.extend((c, depth + 4, False) for c in reversed(current.children))
+    return "\n".join(lines)
+
+
 def flatten_hull_minkowski_node(node, indent=0):
     pad = " " * indent
     scad_lines = []
@@ -490,6 +881,208 @@ def _as_list(result):
     return [result]
 
 
+# -----------------------------
+# Multi-operand booleans
+# -----------------------------
+# One OCC run per boolean node instead of a left fold of pairwise
+# operations. FreeCAD's boolean wrappers already run OCC in parallel mode.
+
+def fuse_all(shapes):
+    if not shapes:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+    return shapes[0].multiFuse(shapes[1:])
+
+
+def common_all(shapes):
+    """
+    Intersection of all shapes with one general fuse : keep the pieces
+    that belong to every argument.
+    """
+    if len(shapes) == 1:
+        return shapes[0]
+    if len(shapes) == 2:
+        return shapes[0].common(shapes[1])
+    try:
+        _pieces, mapping = shapes[0].generalFuse(shapes[1:])
+        common = [
+            piece for piece in mapping[0]
+            if all(any(piece.isSame(other) for other in m) for m in mapping[1:])
+        ]
+        return Part.makeCompound(common)
+    except Exception as e:
+        write_log("Boolean", f"generalFuse intersection failed, folding: {e}")
+        result = shapes[0]
+        for s in shapes[1:]:
+            result = result.common(s)
+        return result
+
+
+def union_disjoint(shapes):
+    """
+    Fuse only shapes whose bounding boxes touch, disjoint clusters
+    are returned as a plain compound ( no boolean needed ).
+    """
+    if len(shapes) <= 1:
+        return fuse_all(shapes)
+    clusters = overlap_clusters([s.BoundBox for s in shapes])
+    if len(clusters) == 1:
+        return fuse_all(shapes)
+    write_log("Boolean", f"Union: {len(shapes)} shapes in {len(clusters)} disjoint clusters")
+    return Part.makeCompound([fuse_all([shapes[i] for i in c]) for c in clusters])
+
+
+def boolean_multi(node_type, child_shapes):
+    """
+    child_shapes : list ( per child ) of lists of placed shapes
+    union        : multiFuse of bounding box clusters, compound of clusters
+    difference   : first child cut by all tools touching it in one call
+    intersection : common of the children, empty if their boxes are disjoint
+    """
+    if node_type == "union":
+        return union_disjoint([s for shapes in child_shapes for s in shapes])
+
+    if node_type == "difference":
+        base = union_disjoint(child_shapes[0])
+        if base is None:
+            return None
+        tools = [s for shapes in child_shapes[1:] for s in shapes]
+        keep = touching(base.BoundBox, [t.BoundBox for t in tools])
+        if len(keep) < len(tools):
+            write_log("Boolean", f"Difference: {len(tools) - len(keep)} tool(s) outside base dropped")
+        tools = [tools[i] for i in keep]
+        if not tools:
+            return base
+        return base.cut(tools)
+
+    if node_type == "intersection":
+        # intersection with an empty child is empty
+        if not all(child_shapes):
+            return None
+        operands = [union_disjoint(shapes) for shapes in child_shapes]
+        if not boxes_all_touch([s.BoundBox for s in operands]):
+            write_log("Boolean", "Intersection: disjoint bounding boxes, empty result")
+            return None
+        return common_all(operands)
+
+    return None
+
+
+# -----------------------------
+# Instancing of repeated subtrees
+# -----------------------------
+# Results of process_AST_node are in the node's local frame, enclosing
+# transforms only place them. Identical subtrees ( subtree_key ) are
+# therefore built once per process_AST run and reused, callers place
+# them with _placed() which shares the underlying TopoDS geometry.
+# Run state is per thread, concurrent process_AST calls do not share it.
+
+class _Run:
+    """ State of one process_AST call """
+
+    def __init__(self, pool, base_dir=None, fnmax=None):
+        self.pool = pool
+        self.base_dir = base_dir
+        self.fnmax = fnmax
+        self.instances = {}
+        self.failures = []  # node types OpenSCAD could not convert
+
+
+_local = threading.local()
+
+
+def _current_run():
+    return getattr(_local, "run", None)
+
+
+def _with_base_dir(scad_str):
+    """
+    Fallback SCAD runs from the scratch directory : relative import() /
+    surface() files resolve against the directory of the source instead
+    """
+    run = _current_run()
+    if run is None or not run.base_dir:
+        return scad_str
+    return absolute_files(scad_str, run.base_dir)
+
+
+def _fnmax():
+    """ useMaxFN of the run, else the preference """
+    run = _current_run()
+    if run is not None and run.fnmax is not None:
+        return run.fnmax
+    return FreeCAD.ParamGet(
+        "User parameter:BaseApp/Preferences/Mod/OpenSCAD").GetInt('useMaxFN', 16)
+
+
+def faceted_cylinder(r1, r2, h, n):
+    """
+    Cylinder / cone with n sides, OpenSCAD's own tessellation.
+    importAltCSG builds these as Part::Prism / Frustum for $fn <= useMaxFN.
+    """
+    a = np.arange(n) * (2 * np.pi / n)
+    ring = np.stack((np.cos(a), np.sin(a), np.zeros(n)), axis=1)
+    points = np.concatenate((ring * [r1, r1, 0], ring * [r2, r2, 0] + [0, 0, h]))
+    i = np.arange(n)
+    sides = np.stack((i, (i + 1) % n, n + (i + 1) % n, n + i), axis=1)
+    indices = np.concatenate((n - 1 - i, n + i, sides.ravel())).astype(np.int32)
+    offsets = np.concatenate(([0, n, 2 * n], 2 * n + 4 * (i + 1))).astype(np.int32)
+    # apex of a cone : the repeated points are merged, its faces dropped
+    return polyhedron_shape(points, indices, offsets, openscad_order=False)
+
+
+def _failed(node_type):
+    """ Node left out of the result, the rest of the tree still builds """
+    write_log("ERROR", f"{node_type} could not be converted by OpenSCAD, left out")
+    run = _current_run()
+    if run is not None:
+        run.failures.append(node_type)
+    return []
+
+
+def _owned(owner, fn, *args):
+    # OpenSCAD processes started by fn belong to the requesting thread,
+    # so OpenSCADRunner.cancel(owner) reaches them
+    with openscad_runner().acting_for(owner):
+        return fn(*args)
+
+
+def submit_owned(pool, fn, *args):
+    """ pool.submit(fn, *args) on behalf of the calling thread """
+    return pool.submit(_owned, openscad_runner().current_owner(), fn, *args)
+
+
+def _placed(shape, pl):
+    """ shape moved by pl, sharing its geometry """
+    try:
+        return shape.moved(pl)
+    except AttributeError:
+        # FreeCAD without TopoShape.moved()
+        s = shape.copy(False)
+        s.Placement = pl.multiply(s.Placement)
+        return s
+
+
+def process_AST_node(node):
+    """
+    build_AST_node() memoized on the structural subtree hash,
+    see build_AST_node() for the returned values.
+    """
+    run = _current_run()
+    if run is None:
+        return build_AST_node(node)
+
+    key = subtree_key(node)
+    if key in run.instances:
+        write_log("Instance", f"Reusing {node.node_type} subtree {key[:8]}")
+        return run.instances[key]
+
+    result = build_AST_node(node)
+    run.instances[key] = result
+    return result
+
+
 def debug_dump_cylinder_node(node, prefix=""):
     write_log("CYL_DEBUG", f"{prefix}Cylinder node")
     write_log("CYL_DEBUG", f"{prefix}  params = {node.params}")
@@ -497,7 +1090,7 @@ def debug_dump_cylinder_node(node, prefix=""):
     write_log("CYL_DEBUG", f"{prefix}  children = {len(node.children)}")
 
 
-def process_AST_node(node):
+def build_AST_node(node):
 
     """
     Recursively process an AST node.
@@ -521,6 +1114,8 @@ def process_AST_node(node):
         - Compute a new Placement = parent ∘ local_transform
         - Recurse into children
         - Apply transform to each returned child's placement
+        - Scale, shear and mirror are no Placement : the placed child
+          shapes are transformed, returned with IdentityPlacement
 
     Booleans (union, difference, intersection):
         - Evaluate children into shapes
@@ -557,7 +1152,7 @@ def process_AST_node(node):
 
         shape = Part.makeBox(sx, sy, sz)
 
-        if center:
+        if normalizeBool(center):
             shape.translate(App.Vector(-sx/2, -sy/2, -sz/2))
 
         return (shape, local_pl)
@@ -572,18 +1167,26 @@ def process_AST_node(node):
         h = p.get("h", 1)
         r1 = p.get("r1", p.get("r", 1))
         r2 = p.get("r2", r1)
+        n = int(round(float(p.get("$fn", 0) or 0)))
+        # as importAltCSG, useMaxFN 0 means 16 for cylinders
+        fnmax = _fnmax() or 16
 
-        if r1 == r2:
+        if 3 <= n <= fnmax and h > 0 and (r1 > 0 or r2 > 0):
+            shape = faceted_cylinder(r1, r2, h, n)
+        elif r1 == r2:
             shape = Part.makeCylinder(r1, h)
         elif r1 == 0 or r2 == 0:
             shape = Part.makeCone(r1, r2, h)  # true cone
         else:
             shape = Part.makeCone(r1, r2, h)
 
+        if normalizeBool(p.get("center", False)):
+            shape.translate(App.Vector(0, 0, -h/2))
+
         return (shape, local_pl)
 
     elif node.node_type == "polyhedron":
-        write_log("AST", f"Processing Polyhedron: points={node.points}, faces={node.faces}")
+        write_log("AST", f"Processing Polyhedron: points={len(node.points)}, faces={len(node.face_offsets) - 1}")
         return (process_polyhedron(node), local_pl)
 
     # -----------------------------
@@ -593,7 +1196,9 @@ def process_AST_node(node):
         write_log("AST","Hull")
         shape = try_hull(node)
         if shape is None:
-            shape = fallback_to_OpenSCAD(node, operation_type="Hull", tolerance=1.0, timeout=60)
+            shape = fallback_to_OpenSCAD(node, operation_type="Hull", tolerance=FALLBACK_TOLERANCE, timeout=60)
+        if shape is None:
+            return _failed("hull")
         # """" Return shape, local_pl
         return [(shape, local_pl)]
     # -------------------------------------------------
@@ -602,12 +1207,19 @@ def process_AST_node(node):
     if isinstance(node, Minkowski):
         shape = try_minkowski(node)
         if shape is None:
-            shape = fallback_to_OpenSCAD(node, operation_type="Minkowski", tolerance=1.0, timeout=60)
+            shape = fallback_to_OpenSCAD(node, operation_type="Minkowski", tolerance=FALLBACK_TOLERANCE, timeout=60)
+        if shape is None:
+            return _failed("minkowski")
         return [(shape, local_pl)]
     # -----------------------------
     # GROUP
     # -----------------------------
     if node_type in ("group", "root"):
+        hulls = chain_hull_segments(node)
+        if hulls:
+            shape = process_chain_hull(hulls)
+            return [(shape, local_pl)] if shape is not None else []
+
         results = []
         for child in node.children:
             results.extend(_as_list(process_AST_node(child)))
@@ -619,38 +1231,26 @@ def process_AST_node(node):
     if node_type in ("translate", "rotate", "scale", "multmatrix"):
         write_log("Transform",node_type)
 
-        if node_type == "translate":
-            v = node.params.get("v", [0,0,0])
-            trans_pl = local_pl.move(App.Vector(*v))
-
-        elif node_type == "rotate":
-            a = node.params.get("a", 0)
-            v = node.params.get("v", [0,0,1])
-            local_pl.Rotation = App.Rotation(App.Vector(*v), a)
-
-        elif node_type == "scale":
-            s = node.params.get("v", [1,1,1])
-            m = App.Matrix()
-            m.A11, m.A22, m.A33 = s
-            local_pl = App.Placement(m)
-
-        elif node_type == "multmatrix":
-            dump_ast_node(node)
-            m = node.params.get("matrix")
-            mat = App.Matrix()
-            mat.A11, mat.A12, mat.A13, mat.A14 = m[0]
-            mat.A21, mat.A22, mat.A23, mat.A24 = m[1]
-            mat.A31, mat.A32, mat.A33, mat.A34 = m[2]
-            trans_pl = App.Placement(mat)
+        m = transform_matrix(node)
+        if m is None:
+            write_log("Transform", f"Invalid {node_type} parameters {node.csg_params}, ignored")
+            m = np.identity(4)
+        mat = App.Matrix(*[float(x) for x in m.flat])
 
+        # Rotation + translation is a Placement, scale / shear / mirror
+        # have to be applied to the geometry itself
+        rot = m[:3, :3]
+        rigid = np.allclose(rot.T @ rot, np.identity(3), atol=1e-5) and np.linalg.det(rot) > 0
+        trans_pl = App.Placement(mat) if rigid else None
+        write_log("Transform", f"trans_pl {trans_pl}" if rigid else f"matrix {mat}")
 
         results = []
-        write_log("Transform",f"trans_pl {trans_pl}")
         for child in node.children:
             for shape, pl in _as_list(process_AST_node(child)):
-                return_pl = trans_pl.multiply(pl)
-                write_log("Transform",f"Return_pl {return_pl}")
-                results.append((shape, return_pl))
+                if rigid:
+                    results.append((shape, trans_pl.multiply(pl)))
+                elif shape is not None and not shape.isNull():
+                    results.append((_placed(shape, pl).transformGeometry(mat), App.Placement()))
         return results
 
     # -----------------------------
@@ -658,65 +1258,118 @@ def process_AST_node(node):
     # -----------------------------
     if node_type in ("union", "difference", "intersection"):
         write_log("Boolean",node_type)
-        shapes = []
+
+        if node_type == "union":
+            hulls = chain_hull_segments(node)
+            if hulls:
+                shape = process_chain_hull(hulls)
+                return (shape, local_pl) if shape is not None else []
+
+        # Placed shapes, grouped per child ( a child may return several )
+        child_shapes = []
         for child in node.children:
+            placed = []
             for shape, pl in _as_list(process_AST_node(child)):
-                s = shape.copy()
-                s.Placement = pl
+                if shape is None or shape.isNull():
+                    continue
+                s = _placed(shape, pl)
                 write_log(node_type,f"Child {child} Placement {pl}")
-                shapes.append(s)
+                placed.append(s)
+            child_shapes.append(placed)
 
-        if not shapes:
+        if not any(child_shapes):
             return []
 
-        result = shapes[0]
-        for s in shapes[1:]:
-            if node_type == "union":
-                result = result.fuse(s)
-            elif node_type == "difference":
-                result = result.cut(s)
-            elif node_type == "intersection":
-                result = result.common(s)
+        result = boolean_multi(node_type, child_shapes)
+        if result is None:
+            return []
 
         # ???? placement
         return (result, local_pl)
 
     # -----------------------------
-    # FALLBACK
+    # Attribute only wrappers
     # -----------------------------
-    results = []
-    for child in getattr(node, "children", []):
-        results.extend(_as_list(process_AST_node(child)))
-    return results
+    if node_type in PASS_THROUGH:
+        results = []
+        for child in node.children:
+            results.extend(_as_list(process_AST_node(child)))
+        return results
+
+    # -----------------------------
+    # FALLBACK : no native builder ( extrusions, 2D, text, offset ...)
+    # -----------------------------
+    write_log("AST", f"No native builder for {node_type}, using OpenSCAD")
+    if getattr(node, "_fallback_scad", None) is None:
+        node._fallback_scad = _with_base_dir(flatten_subtree(node))
+    shape = fallback_to_OpenSCAD(node, operation_type=node_type, tolerance=FALLBACK_TOLERANCE, timeout=60)
+    if shape is None:
+        return _failed(node_type)
+    return [(shape, local_pl)]
 
 
-def process_AST(nodes, mode="multiple"):
+def process_AST(nodes, mode="multiple", base_dir=None, failures=None, fnmax=None):
     """
     Process a list of AST nodes.
 
+    mode:
+        "multiple"  every shape of every node
+        "single"    first shape only
+        "compound"  one placed Part.Compound per top level node
+
+    base_dir : directory relative import() files of OpenSCAD fallbacks
+               resolve against, normally the one of the source
+    fnmax    : useMaxFN, cylinders with 3 .. fnmax $fn are faceted.
+               None reads the preference.
+    failures : list, receives the node types OpenSCAD could not convert.
+               These are left out of the result.
+
     Returns:
         List of (name, shape, placement) tuples
     """
     results = []
 
-    for node in nodes:
-        node_name = type(node).__name__
-        processed = process_AST_node(node)
+    # OpenSCAD fallbacks run concurrently while the tree is walked
+    pool = fallback_pool()
+    run = _Run(pool, base_dir, fnmax)
+    outer, _local.run = _current_run(), run
+    try:
+        prefetch_fallbacks(nodes, pool)
 
-        if not processed:
-            continue
+        for node in nodes:
+            node_name = type(node).__name__
+            processed = process_AST_node(node)
 
-        # Normalize to list
-        if not isinstance(processed, list):
-            processed = [processed]
+            if not processed:
+                continue
 
-        for shape, placement in processed:
-            results.append((node_name, shape, placement))
+            # Normalize to list
+            if not isinstance(processed, list):
+                processed = [processed]
 
-        write_log(
-            "AST",
-            f"Processed {node_name} → {len(processed)} shape(s)"
-        )
+            if mode == "compound":
+                placed = [
+                    _placed(shape, placement)
+                    for shape, placement in processed
+                    if shape is not None and not shape.isNull()
+                ]
+                results.append((node_name, Part.makeCompound(placed), App.Placement()))
+                continue
+
+            for shape, placement in processed:
+                results.append((node_name, shape, placement))
+
+            write_log(
+                "AST",
+                f"Processed {node_name} → {len(processed)} shape(s)"
+            )
+    finally:
+        write_log("AST", f"Instancing: {len(run.instances)} distinct subtree(s) built")
+        if failures is not None:
+            failures.extend(run.failures)
+        _local.run = outer
+        shutdown_pool(pool)
+        release_fallback_files(nodes)
 
     if mode == "single":
         return results[0] if results else None
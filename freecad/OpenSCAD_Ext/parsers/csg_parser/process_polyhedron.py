@@ -1,57 +1,34 @@
 import numpy as np
-import FreeCAD
-import Part
 # from OCC.Core.TopoDS import TopoDS_Shape
 
 from freecad.OpenSCAD_Ext.logger.Workbench_logger import write_log
+from freecad.OpenSCAD_Ext.core.polyhedron_mesh import polyhedron_shape
 
 def process_polyhedron(node):
     """
     Convert a Polyhedron AST node into a FreeCAD Part.Shape.
-    Uses only FreeCAD Part methods (makePolygon, makeFace, makeSolid).
+    Normals, orientation, degenerate faces and coplanar merging are
+    handled on the numpy arrays ( core/polyhedron_mesh.py ), the shell
+    is then built in one pass.
     Retains centroid instrumentation.
     """
 
     points = node.points
-    faces = node.faces
+    indices = node.face_indices
+    offsets = node.face_offsets
 
-    if not points or not faces:
+    if len(points) == 0 or len(offsets) < 2:
         return None
 
     # ---- centroid for instrumentation
-    cx = sum(p[0] for p in points) / len(points)
-    cy = sum(p[1] for p in points) / len(points)
-    cz = sum(p[2] for p in points) / len(points)
-    poly_center = (cx, cy, cz)
-
-    # ---- build faces using FreeCAD Part API
-    part_faces = []
-    for face_indices in faces:
-        face_pts = [FreeCAD.Vector(*points[idx]) for idx in face_indices]
-
-        # optional: reverse face if orientation check fails
-        # if should_reverse(face_pts, poly_center):
-        #     face_pts.reverse()
-
-        # make wire & face
-        wire = Part.makePolygon(face_pts + [face_pts[0]])  # close polygon
-        face = Part.Face(wire)
-        part_faces.append(face)
-
-    # ---- assemble into a compound
-    shape = Part.Compound(part_faces)
+    poly_center = tuple(points.mean(axis=0).tolist())
 
-    # ---- try to make a solid if possible
-    try:
-        shape = Part.makeSolid(shape)
-    except Exception:
-        # fallback to compound if faces don't form closed shell
-        pass
+    shape = polyhedron_shape(points, indices, offsets)
 
     # ---- instrumentation
     write_log(
         "Polyhedron",
-        f"centroid: {poly_center}, points={len(points)}, faces={len(faces)}"
+        f"centroid: {poly_center}, points={len(points)}, faces={len(offsets) - 1}"
     )
 
     return shape
@@ -68,7 +45,6 @@ def topo_to_part_shape(solid: TopoDS_Shape):
     # return topo_to_part_shape(solid)
 
     
-import Part
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Sewing, BRepBuilderAPI_MakeFace, BRepBuilderAPI_MakePolygon
 from OCC.Core.gp import gp_Pnt
 import numpy as np
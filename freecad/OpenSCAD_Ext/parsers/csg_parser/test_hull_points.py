@@ -0,0 +1,87 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for parsers/csg_parser/hull_points.py                            *
+#****************************************************************************
+import numpy as np
+import pytest
+
+from freecad.OpenSCAD_Ext.parsers.csg_parser import hull_points
+from freecad.OpenSCAD_Ext.parsers.csg_parser.parse_csg_file_to_AST_nodes import build_ast_node
+
+
+def node(node_type, params="", *children):
+    return build_ast_node(node_type, params, list(children))
+
+
+@pytest.mark.parametrize("r, fn, fs, fa, expected", [
+    (10, 0, 2, 12, 30),     # limited by $fa
+    (1, 0, 2, 12, 5),       # at least 5
+    (2, 0, 2, 12, 7),       # limited by $fs
+    (10, 7, 2, 12, 7),      # $fn wins
+    (10, 2, 2, 12, 3),      # $fn below 3
+    (0, 0, 2, 12, 3),       # below GRID_FINE
+])
+def test_get_fragments_from_r(r, fn, fs, fa, expected):
+    assert hull_points.get_fragments_from_r(r, fn, fs, fa) == expected
+
+
+def test_cube():
+    pts = hull_points.node_points(node("cube", "size = [1, 2, 3], center = false"))
+    assert pts.min(axis=0).tolist() == [0, 0, 0]
+    assert pts.max(axis=0).tolist() == [1, 2, 3]
+
+    pts = hull_points.node_points(node("cube", "size = [2, 2, 2], center = true"))
+    assert pts.min(axis=0).tolist() == [-1, -1, -1]
+
+
+def test_cylinder_and_cone_tip():
+    pts = hull_points.node_points(
+        node("cylinder", "$fn = 8, h = 4, r1 = 1, r2 = 0, center = true"))
+    assert len(pts) == 8 + 1
+    assert pts[:, 2].min() == -2 and pts[:, 2].max() == 2
+    assert pts[-1].tolist() == [0, 0, 2]
+
+
+def test_sphere_inside_radius():
+    pts = hull_points.node_points(node("sphere", "$fn = 12, r = 2"))
+    assert np.all(np.linalg.norm(pts, axis=1) <= 2 + 1e-12)
+
+
+def test_transforms():
+    cube = node("cube", "size = [1, 1, 1], center = false")
+    moved = node("translate", "v = [10, 0, 0]", cube)
+    assert hull_points.node_points(moved).min(axis=0).tolist() == [10, 0, 0]
+
+    turned = node("rotate", "a = [0, 0, 90]", cube)
+    lo = hull_points.node_points(turned).min(axis=0)
+    assert np.allclose(lo, [-1, 0, 0])
+
+    matrix = node("multmatrix", "[[2, 0, 0, 1], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]", cube)
+    assert hull_points.node_points(matrix).max(axis=0).tolist() == [3, 1, 1]
+
+
+def test_hull_points_of_children():
+    hull = node(
+        "hull", "",
+        node("cube", "size = [1, 1, 1], center = false"),
+        node("translate", "v = [5, 0, 0]", node("sphere", "$fn = 6, r = 1")),
+    )
+    pts = hull_points.hull_points(hull)
+    assert len(pts) == 8 + 6 * 3
+    assert pts[:, 0].max() == pytest.approx(6.0)
+
+
+def test_unsupported_subtree():
+    diff = node("difference", "", node("cube", "size = 1"), node("sphere", "r = 1"))
+    assert hull_points.hull_points(node("hull", "", diff)) is None
+
+
+def test_node_bounds_minkowski_adds_boxes():
+    mink = node(
+        "minkowski", "",
+        node("cube", "size = [2, 2, 2], center = true"),
+        node("cube", "size = [1, 1, 1], center = true"),
+    )
+    lo, hi = hull_points.node_bounds(node("translate", "v = [0, 0, 10]", mink))
+    assert lo.tolist() == [-1.5, -1.5, 8.5]
+    assert hi.tolist() == [1.5, 1.5, 11.5]
@@ -0,0 +1,61 @@
+# -*- coding: utf8 -*-
+#****************************************************************************
+#*   Tests for parsers/csg_parser/numeric_arrays.py                         *
+#****************************************************************************
+import numpy as np
+
+from freecad.OpenSCAD_Ext.parsers.csg_parser import numeric_arrays
+
+
+def test_keyword_spans_skips_nested_keys():
+    raw = 'points = [[0, 0, 0], [1, 0, 0]], faces = [[0, 1, 2]], convexity = 10'
+    spans = numeric_arrays.keyword_spans(raw)
+    assert spans == {
+        "points": "[[0, 0, 0], [1, 0, 0]]",
+        "faces": "[[0, 1, 2]]",
+        "convexity": "10",
+    }
+
+
+def test_parse_points():
+    points = numeric_arrays.parse_points("[[0, 0, 0], [1.5, -2, 3e2]]")
+    assert points.dtype == np.float64
+    assert points.tolist() == [[0, 0, 0], [1.5, -2, 300]]
+    assert numeric_arrays.parse_points("[]").shape == (0, 3)
+    assert numeric_arrays.parse_points("[[0, 1], [2, 3]]", dim=2).shape == (2, 2)
+
+
+def test_parse_faces_mixed_sizes():
+    indices, offsets = numeric_arrays.parse_faces("[[0, 1, 2], [3, 4, 5, 6], [7, 8, 9]]")
+    assert indices.dtype == np.int32 and offsets.dtype == np.int32
+    assert indices.tolist() == list(range(10))
+    assert offsets.tolist() == [0, 3, 7, 10]
+
+
+def test_parse_faces_empty():
+    indices, offsets = numeric_arrays.parse_faces("[]")
+    assert len(indices) == 0
+    assert offsets.tolist() == [0]
+
+
+def test_parse_faces_literal_eval_fallback():
+    # float indices break the fast integer scan
+    indices, offsets = numeric_arrays.parse_faces("[[0.0, 1, 2], [2, 1, 3]]")
+    assert indices.tolist() == [0, 1, 2, 2, 1, 3]
+    assert offsets.tolist() == [0, 3, 6]
+
+
+def test_parse_polyhedron_params():
+    raw = ("points = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], "
+           "faces = [[0, 1, 2], [0, 3, 1], [0, 2, 3], [1, 3, 2]], convexity = 2")
+    params = numeric_arrays.parse_polyhedron_params(raw)
+    assert params["points"].shape == (4, 3)
+    assert params["face_offsets"].tolist() == [0, 3, 6, 9, 12]
+    assert params["convexity"] == 2
+
+
+def test_parse_polyhedron_params_triangles():
+    raw = "points = [[0, 0, 0], [1, 0, 0], [0, 1, 0]], triangles = [[0, 1, 2]]"
+    params = numeric_arrays.parse_polyhedron_params(raw)
+    assert params["face_indices"].tolist() == [0, 1, 2]
+    assert params["convexity"] is None
@@ -1,8 +1,9 @@
 import os
 import re
-import subprocess
 import tempfile
 
+from freecad.OpenSCAD_Ext.core.openscad_runner import openscad_runner
+
 
 # -----------------------------------------------------------
 # Parse scad file for Module and functions, 
@@ -62,9 +63,7 @@ def _run_openscad(scad_file, call_expr):
             test_scad
         ]
 
-        try:
-            subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        except subprocess.CalledProcessError:
+        if openscad_runner().run(cmd).returncode != 0:
             return None
 
         if not os.path.exists(out_csg):